@@ -1,188 +1,210 @@
 #!/usr/bin/env python3
+"""
+ResearchBook - Coverage statistics for both databases
+ORCID coverage, temporal coverage of relationships, co-authorship and node /
+relationship totals, each family of counters computed in one aggregated pass
+(count(CASE ...) columns instead of one scan per counter) and the independent
+queries run in parallel. The result is saved as a versioned JSON artifact
+that the Database Overview page reads, so the page shows current numbers
+without querying anything.
 
-from neo4j import GraphDatabase
+    python analyze_coverage.py            # recompute and print
+"""
 
-# First database credentials
-NEO4J_URI = "neo4j+s://84711dd6.databases.neo4j.io"
-NEO4J_USERNAME = "neo4j"
-NEO4J_PASSWORD = "kvWkwedbwzpifLYyA_lhgUTIVdR-l37Gz1XJHKB7bWI"
-NEO4J_DATABASE = "neo4j"
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional
 
-def analyze_orcid_coverage():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
-    
-    try:
-        with driver.session(database=NEO4J_DATABASE) as session:
-            print("📊 ANALYZING ORCID COVERAGE AND TEMPORAL DATA\n")
-            
-            # 1. Total person count
-            total_query = "MATCH (p:Person) RETURN count(p) as total_persons"
-            total_result = session.run(total_query)
-            total_persons = total_result.single()['total_persons']
-            print(f"👥 Total Persons in Database: {total_persons:,}")
-            
-            # 2. ORCID coverage analysis
-            orcid_queries = {
-                "Has ORCID ID": "MATCH (p:Person) WHERE p.orcid_id IS NOT NULL AND p.orcid_id <> 'NOT_FOUND' RETURN count(p) as count",
-                "ORCID ID = NOT_FOUND": "MATCH (p:Person) WHERE p.orcid_id = 'NOT_FOUND' RETURN count(p) as count",
-                "Has ORCID given_names": "MATCH (p:Person) WHERE p.orcid_given_names IS NOT NULL RETURN count(p) as count",
-                "Has ORCID publication_count": "MATCH (p:Person) WHERE p.orcid_publication_count IS NOT NULL RETURN count(p) as count",
-                "Has ORCID search_date": "MATCH (p:Person) WHERE p.orcid_search_date IS NOT NULL RETURN count(p) as count",
-                "No ORCID data at all": "MATCH (p:Person) WHERE p.orcid_id IS NULL AND p.orcid_given_names IS NULL AND p.orcid_search_date IS NULL RETURN count(p) as count"
-            }
-            
-            print("🆔 ORCID Coverage Analysis:")
-            orcid_stats = {}
-            for description, query in orcid_queries.items():
-                result = session.run(query)
-                count = result.single()['count']
-                percentage = (count / total_persons) * 100
-                print(f"   {description}: {count:,} ({percentage:.1f}%)")
-                orcid_stats[description] = count
-            
-            # 3. Temporal data in relationships
-            print(f"\n🕐 TEMPORAL RELATIONSHIP DATA:")
-            
-            temporal_queries = {
-                "WORKED_AT with start_year": """
-                    MATCH ()-[r:WORKED_AT]->() 
-                    WHERE r.start_year IS NOT NULL 
-                    RETURN count(r) as count
-                """,
-                "WORKED_AT with end_year": """
-                    MATCH ()-[r:WORKED_AT]->() 
-                    WHERE r.end_year IS NOT NULL 
-                    RETURN count(r) as count
-                """,
-                "AUTHORED with temporal data": """
-                    MATCH ()-[r:AUTHORED]->() 
-                    WHERE r.year IS NOT NULL OR r.date IS NOT NULL OR r.publication_year IS NOT NULL
-                    RETURN count(r) as count
-                """,
-                "STUDIED_AT with temporal data": """
-                    MATCH ()-[r:STUDIED_AT]->() 
-                    WHERE r.start_year IS NOT NULL OR r.end_year IS NOT NULL OR r.graduation_year IS NOT NULL
-                    RETURN count(r) as count
-                """
-            }
-            
-            for description, query in temporal_queries.items():
-                try:
-                    result = session.run(query)
-                    count = result.single()['count']
-                    print(f"   {description}: {count:,}")
-                except Exception as e:
-                    print(f"   {description}: Error - {e}")
-            
-            # 4. Sample temporal AUTHORED relationships
-            print(f"\n📚 AUTHORED Relationships Temporal Analysis:")
-            authored_sample_query = """
-            MATCH (p:Person)-[r:AUTHORED]->(pub)
-            WHERE r.year IS NOT NULL OR r.date IS NOT NULL OR r.publication_year IS NOT NULL
-            RETURN p.name as person, 
-                   pub.title as publication,
-                   r.year as rel_year,
-                   r.date as rel_date,
-                   r.publication_year as pub_year,
-                   keys(r) as all_props
-            LIMIT 5
-            """
-            
-            try:
-                authored_result = session.run(authored_sample_query)
-                for record in authored_result:
-                    print(f"   {record['person']} -> {record['publication'][:50]}...")
-                    print(f"     Props: {record['all_props']}")
-                    if record['rel_year']:
-                        print(f"     Year: {record['rel_year']}")
-                    if record['pub_year']:
-                        print(f"     Pub Year: {record['pub_year']}")
-                    print()
-            except Exception as e:
-                print(f"   Error getting AUTHORED samples: {e}")
-            
-            # 5. Collaboration analysis
-            print(f"🤝 COLLABORATION ANALYSIS:")
-            
-            # Co-authorship networks
-            coauthor_query = """
-            MATCH (p1:Person)-[:AUTHORED]->(pub:Publication)<-[:AUTHORED]-(p2:Person)
-            WHERE p1 <> p2
-            RETURN count(DISTINCT pub) as shared_publications,
-                   count(DISTINCT [p1, p2]) as unique_pairs
-            """
-            
-            coauthor_result = session.run(coauthor_query)
-            coauthor_record = coauthor_result.single()
-            print(f"   Publications with multiple authors: {coauthor_record['shared_publications']:,}")
-            print(f"   Unique co-author pairs: {coauthor_record['unique_pairs']:,}")
-            
-            # 6. Cross-institutional collaborations
-            cross_institutional_query = """
-            MATCH (p1:Person)-[:WORKED_AT]->(org1:Organization),
-                  (p2:Person)-[:WORKED_AT]->(org2:Organization),
-                  (p1)-[:AUTHORED]->(pub:Publication)<-[:AUTHORED]-(p2)
-            WHERE org1 <> org2 AND p1 <> p2
-            RETURN count(DISTINCT pub) as cross_institutional_publications,
-                   count(DISTINCT [org1.name, org2.name]) as institution_pairs
-            LIMIT 1
-            """
-            
-            try:
-                cross_result = session.run(cross_institutional_query)
-                cross_record = cross_result.single()
-                if cross_record:
-                    print(f"   Cross-institutional collaborations: {cross_record['cross_institutional_publications']:,} publications")
-                    print(f"   Institution pairs collaborating: {cross_record['institution_pairs']:,}")
-            except Exception as e:
-                print(f"   Cross-institutional analysis error: {e}")
-            
-            # 7. Career progression patterns
-            print(f"\n📈 CAREER PROGRESSION PATTERNS:")
-            
-            career_progression_query = """
-            MATCH (p:Person)-[r1:WORKED_AT]->(org1:Organization)
-            WHERE r1.start_year IS NOT NULL AND r1.end_year IS NOT NULL
-            WITH p, r1, org1
-            MATCH (p)-[r2:WORKED_AT]->(org2:Organization)
-            WHERE r2.start_year IS NOT NULL AND r2.start_year > r1.end_year
-            RETURN p.name as person,
-                   org1.name as previous_org,
-                   r1.role as previous_role,
-                   r1.start_year + "-" + r1.end_year as previous_period,
-                   org2.name as current_org,
-                   r2.role as current_role,
-                   r2.start_year as current_start
-            LIMIT 10
-            """
-            
+import config
+from artifacts import ArtifactReader
+
+STATS_VERSION = 1
+DEFAULT_PATH = os.path.join(config.ARTIFACT_DIR, "coverage_stats.json")
+
+DB1_QUERIES = {
+    "totals": """
+        CALL { MATCH (n) RETURN count(n) as nodes }
+        CALL { MATCH ()-[r]->() RETURN count(r) as relationships }
+        CALL { MATCH (pub:Publication) RETURN count(pub) as publications }
+        CALL { MATCH (org:Organization) RETURN count(org) as organizations }
+        RETURN nodes, relationships, publications, organizations
+        """,
+    "orcid": """
+        MATCH (p:Person)
+        RETURN count(p) as persons,
+               count(CASE WHEN p.orcid_id IS NOT NULL AND p.orcid_id <> 'NOT_FOUND' THEN 1 END) as orcid_id,
+               count(CASE WHEN p.orcid_id = 'NOT_FOUND' THEN 1 END) as orcid_not_found,
+               count(p.orcid_given_names) as orcid_given_names,
+               count(p.orcid_publication_count) as orcid_publication_count,
+               count(p.orcid_search_date) as orcid_search_date,
+               count(CASE WHEN p.orcid_id IS NULL AND p.orcid_given_names IS NULL
+                               AND p.orcid_search_date IS NULL THEN 1 END) as no_orcid_data
+        """,
+    "worked_at": """
+        MATCH ()-[r:WORKED_AT]->()
+        RETURN count(r) as worked_at,
+               count(r.start_year) as worked_at_start_year,
+               count(r.end_year) as worked_at_end_year
+        """,
+    "authored": """
+        MATCH ()-[r:AUTHORED]->()
+        RETURN count(r) as authored,
+               count(CASE WHEN r.year IS NOT NULL OR r.date IS NOT NULL
+                               OR r.publication_year IS NOT NULL THEN 1 END) as authored_temporal
+        """,
+    "studied_at": """
+        MATCH ()-[r:STUDIED_AT]->()
+        RETURN count(r) as studied_at,
+               count(CASE WHEN r.start_year IS NOT NULL OR r.end_year IS NOT NULL
+                               OR r.graduation_year IS NOT NULL THEN 1 END) as studied_at_temporal
+        """,
+    # Author count per publication instead of materializing every co-author pair
+    "coauthorship": """
+        MATCH (pub:Publication)
+        WITH COUNT { (pub)<-[:AUTHORED]-(:Person) } as authors
+        WHERE authors > 1
+        RETURN count(*) as multi_author_publications,
+               sum(authors * (authors - 1) / 2) as coauthor_links
+        """,
+}
+
+DB2_QUERIES = {
+    "totals": """
+        CALL { MATCH (n) RETURN count(n) as nodes }
+        CALL { MATCH ()-[r]->() RETURN count(r) as relationships }
+        CALL { MATCH (p:Person) RETURN count(p) as persons }
+        CALL { CALL db.relationshipTypes() YIELD relationshipType RETURN count(*) as relationship_types }
+        RETURN nodes, relationships, persons, relationship_types
+        """,
+    "theses": """
+        MATCH (t:Thesis)
+        RETURN count(t) as theses,
+               count(t.created_date) as theses_dated,
+               count(t.keywords) as theses_with_keywords,
+               min(t.created_date.year) as first_year,
+               max(t.created_date.year) as last_year
+        """,
+}
+
+
+def compute_coverage_stats(rb, workers: int = 4) -> Dict:
+    """Run every coverage query (in parallel) and collect the counters per database"""
+    stats = {"version": STATS_VERSION, "db1": {}, "db2": {}, "errors": {}, "seconds": {}}
+    jobs = [("db1", name, query) for name, query in DB1_QUERIES.items()]
+    jobs += [("db2", name, query) for name, query in DB2_QUERIES.items()]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coverage") as pool:
+        futures = {pool.submit(_timed_query, rb, db, name, query): (db, name) for db, name, query in jobs}
+        for future in as_completed(futures):
+            db, name = futures[future]
             try:
-                career_result = session.run(career_progression_query)
-                career_count = 0
-                for record in career_result:
-                    if career_count == 0:
-                        print("   Sample career progressions:")
-                    print(f"   • {record['person']}")
-                    print(f"     {record['previous_org']} ({record['previous_role']}) {record['previous_period']}")
-                    print(f"     → {record['current_org']} ({record['current_role']}) from {record['current_start']}")
-                    print()
-                    career_count += 1
-                
-                if career_count == 0:
-                    print("   No clear career progression patterns found with current data")
-                else:
-                    print(f"   Found {career_count}+ career progression examples")
-                    
+                records, seconds = future.result()
             except Exception as e:
-                print(f"   Career progression analysis error: {e}")
-            
-    except Exception as e:
-        print(f"❌ Database analysis error: {e}")
-    finally:
-        driver.close()
+                print(f"   ⚠️ {db} {name}: {e}")
+                stats["errors"][f"{db}.{name}"] = f"{type(e).__name__}: {e}"
+                continue
+            stats[db].update(dict(records[0]) if records else {})
+            stats["seconds"][f"{db}.{name}"] = round(seconds, 2)
+    stats["built_at"] = time.time()
+    stats["build_seconds"] = round(time.perf_counter() - start, 2)
+    return stats
+
+
+def _timed_query(rb, db: str, name: str, query: str):
+    start = time.perf_counter()
+    records = rb._query(db, f"coverage_{name}", query)
+    return records, time.perf_counter() - start
+
+
+def share(stats: Dict, db: str, key: str, total_key: str) -> Optional[float]:
+    """stats[db][key] as a percentage of stats[db][total_key], None if either is missing"""
+    count, total = stats[db].get(key), stats[db].get(total_key)
+    if count is None or not total:
+        return None
+    return 100.0 * count / total
+
+
+def save_coverage_stats(stats: Dict, path: str = DEFAULT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def load_coverage_stats(path: str = DEFAULT_PATH) -> Optional[Dict]:
+    """The stored stats, or None if missing or written by an incompatible version"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        stats = json.load(f)
+    return stats if stats.get("version") == STATS_VERSION else None
+
+
+class CoverageStatsReader(ArtifactReader):
+    def __init__(self, path: str = DEFAULT_PATH):
+        super().__init__(path, load_coverage_stats)
+
+
+def print_report(stats: Dict):
+    db1, db2 = stats["db1"], stats["db2"]
+
+    def line(label, db, key, total_key):
+        if key not in stats[db]:
+            return
+        percentage = share(stats, db, key, total_key)
+        suffix = f" ({percentage:.1f}%)" if percentage is not None else ""
+        print(f"   {label}: {stats[db][key]:,}{suffix}")
+
+    if "persons" in db1:
+        print(f"👥 Total Persons in Database: {db1['persons']:,}")
+    print("🆔 ORCID Coverage Analysis:")
+    for label, key in (("Has ORCID ID", "orcid_id"), ("ORCID ID = NOT_FOUND", "orcid_not_found"),
+                       ("Has ORCID given_names", "orcid_given_names"),
+                       ("Has ORCID publication_count", "orcid_publication_count"),
+                       ("Has ORCID search_date", "orcid_search_date"), ("No ORCID data at all", "no_orcid_data")):
+        line(label, "db1", key, "persons")
+
+    print("\n🕐 TEMPORAL RELATIONSHIP DATA:")
+    line("WORKED_AT with start_year", "db1", "worked_at_start_year", "worked_at")
+    line("WORKED_AT with end_year", "db1", "worked_at_end_year", "worked_at")
+    line("AUTHORED with temporal data", "db1", "authored_temporal", "authored")
+    line("STUDIED_AT with temporal data", "db1", "studied_at_temporal", "studied_at")
+
+    print("\n🤝 COLLABORATION ANALYSIS:")
+    line("Publications with multiple authors", "db1", "multi_author_publications", "publications")
+    line("Co-author links (pairs summed over publications)", "db1", "coauthor_links", "")
+
+    print("\n🎓 THESIS DATABASE:")
+    line("Persons", "db2", "persons", "")
+    line("Theses", "db2", "theses", "")
+    line("Theses with a date", "db2", "theses_dated", "theses")
+    line("Theses with keywords", "db2", "theses_with_keywords", "theses")
+    line("Relationship types", "db2", "relationship_types", "")
+    for name, error in stats["errors"].items():
+        print(f"   ❌ {name}: {error}")
+
 
 if __name__ == "__main__":
-    analyze_orcid_coverage()
+    import argparse
+    from researchbook import ResearchBook
+
+    parser = argparse.ArgumentParser(description="Compute coverage statistics for the overview page")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    rb = ResearchBook()
+    try:
+        print("📊 ANALYZING ORCID COVERAGE AND TEMPORAL DATA\n")
+        stats = compute_coverage_stats(rb, workers=args.workers)
+        save_coverage_stats(stats, args.path)
+        print_report(stats)
+        print(f"\n🎉 {len(stats['seconds'])} queries in {stats['build_seconds']:.1f}s → {args.path}")
+    finally:
+        rb.close_connections()
 
 #     LinkedIn data → No professional connections outside academia
 # External publication databases → Limited to Chalmers Research publications
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - JSON API
+Minimal HTTP surface over one shared ResearchBookFinal (the same sharing model
+as streamlit_app.py), used as the target of loadtest.py --url.
+
+    python api_server.py --port 8500 --stub-neo4j --stub-llm
+    curl 'http://127.0.0.1:8500/experts?topic=robotics&limit=5'
+
+Routes: /lookup?name=  /experts?topic=&limit=&roles=&scoring=&rank_mode=  /experts/ai_ranking?id=&wait=
+        /field_brief?field=&roles=
+        /match?name=&roles=  /ego_network?name=&hops=&max_nodes=
+        /lineage?name=&direction=&max_depth=  /common_ancestor?a=&b=  /paths?a=&b=&k=
+        /metrics  /stats[?reset=1]  /healthz
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+from loadtest import BackendProbe, build_service
+from metrics import REGISTRY
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    rb = None
+    probe: BackendProbe = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Dict):
+        self._send(status, json.dumps(data, default=str).encode("utf-8"))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        roles = params["roles"].split(",") if params.get("roles") else None
+        rb = self.rb
+
+        routes = {
+            "/lookup": lambda: rb.lookup_person(params["name"]),
+            "/experts": lambda: rb.find_expert(params["topic"], limit=int(params.get("limit", 10)),
+                                               roles=roles, scoring=params.get("scoring", "match"),
+                                               rank_mode=params.get("rank_mode", "ai")),
+            "/experts/ai_ranking": lambda: rb.expert_ai_ranking(params["id"],
+                                                                timeout=float(params.get("wait", 0))),
+            "/field_brief": lambda: rb.generate_field_brief(params["field"], roles=roles),
+            "/match": lambda: rb.match_researchers(params["name"], roles=roles),
+            "/ego_network": lambda: rb.ego_network(params["name"], hops=int(params.get("hops", 1)),
+                                                   max_nodes=int(params.get("max_nodes", 60))),
+            "/lineage": lambda: rb.academic_lineage(params["name"], params.get("direction", "descendants"),
+                                                    int(params["max_depth"]) if params.get("max_depth") else None),
+            "/common_ancestor": lambda: rb.common_academic_ancestor(params["a"], params["b"]),
+            "/paths": lambda: rb.connection_paths(params["a"], params["b"], k=int(params.get("k", 3))),
+        }
+        if url.path == "/healthz":
+            return self._send_json(200, {"status": "ok"})
+        if url.path == "/metrics":
+            return self._send(200, REGISTRY.render().encode("utf-8"), "text/plain; version=0.0.4")
+        if url.path == "/stats":
+            if params.get("reset"):
+                self.probe.reset()
+                return self._send_json(200, {"reset": True})
+            return self._send_json(200, self.probe.summary())
+        if url.path not in routes:
+            return self._send_json(404, {"error": f"Unknown route {url.path}"})
+
+        try:
+            result = routes[url.path]()
+        except KeyError as e:
+            return self._send_json(400, {"error": f"Missing parameter {e}"})
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            return self._send_json(503, {"error": f"{type(e).__name__}: {e}"})
+        self._send_json(200, result)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSON API over ResearchBook")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500)
+    parser.add_argument("--stub-neo4j", action="store_true", help="use the local Neo4j stand-in")
+    parser.add_argument("--db-latency", type=float, default=0.03)
+    parser.add_argument("--db-capacity", type=int, default=16)
+    parser.add_argument("--stub-llm", action="store_true", help="use the local LLM stand-in")
+    parser.add_argument("--llm-profile", default="fast")
+    parser.add_argument("--llm-capacity", type=int)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    ApiHandler.rb = build_service(args.stub_neo4j, args.db_latency, args.db_capacity, args.stub_llm,
+                                  args.llm_profile, args.llm_capacity, args.llm_error_rate)
+    ApiHandler.probe = BackendProbe()
+    ApiHandler.probe.install(ApiHandler.rb)
+
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    server.daemon_threads = True
+    print(f"🌐 ResearchBook API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        ApiHandler.rb.close_connections()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Offline artifacts read by the app
+Jobs (trend_cube.py, graph_store.py, graph_analytics.py, ...) write their
+results atomically under config.ARTIFACT_DIR; the app reads them through an
+ArtifactReader, which loads on first use and reloads when the file changes.
+"""
+
+import os
+from typing import Any, Callable, Optional
+
+
+class ArtifactReader:
+    """Loads an artifact lazily and reloads it when the file on disk changes"""
+
+    def __init__(self, path: str, loader: Callable[[str], Any]):
+        self.path = path
+        self.loader = loader
+        self._value: Optional[Any] = None
+        self._mtime = None
+
+    def get(self) -> Optional[Any]:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if mtime != self._mtime:
+            self._value = self.loader(self.path)
+            self._mtime = mtime
+        return self._value
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Batch Runner
+Runs a feature over many inputs on a worker pool, with separate concurrency
+limits for Neo4j and LLM calls. Results are appended to a JSONL file that
+doubles as the checkpoint: a rerun with the same output skips inputs that
+already succeeded and retries the ones that failed.
+
+    python batch.py field_brief fields.csv -o briefs.jsonl --workers 8 --llm-concurrency 3
+    python batch.py expert topics.jsonl --column topic -o experts.jsonl
+    python batch.py profile people.csv -o profiles.jsonl --group-size 30
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Set
+
+# Batch job kind -> (ResearchBookFinal method, accepts roles, takes a list of inputs)
+# Grouped kinds pack several inputs into each LLM completion (see llm_batching.py)
+JOBS = {
+    "lookup": ("lookup_person", False, False),
+    "expert": ("find_expert", True, False),
+    "field_brief": ("generate_field_brief", True, False),
+    "match": ("match_researchers", True, False),
+    "expert_ranking": ("rank_experts_batch", True, True),
+    "profile": ("summarize_people_batch", False, True),
+}
+
+
+def read_inputs(path: str, column: str = None) -> Iterator[str]:
+    """
+    Input values from a CSV (column, default: first column) or JSONL file
+    (column, default: 'value'). Blank values are skipped.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    value = json.loads(line).get(column or "value")
+                    if value and str(value).strip():
+                        yield str(value).strip()
+        else:
+            reader = csv.DictReader(f)
+            column = column or reader.fieldnames[0]
+            for row in reader:
+                value = (row.get(column) or "").strip()
+                if value:
+                    yield value
+
+
+def job_key(kind: str, value: str) -> str:
+    return f"{kind}:{' '.join(value.split()).casefold()}"
+
+
+def load_checkpoint(output: str) -> Set[str]:
+    """Keys of inputs that already completed in a previous run (failures are retried)"""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            if entry.get("status") in ("ok", "empty"):
+                done.add(entry["key"])
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def limit_concurrency(rb, db_concurrency: int, llm_concurrency: int):
+    """
+    Cap concurrent Neo4j queries and LLM requests independently of the worker count.
+    Wraps the single-attempt units, so retry backoff does not hold a slot.
+    """
+    db_slots = threading.BoundedSemaphore(db_concurrency)
+    llm_slots = threading.BoundedSemaphore(llm_concurrency)
+    execute_query, llm_post = rb._execute_query, rb._llm_post
+
+    def limited_query(db, query, params):
+        with db_slots:
+            return execute_query(db, query, params)
+
+    def limited_llm_post(payload):
+        with llm_slots:
+            return llm_post(payload)
+
+    rb._execute_query = limited_query
+    rb._llm_post = limited_llm_post
+
+
+def run_batch(rb, kind: str, values: List[str], output: str, workers: int = 4,
+              roles: List[str] = None, group_size: int = 20) -> Dict[str, int]:
+    """Run one feature over values, appending a JSONL line per finished input"""
+    method_name, takes_roles, grouped = JOBS[kind]
+    method = getattr(rb, method_name)
+    done = load_checkpoint(output)
+
+    pending, seen = [], set()
+    for value in values:
+        key = job_key(kind, value)
+        if key not in seen:
+            seen.add(key)
+            if key not in done:
+                pending.append(value)
+    # Inputs of this run found in the checkpoint (it may hold keys of other runs too)
+    skipped = len(seen & done)
+    stats = {"total": len(pending), "skipped": skipped, "ok": 0, "empty": 0, "failed": 0}
+    print(f"📋 {stats['total']} to run, {stats['skipped']} already done (from {output})")
+
+    def run_group(group):
+        start = time.perf_counter()
+        kwargs = {"roles": roles} if takes_roles and roles else {}
+        if grouped:
+            results = method(group, **kwargs)
+        else:
+            results = {group[0]: method(group[0], **kwargs)}
+        return results, (time.perf_counter() - start) / len(group)
+
+    size = group_size if grouped else 1
+    groups = iter([pending[i:i + size] for i in range(0, len(pending), size)])
+    with open(output, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        if out.tell() and not _ends_with_newline(output):
+            out.write("\n")  # start after a torn line rather than appending to it
+        # Keep only a bounded number of groups queued so an interrupt loses little work
+        in_flight = {}
+        for group in groups:
+            in_flight[pool.submit(run_group, group)] = group
+            if len(in_flight) >= workers * 2:
+                break
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                group = in_flight.pop(future)
+                try:
+                    results, elapsed = future.result()
+                    group_error = None
+                except Exception as e:
+                    results, group_error = {}, f"{type(e).__name__}: {e}"
+
+                for value in group:
+                    entry = {"key": job_key(kind, value), "kind": kind, "input": value}
+                    result = results.get(value)
+                    if result is None:
+                        status = "failed"
+                        entry.update(status=status, error=group_error or "no result returned")
+                    else:
+                        # No data is a final answer; a missing AI section is worth retrying
+                        status = "empty" if "error" in result else "failed" if result.get("ai_error") else "ok"
+                        entry.update(status=status, elapsed=round(elapsed, 3), result=result)
+                    out.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                    stats[status] += 1
+                    icon = {"ok": "✅", "empty": "⚠️", "failed": "❌"}[status]
+                    finished_count = stats["ok"] + stats["empty"] + stats["failed"]
+                    print(f"{icon} [{finished_count}/{stats['total']}] {value}")
+                out.flush()
+
+                next_group = next(groups, None)
+                if next_group:
+                    in_flight[pool.submit(run_group, next_group)] = next_group
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook_final import ResearchBookFinal
+
+    parser = argparse.ArgumentParser(description="Run a ResearchBook feature over many inputs")
+    parser.add_argument("kind", choices=sorted(JOBS))
+    parser.add_argument("input", help="CSV or JSONL file of fields / topics / names")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file (also the checkpoint)")
+    parser.add_argument("--column", help="CSV column or JSONL key holding the value")
+    parser.add_argument("--roles", nargs="*", help="role categories, e.g. supervision")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--db-concurrency", type=int, default=4, help="max concurrent Neo4j queries")
+    parser.add_argument("--llm-concurrency", type=int, default=2, help="max concurrent LLM requests")
+    parser.add_argument("--group-size", type=int, default=20,
+                        help="inputs per task for batched kinds (expert_ranking, profile)")
+    args = parser.parse_args()
+
+    rb = ResearchBookFinal()
+    limit_concurrency(rb, args.db_concurrency, args.llm_concurrency)
+    try:
+        start = time.perf_counter()
+        stats = run_batch(rb, args.kind, list(read_inputs(args.input, args.column)), args.output,
+                          workers=args.workers, roles=args.roles, group_size=args.group_size)
+        print(f"\n🎉 {stats['ok']} ok, {stats['empty']} without data, {stats['failed']} failed, "
+              f"{stats['skipped']} skipped in {time.perf_counter() - start:.0f}s")
+    finally:
+        rb.close_connections()
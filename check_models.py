@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 
 import requests
+import config
 import json
 
 def check_available_models():
     """Check available models via /v1/models endpoint"""
     
-    url = "https://anast.ita.chalmers.se:4000/v1/models"
-    api_key = "sk-u_7AVwCgIBRZF9IXwzPqtA"
+    url = config.LLM_MODELS_URL
+    api_key = config.LLM_API_KEY
     
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -16,7 +17,7 @@ def check_available_models():
     
     try:
         print("🔍 Checking available models...")
-        response = requests.get(url, headers=headers, timeout=30, verify=False)
+        response = requests.get(url, headers=headers, timeout=30, verify=config.LLM_VERIFY_TLS)
         
         print(f"Status Code: {response.status_code}")
         
@@ -54,8 +55,8 @@ def check_available_models():
 def test_with_model(model_name):
     """Test chat completion with specific model"""
     
-    url = "https://anast.ita.chalmers.se:4000/v1/chat/completions"
-    api_key = "sk-u_7AVwCgIBRZF9IXwzPqtA"
+    url = config.LLM_CHAT_URL
+    api_key = config.LLM_API_KEY
     
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -75,7 +76,7 @@ def test_with_model(model_name):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30, verify=False)
+        response = requests.post(url, headers=headers, json=payload, timeout=30, verify=config.LLM_VERIFY_TLS)
         
         if response.status_code == 200:
             result = response.json()
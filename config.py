@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Backend configuration
+Defaults are the production backends; each can be overridden via environment,
+e.g. to point the app at the local LLM stand-in (llm_stub_server.py):
+
+    RESEARCHBOOK_LLM_BASE_URL=http://127.0.0.1:8400/v1 streamlit run streamlit_app.py
+"""
+
+import os
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# LightLLM (OpenAI-compatible)
+LLM_BASE_URL = os.environ.get("RESEARCHBOOK_LLM_BASE_URL", "https://anast.ita.chalmers.se:4000/v1").rstrip("/")
+LLM_CHAT_URL = f"{LLM_BASE_URL}/chat/completions"
+LLM_MODELS_URL = f"{LLM_BASE_URL}/models"
+LLM_API_KEY = os.environ.get("RESEARCHBOOK_LLM_API_KEY", "sk-u_7AVwCgIBRZF9IXwzPqtA")
+LLM_MODEL = os.environ.get("RESEARCHBOOK_LLM_MODEL", "claude-sonnet-4")
+# The gateway's certificate does not verify, hence the default
+LLM_VERIFY_TLS = _env_flag("RESEARCHBOOK_LLM_VERIFY_TLS", False)
+
+# Database 1 - Research Intelligence (Chalmers + ORCID)
+DB1_URI = os.environ.get("RESEARCHBOOK_DB1_URI", "neo4j+s://84711dd6.databases.neo4j.io")
+DB1_USER = os.environ.get("RESEARCHBOOK_DB1_USER", "neo4j")
+DB1_PASSWORD = os.environ.get("RESEARCHBOOK_DB1_PASSWORD", "kvWkwedbwzpifLYyA_lhgUTIVdR-l37Gz1XJHKB7bWI")
+
+# Database 2 - Thesis Relationships
+DB2_URI = os.environ.get("RESEARCHBOOK_DB2_URI", "neo4j+s://7ae716c3.databases.neo4j.io")
+DB2_USER = os.environ.get("RESEARCHBOOK_DB2_USER", "neo4j")
+DB2_PASSWORD = os.environ.get("RESEARCHBOOK_DB2_PASSWORD", "NmDzl4lSyYJqhAAtJinGbhNgbNFeiQIsH2M6IrfFECM")
+
+# Offline-built artifacts (trend cube, ...) read by the app
+ARTIFACT_DIR = os.environ.get("RESEARCHBOOK_ARTIFACT_DIR", "artifacts")
+
+# Seed topic PageRank from a DB1 fulltext index (when one covers the topic properties)
+# instead of the CONTAINS scan: faster, but Lucene matches analyzed tokens of the
+# phrase, not substrings ("learn" no longer finds "learning"), so the seeds differ
+FULLTEXT_TOPIC_SEEDS = _env_flag("RESEARCHBOOK_FULLTEXT_TOPIC_SEEDS", False)
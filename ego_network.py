@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Ego networks around a researcher
+Co-authors (DB1) and thesis ties (DB2: supervised, examined, co-supervised...)
+up to k hops, with a hard node cap. Each hop keeps only the strongest ties per
+person inside the database (ties[..$fanout]), so a hub with thousands of
+co-authors ships a few dozen rows plus a count of what was left out. The
+layout is computed here with a small NumPy spring embedder and cached with
+the graph, so the browser only draws fixed positions.
+
+    python ego_network.py "Anna Svensson" --hops 2
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from role_taxonomy import classify_rel_type
+
+MAX_HOPS = 2
+DEFAULT_MAX_NODES = 60
+HARD_MAX_NODES = 150
+# Strongest new neighbours of one hop that get expanded in the next
+EXPAND_PER_HOP = 8
+
+DB1_TIES_QUERY = """
+UNWIND $ids as source_id
+MATCH (p:Person) WHERE elementId(p) = source_id
+CALL {
+    WITH p
+    MATCH (p)-[:AUTHORED]->(pub:Publication)<-[:AUTHORED]-(other:Person)
+    WHERE other <> p
+    WITH other, count(DISTINCT pub) as weight
+    ORDER BY weight DESC, elementId(other) ASC
+    WITH collect({id: elementId(other), name: other.name, weight: weight}) as ties
+    RETURN size(ties) as total, ties[..$fanout] as ties
+}
+RETURN source_id, total, ties
+"""
+
+DB2_TIES_QUERY = """
+UNWIND $ids as source_id
+MATCH (p:Person) WHERE elementId(p) = source_id
+CALL {
+    WITH p
+    MATCH (p)-[r1]->(t:Thesis)<-[r2]-(other:Person)
+    WHERE other <> p
+    WITH other, count(DISTINCT t) as weight,
+         collect(DISTINCT type(r1)) as source_roles, collect(DISTINCT type(r2)) as target_roles
+    ORDER BY weight DESC, elementId(other) ASC
+    WITH collect({id: elementId(other), name: other.name, weight: weight,
+                  source_roles: source_roles, target_roles: target_roles}) as ties
+    RETURN size(ties) as total, ties[..$fanout] as ties
+}
+RETURN source_id, total, ties
+"""
+
+
+def _categories(rel_types: List[str]) -> set:
+    categories = set()
+    for rel_type in rel_types or []:
+        categories |= classify_rel_type(rel_type)
+    return categories
+
+
+def thesis_tie_kind(source_roles: List[str], target_roles: List[str]) -> str:
+    """Edge label for two people on the same theses, from the source's point of view"""
+    source, target = _categories(source_roles), _categories(target_roles)
+    for role, verb in (("supervision", "supervised"), ("examination", "examined"),
+                       ("advisory", "advised")):
+        if role in source and "authorship" in target:
+            return verb
+        if role in target and "authorship" in source:
+            return f"{verb} by"
+    if "supervision" in source and "supervision" in target:
+        return "co-supervised"
+    return "thesis colleague"
+
+
+def spring_layout(n: int, edges: List[Tuple[int, int, float]], seed: int = 0,
+                  iterations: int = 120, fixed_center: bool = True) -> np.ndarray:
+    """
+    Fruchterman-Reingold positions in [-1, 1]^2 for nodes 0..n-1 (node 0 pinned
+    at the origin). O(n^2) per iteration, which is fine for capped ego networks.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, size=(n, 2))
+    if n <= 1:
+        return np.zeros((n, 2))
+    adjacency = np.zeros((n, n))
+    for a, b, weight in edges:
+        adjacency[a, b] = adjacency[b, a] = max(adjacency[a, b], 1 + np.log1p(weight))
+    k = 1 / np.sqrt(n)
+    temperature = 0.2
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+        force = k * k / distance ** 2 - adjacency * distance / k
+        displacement = (delta * force[:, :, None]).sum(axis=1)
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 0.01)
+        pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        if fixed_center:
+            pos[0] = 0
+        temperature = max(temperature * 0.96, 0.005)
+    scale = np.abs(pos).max() or 1.0
+    return pos / scale
+
+
+class EgoNetworkCache:
+    """LRU of computed networks (graph + layout), each valid for ttl seconds"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[float, Dict]]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, network: Dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), network)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _identity_keys(identities: Dict[str, str]):
+    """
+    (db, person id) -> (node key, person ids per database). Nodes are keyed
+    "db:elementId"; a DB2 person joined to a DB1 person (name_index identities,
+    the same join graph_store.py uses) shares the DB1 node.
+    """
+    db2_of = {db1_id: db2_id for db2_id, db1_id in identities.items()}
+
+    def identify(db: str, person_id: str) -> Tuple[str, Dict[str, str]]:
+        db1_id = person_id if db == "db1" else identities.get(person_id)
+        if db1_id is None:
+            return f"db2:{person_id}", {"db2": person_id}
+        person_ids = {"db1": db1_id}
+        if db1_id in db2_of:
+            person_ids["db2"] = db2_of[db1_id]
+        return f"db1:{db1_id}", person_ids
+
+    return identify
+
+
+def build_ego_network(rb, center: Dict, hops: int = 1, max_nodes: int = DEFAULT_MAX_NODES) -> Dict:
+    """
+    Ego network around a name-index entry (name + person_ids per database).
+    Namesakes stay apart; people joined across DB1 and DB2 become one node.
+    """
+    hops = max(1, min(hops, MAX_HOPS))
+    max_nodes = max(2, min(max_nodes, HARD_MAX_NODES))
+
+    try:
+        identities = rb.name_index().identities
+    except Exception as e:
+        print(f"⚠️ Name index unavailable, DB1 and DB2 persons stay separate: {e}")
+        identities = {}
+    identify = _identity_keys(identities)
+
+    db, person_id = next((db, center["person_ids"][db]) for db in ("db1", "db2") if db in center["person_ids"])
+    center_key, person_ids = identify(db, person_id)
+    person_ids.update(center["person_ids"])
+    nodes: Dict[str, Dict] = {center_key: {
+        "key": center_key, "name": center["name"], "hop": 0, "weight": 0, "hidden": 0,
+        "sources": sorted(person_ids), "person_ids": person_ids}}
+    edges: Dict[Tuple[str, str], Dict] = {}
+    # (edge key, db) pairs already weighted: expanding B returns its tie back to A
+    counted = set()
+    frontier = [center_key]
+
+    for hop in range(1, hops + 1):
+        # Leave room for later hops, and share this hop's budget across the people expanded
+        budget = (max_nodes - len(nodes)) // (hops - hop + 1)
+        if budget <= 0 or not frontier:
+            break
+        fanout = max(3, budget // len(frontier))
+        hop_cap = len(nodes) + budget
+        ties = []
+        for db, query in (("db1", DB1_TIES_QUERY), ("db2", DB2_TIES_QUERY)):
+            ids = {nodes[key]["person_ids"][db]: key for key in frontier if db in nodes[key]["person_ids"]}
+            if not ids:
+                continue
+            for record in rb._query(db, f"ego_network_{db}", query, ids=list(ids), fanout=fanout):
+                source_key = ids[record["source_id"]]
+                nodes[source_key]["hidden"] += max(0, record["total"] - len(record["ties"]))
+                for tie in record["ties"]:
+                    kind = ("co-author" if db == "db1" else
+                            thesis_tie_kind(tie["source_roles"], tie["target_roles"]))
+                    ties.append((tie["weight"], db, source_key, tie, kind))
+
+        added = []
+        for weight, db, source_key, tie, kind in sorted(ties, key=lambda t: -t[0]):
+            key, person_ids = identify(db, tie["id"])
+            edge_key = tuple(sorted((source_key, key)))
+            if key == source_key or (edge_key, db) in counted:
+                continue
+            if key not in nodes:
+                if len(nodes) >= hop_cap:
+                    nodes[source_key]["hidden"] += 1
+                    continue
+                nodes[key] = {"key": key, "name": tie["name"] or tie["id"], "hop": hop, "weight": 0,
+                              "hidden": 0, "sources": [], "person_ids": person_ids}
+                added.append(key)
+            node = nodes[key]
+            if db not in node["sources"]:
+                node["sources"].append(db)
+            node["weight"] += weight
+
+            counted.add((edge_key, db))
+            edge = edges.setdefault(edge_key, {"source": source_key, "target": key, "weight": 0, "kinds": []})
+            edge["weight"] += weight
+            if kind not in edge["kinds"]:
+                edge["kinds"].append(kind)
+
+        frontier = sorted(added, key=lambda key: -nodes[key]["weight"])[:EXPAND_PER_HOP]
+
+    ordered = list(nodes)
+    index = {key: i for i, key in enumerate(ordered)}
+    seed = int(hashlib.sha256(center_key.encode("utf-8")).hexdigest()[:8], 16)
+    positions = spring_layout(len(ordered), [(index[e["source"]], index[e["target"]], e["weight"])
+                                             for e in edges.values()], seed=seed)
+    for key, (x, y) in zip(ordered, positions):
+        nodes[key]["x"], nodes[key]["y"] = round(float(x), 4), round(float(y), 4)
+
+    return {
+        "center": center["name"],
+        "hops": hops,
+        "nodes": [nodes[key] for key in ordered],
+        "edges": list(edges.values()),
+        "hidden_neighbours": sum(node["hidden"] for node in nodes.values()),
+        "built_at": time.time()
+    }
+
+
+EDGE_COLORS = {"co-author": "#1E88E5", "supervised": "#43A047", "supervised by": "#43A047",
+               "examined": "#FB8C00", "examined by": "#FB8C00", "advised": "#8E24AA",
+               "advised by": "#8E24AA", "co-supervised": "#00897B"}
+
+
+def to_pyvis_html(network: Dict, height: str = "650px", scale: float = 450) -> str:
+    """Static pyvis rendering of a network at its precomputed positions (no browser physics)"""
+    from pyvis.network import Network
+
+    net = Network(height=height, width="100%", bgcolor="#ffffff", notebook=False, cdn_resources="remote")
+    net.toggle_physics(False)
+    for node in network["nodes"]:
+        title = f"{node['name']} ({', '.join(node['sources'])})"
+        if node["hidden"]:
+            title += f" · {node['hidden']} more ties not shown"
+        net.add_node(node["key"], label=node["name"], title=title,
+                     x=node["x"] * scale, y=node["y"] * scale, physics=False,
+                     size=28 if node["hop"] == 0 else 10 + min(14, node["weight"]),
+                     color="#E53935" if node["hop"] == 0 else ("#90CAF9" if node["hop"] == 1 else "#CFD8DC"))
+    for edge in network["edges"]:
+        net.add_edge(edge["source"], edge["target"], title=", ".join(edge["kinds"]),
+                     value=edge["weight"], color=EDGE_COLORS.get(edge["kinds"][0], "#B0BEC5"))
+    return net.generate_html()
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook_final import ResearchBookFinal
+
+    parser = argparse.ArgumentParser(description="Print a researcher's ego network")
+    parser.add_argument("name")
+    parser.add_argument("--hops", type=int, default=1)
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES)
+    args = parser.parse_args()
+
+    rb = ResearchBookFinal()
+    try:
+        start = time.perf_counter()
+        network = rb.ego_network(args.name, hops=args.hops, max_nodes=args.max_nodes)
+        if "error" in network:
+            print(f"❌ {network['error']}")
+        else:
+            print(f"🕸️ {network['center']}: {len(network['nodes'])} people, {len(network['edges'])} ties, "
+                  f"{network['hidden_neighbours']} not shown ({time.perf_counter() - start:.2f}s)")
+            names = {node["key"]: node["name"] for node in network["nodes"]}
+            for edge in sorted(network["edges"], key=lambda e: -e["weight"])[:20]:
+                print(f"   {names[edge['source']]} —[{', '.join(edge['kinds'])} x{edge['weight']}]— "
+                      f"{names[edge['target']]}")
+    finally:
+        rb.close_connections()
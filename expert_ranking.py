@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Deterministic expert ranking without the LLM
+find_expert(..., rank_mode="fast") orders experts by four local signals, each
+scaled to [0, 1] and shown with the ranking so it can be explained:
+
+    relevance   matching publications and theses (log-scaled against the best match)
+    roles       strongest thesis role on the topic (supervision > examination > ...)
+    recency     last matching publication/thesis, halving every RECENCY_HALF_LIFE years
+    seniority   career length and total publication count
+
+rank_mode="hybrid" returns this ranking at once and computes the LLM narrative
+in the background (PendingResults), to be fetched by id.
+"""
+
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from role_taxonomy import classify_rel_type
+
+RANK_MODES = ("fast", "ai", "hybrid")
+
+SIGNAL_WEIGHTS = {"relevance": 0.5, "roles": 0.2, "recency": 0.15, "seniority": 0.15}
+# Thesis role categories by how much they say about expertise in the topic
+ROLE_WEIGHTS = {"supervision": 1.0, "examination": 0.8, "advisory": 0.6, "project_leadership": 0.5,
+                "teaching": 0.5, "technical_support": 0.4, "collaboration": 0.4, "authorship": 0.3}
+OTHER_ROLE_WEIGHT = 0.2
+RECENCY_HALF_LIFE = 5
+# Careers this long and publication counts this high score full seniority
+FULL_CAREER_YEARS = 30
+FULL_PUBLICATION_COUNT = 200
+
+
+def _matches(expert: Dict) -> float:
+    """Same weighting as combined_score: theses count half"""
+    return (expert.get("relevant_publications") or 0) + (expert.get("relevant_theses") or 0) * 0.5
+
+
+def _best_role(expert: Dict):
+    """(category, weight) of the expert's strongest thesis role, (None, 0) without thesis roles"""
+    best = (None, 0.0)
+    for rel_type in expert.get("thesis_roles") or expert.get("roles") or []:
+        for category in classify_rel_type(rel_type) or {"other"}:
+            weight = ROLE_WEIGHTS.get(category, OTHER_ROLE_WEIGHT)
+            if weight > best[1]:
+                best = (category, weight)
+    return best
+
+
+def _known(*values) -> List[int]:
+    return [value for value in values if value is not None]
+
+
+def ranking_signals(expert: Dict, best_matches: float, current_year: int) -> Dict:
+    """Signal values in [0, 1] plus one readable reason per signal that contributed"""
+    matches = _matches(expert)
+    relevance = math.log1p(matches) / math.log1p(best_matches) if best_matches > 0 else 0.0
+    reasons = []
+    if expert.get("relevant_publications"):
+        reasons.append(f"{expert['relevant_publications']} matching publications")
+    if expert.get("relevant_theses"):
+        reasons.append(f"{expert['relevant_theses']} matching theses")
+
+    category, roles = _best_role(expert)
+    if category:
+        reasons.append(f"{category.replace('_', ' ')} role on the topic")
+
+    last_years = _known(expert.get("last_publication_year"), expert.get("last_thesis_year"))
+    recency = 0.0
+    if last_years:
+        last_year = max(last_years)
+        recency = 0.5 ** (max(0, current_year - last_year) / RECENCY_HALF_LIFE)
+        reasons.append(f"active on the topic in {last_year}")
+
+    first_years = _known(expert.get("first_publication_year"), expert.get("first_thesis_year"))
+    parts = []
+    if first_years:
+        first_year = min(first_years)
+        parts.append(min(1.0, max(0, current_year - first_year) / FULL_CAREER_YEARS))
+        reasons.append(f"active since {first_year}")
+    if expert.get("total_publications"):
+        parts.append(min(1.0, math.log1p(expert["total_publications"]) / math.log1p(FULL_PUBLICATION_COUNT)))
+    seniority = sum(parts) / len(parts) if parts else 0.0
+
+    signals = {"relevance": relevance, "roles": roles, "recency": recency, "seniority": seniority}
+    return {"signals": {name: round(value, 4) for name, value in signals.items()}, "reasons": reasons}
+
+
+def fast_rank(experts: List[Dict], current_year: Optional[int] = None) -> List[Dict]:
+    """
+    Experts ordered by the weighted signals (ties by name and id, so the order
+    is stable), each with fast_score, ranking_signals and ranking_reasons
+    """
+    current_year = current_year or datetime.now().year
+    best_matches = max((_matches(expert) for expert in experts), default=0)
+    ranked = []
+    for expert in experts:
+        explained = ranking_signals(expert, best_matches, current_year)
+        score = sum(SIGNAL_WEIGHTS[name] * value for name, value in explained["signals"].items())
+        ranked.append({**expert, "fast_score": round(score, 4), "ranking_signals": explained["signals"],
+                       "ranking_reasons": explained["reasons"]})
+    ranked.sort(key=lambda e: (-e["fast_score"], e.get("name") or "", e.get("person_id") or ""))
+    return ranked
+
+
+class PendingResults:
+    """
+    Work that outlives the request that started it: submit() returns an id at
+    once, get() returns the Future for that id until ttl seconds after submission
+    """
+
+    def __init__(self, max_workers: int = 4, ttl: float = 900):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pending")
+        self._lock = threading.Lock()
+        self._results: Dict[str, tuple] = {}
+
+    def submit(self, fn: Callable, *args, **kwargs) -> str:
+        result_id = uuid.uuid4().hex
+        future = self._executor.submit(fn, *args, **kwargs)
+        now = time.monotonic()
+        with self._lock:
+            self._results = {key: entry for key, entry in self._results.items() if now - entry[0] <= self.ttl}
+            self._results[result_id] = (now, future)
+        return result_id
+
+    def get(self, result_id: str) -> Optional[Future]:
+        with self._lock:
+            entry = self._results.get(result_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
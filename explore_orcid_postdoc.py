@@ -1,161 +1,99 @@
 #!/usr/bin/env python3
+"""
+ORCID and postdoc data in the first database. Which properties exist (and how
+often they are filled) comes from the schema service (schema_service.py), so
+the sample queries only ever name property keys that occur.
+"""
 
-from neo4j import GraphDatabase
+from researchbook import ResearchBook
 
-# First database credentials
-NEO4J_URI = "neo4j+s://84711dd6.databases.neo4j.io"
-NEO4J_USERNAME = "neo4j"
-NEO4J_PASSWORD = "kvWkwedbwzpifLYyA_lhgUTIVdR-l37Gz1XJHKB7bWI"
-NEO4J_DATABASE = "neo4j"
+POSTDOC_TERMS = ("postdoc", "post-doc", "post doc")
+
+def _prop(alias: str, key: str) -> str:
+    """Property access safe for any key the schema reports"""
+    return "%s.`%s`" % (alias, key.replace("`", "``"))
 
 def explore_orcid_and_postdoc():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
-    
+    rb = ResearchBook()
+
     try:
-        with driver.session(database=NEO4J_DATABASE) as session:
-            print("🔍 Exploring ORCID and Postdoc data in first database...\n")
-            
-            # 1. Look for ORCID data
-            print("📋 ORCID Integration:")
-            orcid_query = """
+        print("🔍 Exploring ORCID and Postdoc data in first database...\n")
+        schema = rb.schema_service.refresh("db1")
+
+        # 1. ORCID properties on Person, by fill rate
+        print("📋 ORCID Integration:")
+        person = schema.labels.get("Person", {"count": 0, "properties": {}})
+        orcid_props = sorted((key for key in person["properties"] if "orcid" in key.lower()),
+                             key=lambda key: -person["properties"][key]["fill_rate"])
+        for key in orcid_props:
+            print(f"   {key}: {person['properties'][key]['fill_rate']:.1%} of {person['count']:,} persons")
+
+        if orcid_props:
+            sample_query = """
             MATCH (p:Person)
-            WHERE p.orcid_id IS NOT NULL OR 
-                  p.orcid_given_names IS NOT NULL OR
-                  p.orcid_family_name IS NOT NULL OR
-                  any(key IN keys(p) WHERE key CONTAINS 'orcid')
-            RETURN p
+            WHERE %s
+            RETURN p.name as name, %s
             LIMIT 5
-            """
-            
-            orcid_result = session.run(orcid_query)
-            orcid_count = 0
-            for record in orcid_result:
-                person = record['p']
-                print(f"   Person: {person.get('name', 'N/A')}")
-                # Show all orcid-related properties
-                orcid_props = {k: v for k, v in person.items() if 'orcid' in k.lower()}
-                if orcid_props:
-                    for key, value in orcid_props.items():
-                        print(f"     {key}: {value}")
-                orcid_count += 1
-            
-            if orcid_count == 0:
-                # Try alternative search
-                print("   Searching for ORCID in different property patterns...")
-                alt_orcid_query = """
-                CALL db.propertyKeys() YIELD propertyKey
-                WHERE toLower(propertyKey) CONTAINS 'orcid'
-                RETURN propertyKey
-                LIMIT 10
-                """
-                alt_result = session.run(alt_orcid_query)
-                orcid_props = [record['propertyKey'] for record in alt_result]
-                print(f"   Found ORCID-related properties: {orcid_props}")
-                
-                if orcid_props:
-                    # Sample data with these properties
-                    sample_query = f"""
-                    MATCH (p:Person)
-                    WHERE p.{orcid_props[0]} IS NOT NULL
-                    RETURN p.{orcid_props[0]} as orcid_value, p.name as name
-                    LIMIT 5
-                    """
-                    sample_result = session.run(sample_query)
-                    for record in sample_result:
-                        print(f"   {record['name']}: {record['orcid_value']}")
-            
-            # 2. Look for postdoc history in WORKED_AT relationships
-            print(f"\n🎓 Postdoc History Analysis:")
+            """ % (" OR ".join(f"{_prop('p', key)} IS NOT NULL" for key in orcid_props),
+                   ", ".join(f"{_prop('p', key)} as orcid_{i}" for i, key in enumerate(orcid_props)))
+            for record in rb._query("db1", "explore_orcid", sample_query):
+                print(f"   Person: {record['name'] or 'N/A'}")
+                for i, key in enumerate(orcid_props):
+                    if record[f"orcid_{i}"] is not None:
+                        print(f"     {key}: {record[f'orcid_{i}']}")
+        else:
+            print("   No ORCID-related properties on Person")
+
+        # 2. Postdoc history in WORKED_AT relationships
+        print(f"\n🎓 Postdoc History Analysis:")
+        worked_at = schema.rel_types.get("WORKED_AT", {"count": 0, "properties": {}})
+        props = sorted(worked_at["properties"])
+        text_props = [key for key in ("position", "role") if key in worked_at["properties"]]
+        columns = ", ".join(f"{_prop('r', key)} as {key}" for key in ("position", "role", "start_year", "end_year")
+                            if key in worked_at["properties"])
+
+        if text_props:
             postdoc_query = """
             MATCH (p:Person)-[r:WORKED_AT]->(o:Organization)
-            WHERE toLower(r.position) CONTAINS 'postdoc' OR
-                  toLower(r.position) CONTAINS 'post-doc' OR
-                  toLower(r.position) CONTAINS 'post doc' OR
-                  toLower(r.role) CONTAINS 'postdoc' OR
-                  toLower(r.role) CONTAINS 'post-doc' OR
-                  toLower(r.role) CONTAINS 'post doc'
-            RETURN p.name as person_name, 
-                   o.name as organization, 
-                   r.position as position,
-                   r.role as role,
-                   r.start_year as start_year,
-                   r.end_year as end_year
+            WHERE any(term IN $terms WHERE %s)
+            RETURN p.name as person_name, o.name as organization, %s
             LIMIT 10
-            """
-            
-            postdoc_result = session.run(postdoc_query)
-            postdoc_count = 0
-            for record in postdoc_result:
-                print(f"   {record['person_name']} -> {record['organization']}")
-                print(f"     Position: {record['position']}")
-                print(f"     Role: {record['role']}")
-                if record['start_year'] or record['end_year']:
-                    print(f"     Period: {record['start_year']} - {record['end_year']}")
-                print()
-                postdoc_count += 1
-            
-            if postdoc_count == 0:
-                # Look for any WORKED_AT relationships with time data
-                print("   Looking for WORKED_AT relationships with temporal data...")
-                work_query = """
-                MATCH (p:Person)-[r:WORKED_AT]->(o:Organization)
-                WHERE r.start_year IS NOT NULL OR r.end_year IS NOT NULL OR
-                      r.position IS NOT NULL OR r.role IS NOT NULL
-                RETURN p.name as person_name, 
-                       o.name as organization, 
-                       r.position as position,
-                       r.role as role,
-                       r.start_year as start_year,
-                       r.end_year as end_year
-                LIMIT 10
-                """
-                
-                work_result = session.run(work_query)
-                for record in work_result:
-                    print(f"   {record['person_name']} -> {record['organization']}")
-                    if record['position']:
-                        print(f"     Position: {record['position']}")
-                    if record['role']:
-                        print(f"     Role: {record['role']}")
-                    if record['start_year'] or record['end_year']:
-                        print(f"     Period: {record['start_year']} - {record['end_year']}")
-                    print()
-            
-            # 3. Explore what relationship properties exist
-            print("🔗 WORKED_AT Relationship Properties:")
-            prop_query = """
-            MATCH ()-[r:WORKED_AT]->()
-            WITH keys(r) as props
-            UNWIND props as prop
-            RETURN DISTINCT prop
-            ORDER BY prop
-            """
-            
-            prop_result = session.run(prop_query)
-            props = [record['prop'] for record in prop_result]
-            print(f"   Available properties: {props}")
-            
-            # 4. Sample some WORKED_AT relationships to see structure
-            print(f"\n📊 Sample WORKED_AT relationships:")
-            sample_work_query = """
-            MATCH (p:Person)-[r:WORKED_AT]->(o:Organization)
-            RETURN p.name as person, o.name as org, r
-            LIMIT 5
-            """
-            
-            sample_result = session.run(sample_work_query)
-            for record in sample_result:
-                print(f"   {record['person']} -> {record['org']}")
-                rel_props = dict(record['r'])
-                if rel_props:
-                    for key, value in rel_props.items():
-                        print(f"     {key}: {value}")
-                print()
-            
+            """ % (" OR ".join(f"toLower({_prop('r', key)}) CONTAINS term" for key in text_props), columns)
+            records = rb._query("db1", "explore_postdoc", postdoc_query, terms=list(POSTDOC_TERMS))
+        else:
+            print("   WORKED_AT has no position or role property")
+            records = []
+
+        for record in records:
+            print(f"   {record['person_name']} -> {record['organization']}")
+            for key in text_props:
+                print(f"     {key.capitalize()}: {record[key]}")
+            if record.get('start_year') or record.get('end_year'):
+                print(f"     Period: {record.get('start_year')} - {record.get('end_year')}")
+            print()
+
+        # 3. What relationship properties exist, and how often
+        print("🔗 WORKED_AT Relationship Properties:")
+        for key in props:
+            print(f"   {key}: {worked_at['properties'][key]['fill_rate']:.1%} of {worked_at['count']:,}")
+
+        # 4. Sample some WORKED_AT relationships to see structure
+        print(f"\n📊 Sample WORKED_AT relationships:")
+        sample_work_query = """
+        MATCH (p:Person)-[r:WORKED_AT]->(o:Organization)
+        RETURN p.name as person, o.name as org, properties(r) as props
+        LIMIT 5
+        """
+        for record in rb._query("db1", "explore_worked_at", sample_work_query):
+            print(f"   {record['person']} -> {record['org']}")
+            for key, value in (record['props'] or {}).items():
+                print(f"     {key}: {value}")
+            print()
+
     except Exception as e:
         print(f"❌ Error exploring data: {e}")
     finally:
-        driver.close()
+        rb.close_connections()
 
 if __name__ == "__main__":
-    explore_orcid_and_postdoc()
\ No newline at end of file
+    explore_orcid_and_postdoc()
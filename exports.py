@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Streaming Exports
+Write record streams to CSV or JSONL one row at a time, so exporting every
+researcher in a large field never holds the full result in memory.
+
+    python exports.py field "machine learning" -o ml_researchers.csv
+    python exports.py experts sustainability --roles supervision --format jsonl
+    python exports.py matches "Anders" -o anders_matches.jsonl
+"""
+
+import csv
+import itertools
+import json
+import sys
+from typing import IO, Dict, Iterable, List, Optional
+
+LIST_SEPARATOR = "; "
+
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return LIST_SEPARATOR.join(str(v) for v in value if v is not None)
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return value
+
+
+def write_csv(records: Iterable[Dict], out: IO[str], fieldnames: Optional[List[str]] = None,
+              flush_every: int = 1000) -> int:
+    """
+    Write records as CSV rows as they arrive. Columns come from fieldnames or the
+    first record; list values are joined with '; '. Returns the number of rows.
+    """
+    records = iter(records)
+    if fieldnames is None:
+        first = next(records, None)
+        if first is None:
+            return 0
+        fieldnames = list(first)
+        records = itertools.chain([first], records)
+
+    writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow({key: _csv_value(value) for key, value in record.items()})
+        count += 1
+        if count % flush_every == 0:
+            out.flush()
+    out.flush()
+    return count
+
+
+def write_jsonl(records: Iterable[Dict], out: IO[str], flush_every: int = 1000) -> int:
+    """Write one JSON object per line as records arrive. Returns the number of rows."""
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        count += 1
+        if count % flush_every == 0:
+            out.flush()
+    out.flush()
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+# DB1 and DB2 expert rows have different keys; CSV needs the union up front
+EXPERT_FIELDS = ["source", "name", "orcid_id", "relevant_publications", "relevant_theses",
+                 "organizations", "roles"]
+
+
+def export(records: Iterable[Dict], path: Optional[str], fmt: str,
+           fieldnames: Optional[List[str]] = None) -> int:
+    """Stream records to path (or stdout when path is None or '-')"""
+    def write(out):
+        if fmt == "csv":
+            return write_csv(records, out, fieldnames)
+        return WRITERS[fmt](records, out)
+
+    if not path or path == "-":
+        return write(sys.stdout)
+    with open(path, "w", encoding="utf-8", newline="" if fmt == "csv" else None) as out:
+        return write(out)
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook_final import ResearchBookFinal
+
+    parser = argparse.ArgumentParser(description="Stream ResearchBook search results to CSV/JSONL")
+    parser.add_argument("kind", choices=["field", "experts", "matches"])
+    parser.add_argument("term", help="research field, topic or researcher name")
+    parser.add_argument("--roles", nargs="*", help="role categories, e.g. supervision examination")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="default: from -o extension, else csv")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--fetch-size", type=int, default=1000, help="records per Neo4j round trip")
+    args = parser.parse_args()
+
+    fieldnames = None
+    fmt = args.format or ("jsonl" if args.output and args.output.endswith(".jsonl") else "csv")
+    rb = ResearchBookFinal()
+    try:
+        if args.kind == "field":
+            records = rb.stream_field_researchers(args.term, args.roles, fetch_size=args.fetch_size)
+        elif args.kind == "experts":
+            records = rb.stream_experts(args.term, args.roles, fetch_size=args.fetch_size)
+            fieldnames = EXPERT_FIELDS
+        else:
+            keywords = rb._get_target_keywords(args.term)
+            if not keywords:
+                sys.exit(f"❌ No thesis data found for {args.term}")
+            records = rb.stream_matches(args.term, keywords, args.roles, fetch_size=args.fetch_size)
+
+        count = export(records, args.output, fmt, fieldnames)
+        print(f"✅ Exported {count:,} rows ({fmt})", file=sys.stderr)
+    finally:
+        rb.close_connections()
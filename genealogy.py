@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Academic genealogy (supervision lineages)
+Supervisor -> thesis author edges from DB2, kept in a local SQLite file with a
+transitive-closure table (ancestor, descendant, shortest depth). "All academic
+descendants of X" or "closest common academic ancestor of X and Y" become
+index lookups instead of variable-length traversals in Neo4j.
+
+    python genealogy.py                       # add new supervision edges
+    python genealogy.py --full                # rebuild from scratch
+    python genealogy.py --descendants "Anna Svensson"
+
+New edges are folded into the closure incrementally; if an edge disappeared
+from DB2 the closure is rebuilt, since removals cannot be undone in place.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import config
+
+GENEALOGY_VERSION = 1
+DEFAULT_PATH = os.path.join(config.ARTIFACT_DIR, "genealogy.sqlite")
+# Relationship types that make a person the student of a thesis
+STUDENT_TYPES = ("AUTHOR", "CO_AUTHOR")
+
+EDGES_QUERY = """
+MATCH (supervisor:Person)-[:%s]->(t:Thesis)<-[:%s]-(student:Person)
+WHERE supervisor <> student
+RETURN DISTINCT elementId(supervisor) as supervisor_id,
+       supervisor.name as supervisor_name,
+       elementId(student) as student_id,
+       student.name as student_name,
+       elementId(t) as thesis_id,
+       t.created_date.year as year
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS persons (id TEXT PRIMARY KEY, name TEXT);
+CREATE TABLE IF NOT EXISTS edges (
+    supervisor TEXT NOT NULL, student TEXT NOT NULL, thesis TEXT NOT NULL, year INTEGER,
+    PRIMARY KEY (supervisor, student, thesis)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS closure (
+    ancestor TEXT NOT NULL, descendant TEXT NOT NULL, depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor, descendant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS closure_by_descendant ON closure (descendant, ancestor, depth);
+CREATE INDEX IF NOT EXISTS persons_by_name ON persons (name);
+"""
+
+# Every ancestor of the supervisor (and the supervisor) gains every descendant of
+# the student (and the student); existing pairs keep the shorter depth
+ADD_EDGE_SQL = """
+INSERT INTO closure (ancestor, descendant, depth)
+SELECT a.ancestor, d.descendant, a.depth + 1 + d.depth
+FROM (SELECT ancestor, depth FROM closure WHERE descendant = :supervisor
+      UNION ALL SELECT :supervisor, 0) a,
+     (SELECT descendant, depth FROM closure WHERE ancestor = :student
+      UNION ALL SELECT :student, 0) d
+WHERE a.ancestor <> d.descendant
+ON CONFLICT (ancestor, descendant) DO UPDATE SET depth = min(depth, excluded.depth)
+"""
+
+
+def _connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def _add_edges(connection: sqlite3.Connection, pairs: Iterable[Tuple[str, str]]) -> int:
+    added = 0
+    for supervisor, student in pairs:
+        connection.execute(ADD_EDGE_SQL, {"supervisor": supervisor, "student": student})
+        added += 1
+    return added
+
+
+def refresh_genealogy(rb, path: str = DEFAULT_PATH, full: bool = False,
+                      fetch_size: int = 5000) -> Dict[str, int]:
+    """Sync the edge list with DB2 and fold new supervisor->student pairs into the closure"""
+    supervision = rb._role_pattern(["supervision"]).lstrip(":")
+    students = "|".join(STUDENT_TYPES)
+    current = {}
+    names = {}
+    for record in rb._stream_query("db2", "genealogy_edges", EDGES_QUERY % (supervision, students),
+                                   fetch_size=fetch_size):
+        current[(record["supervisor_id"], record["student_id"], record["thesis_id"])] = record["year"]
+        names[record["supervisor_id"]] = record["supervisor_name"]
+        names[record["student_id"]] = record["student_name"]
+
+    connection = _connect(path)
+    try:
+        with connection:
+            version = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            stored = {(row["supervisor"], row["student"], row["thesis"])
+                      for row in connection.execute("SELECT supervisor, student, thesis FROM edges")}
+            rebuild = full or version is None or int(version["value"]) != GENEALOGY_VERSION
+            if not rebuild and stored - set(current):
+                print("   ♻️ Supervision edges were removed since the last build, rebuilding")
+                rebuild = True
+            if rebuild:
+                connection.execute("DELETE FROM edges")
+                connection.execute("DELETE FROM closure")
+                stored = set()
+
+            new_edges = [edge for edge in current if edge not in stored]
+            connection.executemany("INSERT OR REPLACE INTO persons (id, name) VALUES (?, ?)", names.items())
+            connection.executemany("INSERT INTO edges (supervisor, student, thesis, year) VALUES (?, ?, ?, ?)",
+                                   [(*edge, current[edge]) for edge in new_edges])
+            known_pairs = {(s, st) for s, st, _ in stored}
+            new_pairs = sorted({(s, st) for s, st, _ in new_edges} - known_pairs)
+            _add_edges(connection, new_pairs)
+            connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                   [("version", str(GENEALOGY_VERSION)), ("built_at", str(time.time()))])
+            closure_rows = connection.execute("SELECT count(*) FROM closure").fetchone()[0]
+    finally:
+        connection.close()
+
+    return {"edges": len(current), "new_edges": len(new_edges), "new_pairs": len(new_pairs),
+            "closure_rows": closure_rows, "rebuilt": int(rebuild)}
+
+
+class Genealogy:
+    """Read side: lineage queries answered from the closure table's indexes"""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+
+    def available(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _rows(self, sql: str, params: tuple) -> List[Dict]:
+        connection = _connect(self.path, readonly=True)
+        try:
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def person_ids(self, name: str) -> List[str]:
+        """Ids of persons in the genealogy with exactly this name"""
+        return [row["id"] for row in self._rows("SELECT id FROM persons WHERE name = ?", (name,))]
+
+    def ancestors(self, person_id: str, max_depth: Optional[int] = None) -> List[Dict]:
+        """Supervisors, their supervisors, ... nearest first"""
+        return self._rows("""
+            SELECT c.ancestor as id, p.name, c.depth FROM closure c JOIN persons p ON p.id = c.ancestor
+            WHERE c.descendant = ? AND c.depth <= ? ORDER BY c.depth, p.name
+            """, (person_id, 1 << 30 if max_depth is None else max_depth))
+
+    def descendants(self, person_id: str, max_depth: Optional[int] = None) -> List[Dict]:
+        """Students, their students, ... nearest first"""
+        return self._rows("""
+            SELECT c.descendant as id, p.name, c.depth FROM closure c JOIN persons p ON p.id = c.descendant
+            WHERE c.ancestor = ? AND c.depth <= ? ORDER BY c.depth, p.name
+            """, (person_id, 1 << 30 if max_depth is None else max_depth))
+
+    def common_ancestors(self, person_a: str, person_b: str, limit: int = 10) -> List[Dict]:
+        """
+        Shared academic ancestors, closest (smallest combined depth) first. Either
+        person counts as an ancestor of themselves, so a direct lineage shows up too.
+        """
+        return self._rows("""
+            WITH a(id, depth) AS (SELECT ancestor, depth FROM closure WHERE descendant = :a
+                                  UNION ALL SELECT :a, 0),
+                 b(id, depth) AS (SELECT ancestor, depth FROM closure WHERE descendant = :b
+                                  UNION ALL SELECT :b, 0)
+            SELECT a.id, p.name, a.depth as depth_a, b.depth as depth_b
+            FROM a JOIN b ON a.id = b.id JOIN persons p ON p.id = a.id
+            ORDER BY a.depth + b.depth, max(a.depth, b.depth)
+            LIMIT :limit
+            """, {"a": person_a, "b": person_b, "limit": limit})
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._rows("""
+            SELECT (SELECT count(*) FROM persons) as persons, (SELECT count(*) FROM edges) as edges,
+                   (SELECT count(*) FROM closure) as closure_rows,
+                   (SELECT coalesce(max(depth), 0) FROM closure) as max_depth
+            """, ())
+        return rows[0]
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook_final import ResearchBookFinal
+
+    parser = argparse.ArgumentParser(description="Build or query the supervision genealogy")
+    parser.add_argument("--full", action="store_true", help="rebuild from scratch")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--ancestors", metavar="NAME")
+    parser.add_argument("--descendants", metavar="NAME")
+    args = parser.parse_args()
+
+    rb = ResearchBookFinal()
+    try:
+        if args.ancestors or args.descendants:
+            direction = "ancestors" if args.ancestors else "descendants"
+            result = rb.academic_lineage(args.ancestors or args.descendants, direction)
+            if "error" in result:
+                print(f"❌ {result['error']}")
+                for candidate in result.get("did_you_mean", []):
+                    hint = f" ({candidate['hint']})" if candidate["hint"] else ""
+                    print(f"   did you mean {candidate['name']}{hint}")
+            else:
+                print(f"🌳 {len(result['people'])} {direction} of {result['person']}")
+                for person in result["people"][:50]:
+                    print(f"   {'  ' * (person['depth'] - 1)}{person['name']} (depth {person['depth']})")
+        else:
+            print("🌳 Refreshing supervision genealogy from DB2...")
+            start = time.perf_counter()
+            stats = refresh_genealogy(rb, args.path, full=args.full)
+            print(f"🎉 {stats['new_edges']:,} new edges ({stats['edges']:,} total), "
+                  f"{stats['closure_rows']:,} ancestor pairs ({time.perf_counter() - start:.1f}s) → {args.path}")
+    finally:
+        rb.close_connections()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Offline centrality scores per person
+Runs over the local graph store (graph_store.py) with NumPy only:
+
+    pagerank      PageRank on the whole person-item graph
+    degree        number of publications, organizations and theses
+    betweenness   Brandes betweenness, approximated from sampled source persons
+    coauthorship  PageRank restricted to AUTHORED edges
+    supervision   PageRank on student -> supervisor links from DB2 theses, so
+                  credit flows to supervisors of well-supervised supervisors
+
+Scores are stored per person with their percentiles and used by find_expert
+as ranking features (see ResearchBook._merge_expert_results).
+
+At query time, personalized_pagerank ranks people by their closeness to one
+topic's publications and theses (find_expert(..., scoring="pagerank")).
+
+    python graph_analytics.py            # after python graph_store.py
+"""
+
+import os
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from artifacts import ArtifactReader
+from genealogy import STUDENT_TYPES
+from graph_store import DEFAULT_PATH as GRAPH_STORE_PATH, KINDS, PERSON, PUBLICATION, THESIS, GraphStore
+from role_taxonomy import classify_rel_type
+
+SCORES_VERSION = 1
+DEFAULT_PATH = os.path.join(config.ARTIFACT_DIR, "person_scores.npz")
+FEATURES = ["pagerank", "degree", "betweenness", "coauthorship", "supervision"]
+
+# How much each centrality percentile counts in the expert ranking (sums to 1)
+RANKING_WEIGHTS = {"pagerank": 0.3, "coauthorship": 0.25, "supervision": 0.25, "betweenness": 0.2}
+
+# Personalized PageRank: teleport probability, and the residual per unit of degree
+# below which a node is not pushed (total work is O(1 / (PPR_ALPHA * PPR_EPSILON)))
+PPR_ALPHA = 0.15
+PPR_EPSILON = 1e-5
+PPR_MAX_PUSHES = 200_000
+
+
+def pagerank(n: int, sources: np.ndarray, targets: np.ndarray, damping: float = 0.85,
+             iterations: int = 100, tolerance: float = 1e-10) -> np.ndarray:
+    """PageRank over directed edges sources[i] -> targets[i]; dangling mass is spread uniformly"""
+    out_degree = np.bincount(sources, minlength=n).astype(np.float64)
+    dangling = out_degree == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        share = np.where(dangling, 0.0, rank / np.maximum(out_degree, 1))
+        new_rank = np.bincount(targets, weights=share[sources], minlength=n)
+        new_rank = (1 - damping) / n + damping * (new_rank + rank[dangling].sum() / n)
+        if np.abs(new_rank - rank).sum() < tolerance:
+            return new_rank
+        rank = new_rank
+    return rank
+
+
+def _simple_csr(store: GraphStore):
+    """indptr/indices without parallel edges (one person with two roles on a thesis counts once)"""
+    n = len(store.kinds)
+    sources = np.repeat(np.arange(n), np.diff(store.indptr))
+    pairs = np.unique(sources * n + store.indices)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(pairs // n, minlength=n))))
+    return indptr, pairs % n
+
+
+def _expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray):
+    """All CSR entries leaving the frontier: (source node, neighbour) arrays"""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    sources = np.repeat(frontier, counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return sources, indices[np.repeat(starts, counts) + offsets]
+
+
+def approximate_betweenness(store: GraphStore, samples: int = 64, seed: int = 0) -> np.ndarray:
+    """
+    Brandes' accumulation from `samples` random person sources, level-synchronous
+    so every BFS level is a handful of NumPy operations; scaled to all persons
+    """
+    n = len(store.kinds)
+    persons = np.flatnonzero(store.kinds == PERSON)
+    if not len(persons):
+        return np.zeros(n)
+    indptr, indices = _simple_csr(store)
+    rng = np.random.default_rng(seed)
+    pivots = rng.choice(persons, size=min(samples, len(persons)), replace=False)
+    betweenness = np.zeros(n)
+
+    for pivot in pivots:
+        distance = np.full(n, -1, dtype=np.int32)
+        sigma = np.zeros(n)
+        distance[pivot], sigma[pivot] = 0, 1.0
+        frontier, level, levels = np.array([pivot]), 0, []
+        while len(frontier):
+            sources, neighbours = _expand(indptr, indices, frontier)
+            undiscovered = distance[neighbours] < 0
+            distance[neighbours[undiscovered]] = level + 1
+            on_shortest = distance[neighbours] == level + 1
+            sources, neighbours = sources[on_shortest], neighbours[on_shortest]
+            sigma += np.bincount(neighbours, weights=sigma[sources], minlength=n)
+            levels.append((sources, neighbours))
+            frontier = np.flatnonzero(distance == level + 1)
+            level += 1
+
+        delta = np.zeros(n)
+        for sources, neighbours in reversed(levels):
+            delta += np.bincount(sources, weights=sigma[sources] / sigma[neighbours] * (1 + delta[neighbours]),
+                                 minlength=n)
+        delta[pivot] = 0
+        betweenness += delta
+
+    return betweenness * len(persons) / len(pivots)
+
+
+def _supervision_edges(store: GraphStore):
+    """Student -> supervisor pairs through each thesis"""
+    supervision_types = {i for i, name in enumerate(store.type_names) if "supervision" in classify_rel_type(name)}
+    student_types = {i for i, name in enumerate(store.type_names) if name in STUDENT_TYPES}
+    students, supervisors = [], []
+    for thesis in np.flatnonzero(store.kinds == THESIS):
+        start, end = store.indptr[thesis], store.indptr[thesis + 1]
+        people, types = store.indices[start:end], store.edge_types[start:end]
+        thesis_supervisors = [p for p, t in zip(people.tolist(), types.tolist()) if t in supervision_types]
+        thesis_students = [p for p, t in zip(people.tolist(), types.tolist()) if t in student_types]
+        for student in thesis_students:
+            for supervisor in thesis_supervisors:
+                if student != supervisor:
+                    students.append(student)
+                    supervisors.append(supervisor)
+    return np.array(students, dtype=np.int64), np.array(supervisors, dtype=np.int64)
+
+
+def personalized_pagerank(store: GraphStore, seeds: Dict[int, float], alpha: float = PPR_ALPHA,
+                          epsilon: float = PPR_EPSILON,
+                          max_pushes: int = PPR_MAX_PUSHES) -> Tuple[Dict[int, float], Dict]:
+    """
+    Approximate PageRank personalized to `seeds` (node -> weight) by local push
+    (Andersen, Chung & Lang): a node's residual is pushed to its neighbours only
+    while it exceeds epsilon * degree, so the work depends on the seeds'
+    neighbourhood and epsilon, not on the size of the graph.
+    """
+    indptr, indices = store.indptr, store.indices
+    total = sum(seeds.values())
+    residual = {node: weight / total for node, weight in seeds.items() if weight > 0}
+    estimate: Dict[int, float] = {}
+    queue = deque(residual)
+    pushes = 0
+    while queue and pushes < max_pushes:
+        node = queue.popleft()
+        start, end = int(indptr[node]), int(indptr[node + 1])
+        mass = residual[node]
+        if end == start or mass < epsilon * (end - start):
+            continue
+        estimate[node] = estimate.get(node, 0.0) + alpha * mass
+        residual[node] = 0.0
+        share = (1 - alpha) * mass / (end - start)
+        for neighbour in indices[start:end].tolist():
+            before = residual.get(neighbour, 0.0)
+            residual[neighbour] = before + share
+            threshold = epsilon * int(indptr[neighbour + 1] - indptr[neighbour])
+            if before < threshold <= before + share:
+                queue.append(neighbour)
+        pushes += 1
+    return estimate, {"pushes": pushes, "touched": len(residual), "converged": not queue}
+
+
+def topic_experts(store: GraphStore, seed_keys: List[str], k: int = 10, alpha: float = PPR_ALPHA,
+                  epsilon: float = PPR_EPSILON, provenance: int = 3) -> Dict:
+    """
+    People ranked by personalized PageRank from a topic's matching items
+    (graph store keys of publications and theses). Each expert carries the
+    neighbouring items that passed them the most score as provenance.
+    """
+    seeds = {store.key_index[key]: 1.0 for key in seed_keys if key in store.key_index}
+    if not seeds:
+        return {"experts": [], "seeds": 0, "pushes": 0, "touched": 0, "converged": True}
+    estimate, stats = personalized_pagerank(store, seeds, alpha, epsilon)
+    persons = [node for node in estimate if store.kinds[node] == PERSON]
+    persons.sort(key=lambda node: -estimate[node])
+
+    experts = []
+    for node in persons[:k]:
+        # A person's score is (1 - alpha) * sum of estimate / degree over their items
+        items = set(store.neighbours(node).tolist())
+        inflow = {item: estimate.get(item, 0.0) / store.degree(item) for item in items}
+        received = sum(inflow.values()) or 1.0
+        items = sorted(items, key=lambda item: -inflow[item])
+        key = store.keys[node]
+        experts.append({
+            "person_id": key.split(":", 1)[1],
+            "name": store.names[node],
+            "source": ("both_databases" if key in store.joined else
+                       "database_1" if key.startswith("db1:") else "database_2"),
+            "topic_rank": round(estimate[node], 8),
+            "relevant_publications": sum(1 for item in items if item in seeds and store.kinds[item] == PUBLICATION),
+            "relevant_theses": sum(1 for item in items if item in seeds and store.kinds[item] == THESIS),
+            "provenance": [{"item": store.names[item], "kind": KINDS[store.kinds[item]],
+                            "role": store.edge_type(node, item), "matches_topic": item in seeds,
+                            "share": round(inflow[item] / received, 3)}
+                           for item in items[:provenance] if inflow[item]]
+        })
+    return {"experts": experts, "seeds": len(seeds), **stats}
+
+
+def _percentiles(values: np.ndarray) -> np.ndarray:
+    """Share of persons scoring strictly lower (ties share a percentile)"""
+    if len(values) < 2:
+        return np.ones(len(values))
+    ordered = np.sort(values)
+    return np.searchsorted(ordered, values, side="left") / (len(values) - 1)
+
+
+class PersonScores:
+    """Per-person feature vectors, aligned with `keys` (graph store person keys)"""
+
+    def __init__(self, keys: List[str], features: Dict[str, np.ndarray], aliases: Dict[str, str],
+                 built_at: float = 0.0):
+        self.keys = keys
+        self.features = features
+        self.aliases = aliases
+        self.built_at = built_at
+        self.index = {key: i for i, key in enumerate(keys)}
+        for alias, key in aliases.items():
+            if key in self.index:
+                self.index[alias] = self.index[key]
+        self.percentiles = {name: _percentiles(values) for name, values in features.items()}
+
+    @classmethod
+    def compute(cls, store: GraphStore, betweenness_samples: int = 64, seed: int = 0) -> "PersonScores":
+        n = len(store.kinds)
+        persons = np.flatnonzero(store.kinds == PERSON)
+        sources = np.repeat(np.arange(n), np.diff(store.indptr))
+        simple_indptr, _ = _simple_csr(store)
+        authored = [i for i, name in enumerate(store.type_names) if name == "AUTHORED"]
+        coauthor_mask = np.isin(store.edge_types, authored)
+        students, supervisors = _supervision_edges(store)
+
+        scores = {
+            "pagerank": pagerank(n, sources, store.indices),
+            "degree": np.diff(simple_indptr).astype(np.float64),
+            "betweenness": approximate_betweenness(store, betweenness_samples, seed),
+            "coauthorship": pagerank(n, sources[coauthor_mask], store.indices[coauthor_mask]),
+            "supervision": pagerank(n, students, supervisors)
+        }
+        return cls([store.keys[i] for i in persons], {name: values[persons] for name, values in scores.items()},
+                   store.aliases, time.time())
+
+    def lookup(self, db: str, person_id: str) -> Optional[Dict[str, Dict[str, float]]]:
+        """{feature: {"value", "percentile"}} for a DB1/DB2 person id, None if unknown"""
+        i = self.index.get(f"{db}:{person_id}")
+        if i is None:
+            return None
+        return {name: {"value": round(float(self.features[name][i]), 8),
+                       "percentile": round(float(self.percentiles[name][i]), 4)} for name in FEATURES}
+
+    def centrality(self, features: Optional[Dict[str, Dict[str, float]]]) -> float:
+        """Weighted centrality percentile in [0, 1] (0.5, i.e. neutral, for unknown persons)"""
+        if not features:
+            return 0.5
+        return sum(weight * features[name]["percentile"] for name, weight in RANKING_WEIGHTS.items())
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path, version=np.array(SCORES_VERSION), keys=np.array(self.keys),
+            alias_keys=np.array(list(self.aliases), dtype=str),
+            alias_targets=np.array(list(self.aliases.values()), dtype=str),
+            built_at=np.array(self.built_at), **{f"feature_{name}": self.features[name] for name in FEATURES})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional["PersonScores"]:
+        """The stored scores, or None if missing or built by an incompatible version"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data["version"]) != SCORES_VERSION:
+                return None
+            return cls([str(k) for k in data["keys"]], {name: data[f"feature_{name}"] for name in FEATURES},
+                       dict(zip((str(k) for k in data["alias_keys"]), (str(k) for k in data["alias_targets"]))),
+                       float(data["built_at"]))
+
+
+class PersonScoresReader(ArtifactReader):
+    def __init__(self, path: str = DEFAULT_PATH):
+        super().__init__(path, PersonScores.load)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute per-person centrality scores from the graph store")
+    parser.add_argument("--store", default=GRAPH_STORE_PATH)
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--betweenness-samples", type=int, default=64)
+    args = parser.parse_args()
+
+    store = GraphStore.load(args.store)
+    if store is None:
+        raise SystemExit(f"❌ No graph store at {args.store} (run python graph_store.py first)")
+    print(f"📐 Scoring {int((store.kinds == PERSON).sum()):,} persons...")
+    start = time.perf_counter()
+    scores = PersonScores.compute(store, args.betweenness_samples)
+    scores.save(args.path)
+    print(f"🎉 Done in {time.perf_counter() - start:.1f}s → {args.path}")
+    top = np.argsort(-scores.features["pagerank"])[:10]
+    for i in top:
+        print(f"   {store.names[store.key_index[scores.keys[i]]]}: pagerank {scores.features['pagerank'][i]:.2e}, "
+              f"supervision p{scores.percentiles['supervision'][i] * 100:.0f}")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Local graph store over both databases
+One compressed adjacency (CSR) holding DB1 (Person-AUTHORED-Publication,
+Person-WORKED_AT-Organization) and DB2 (Person-<role>-Thesis, all relationship
+types), with people present in both databases joined into one node through
+name_index.cross_database_identities. Connection questions ("how are A and B
+linked?") run as bidirectional BFS here instead of shortestPath on two remote
+databases that cannot see each other.
+
+    python graph_store.py                            # (re)build the store
+    python graph_store.py --path "Anna Svensson" "Erik Lindqvist"
+"""
+
+import os
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from artifacts import ArtifactReader
+from name_index import cross_database_identities
+
+STORE_VERSION = 2  # 2: DB2 aliases of joined persons
+DEFAULT_PATH = os.path.join(config.ARTIFACT_DIR, "graph_store.npz")
+
+KINDS = ["person", "publication", "organization", "thesis"]
+PERSON, PUBLICATION, ORGANIZATION, THESIS = range(len(KINDS))
+
+# Per-query work limit for path search, and the longest path considered (in edges)
+DEFAULT_VISIT_CAP = 200_000
+MAX_PATH_LENGTH = 8
+
+DB1_PERSONS_QUERY = "MATCH (p:Person) RETURN elementId(p) as person_id, p.name as name"
+DB2_PERSONS_QUERY = DB1_PERSONS_QUERY
+
+DB1_EDGES_QUERIES = {
+    "AUTHORED": (PUBLICATION, """
+        MATCH (p:Person)-[:AUTHORED]->(x:Publication)
+        RETURN elementId(p) as person_id, elementId(x) as item_id, x.title as item_name
+        """),
+    "WORKED_AT": (ORGANIZATION, """
+        MATCH (p:Person)-[:WORKED_AT]->(x:Organization)
+        RETURN DISTINCT elementId(p) as person_id, elementId(x) as item_id, x.name as item_name
+        """),
+}
+
+DB2_EDGES_QUERY = """
+MATCH (p:Person)-[r]->(x:Thesis)
+RETURN elementId(p) as person_id, elementId(x) as item_id, x.title as item_name, type(r) as rel_type
+"""
+
+
+class GraphStore:
+    """
+    Undirected CSR: neighbours of node u are indices[indptr[u]:indptr[u+1]]
+    (sorted), with the relationship type of each entry in edge_types. Every edge
+    joins a person to an item, so paths alternate person - item - person.
+    """
+
+    def __init__(self, kinds: np.ndarray, keys: List[str], names: List[str], indptr: np.ndarray,
+                 indices: np.ndarray, edge_types: np.ndarray, type_names: List[str],
+                 aliases: Optional[Dict[str, str]] = None, built_at: float = 0.0):
+        self.kinds = kinds
+        self.keys = keys
+        self.names = names
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_types = edge_types
+        self.type_names = type_names
+        self.aliases = aliases or {}
+        self.built_at = built_at
+        self.key_index = {key: i for i, key in enumerate(keys)}
+        # DB2 keys of persons joined into a DB1 node resolve to that node
+        for alias, key in self.aliases.items():
+            self.key_index[alias] = self.key_index[key]
+        self.joined = set(self.aliases.values())
+
+    @classmethod
+    def build(cls, nodes: Dict[str, Tuple[int, str]], edges: Iterable[Tuple[str, str, str]],
+              aliases: Optional[Dict[str, str]] = None) -> "GraphStore":
+        """nodes: key -> (kind, name); edges: (person key, item key, relationship type); aliases: key -> node key"""
+        keys = list(nodes)
+        index = {key: i for i, key in enumerate(keys)}
+        type_ids: Dict[str, int] = {}
+        sources, targets, types = [], [], []
+        for person, item, rel_type in edges:
+            type_id = type_ids.setdefault(rel_type, len(type_ids))
+            a, b = index[person], index[item]
+            sources += [a, b]
+            targets += [b, a]
+            types += [type_id, type_id]
+
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int32)
+        types = np.array(types, dtype=np.int16)
+        order = np.lexsort((targets, sources))
+        indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.add.at(indptr, sources + 1, 1)
+        return cls(np.array([nodes[key][0] for key in keys], dtype=np.int8), keys,
+                   [nodes[key][1] or "" for key in keys], np.cumsum(indptr),
+                   targets[order], types[order], list(type_ids), aliases, time.time())
+
+    # -- storage -------------------------------------------------------------
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path, version=np.array(STORE_VERSION), kinds=self.kinds, keys=np.array(self.keys),
+            names=np.array(self.names), indptr=self.indptr, indices=self.indices,
+            edge_types=self.edge_types, type_names=np.array(self.type_names),
+            alias_keys=np.array(list(self.aliases), dtype=str),
+            alias_targets=np.array(list(self.aliases.values()), dtype=str), built_at=np.array(self.built_at))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional["GraphStore"]:
+        """The stored graph, or None if missing or built by an incompatible version"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data["version"]) != STORE_VERSION:
+                return None
+            return cls(data["kinds"], [str(k) for k in data["keys"]], [str(n) for n in data["names"]],
+                       data["indptr"], data["indices"], data["edge_types"],
+                       [str(t) for t in data["type_names"]],
+                       dict(zip((str(k) for k in data["alias_keys"]), (str(k) for k in data["alias_targets"]))),
+                       float(data["built_at"]))
+
+    # -- traversal -----------------------------------------------------------
+
+    def neighbours(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self, node: int) -> int:
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def edge_type(self, a: int, b: int) -> str:
+        start, end = self.indptr[a], self.indptr[a + 1]
+        pos = start + np.searchsorted(self.indices[start:end], b)
+        return self.type_names[self.edge_types[pos]]
+
+    def shortest_paths(self, source: int, target: int, k: int = 3, visit_cap: int = DEFAULT_VISIT_CAP,
+                       max_length: int = MAX_PATH_LENGTH) -> Dict:
+        """
+        Up to k shortest paths by bidirectional BFS, always expanding the smaller
+        frontier. Parents at shortest distance are kept, so every shortest path is
+        recoverable. Stops early once visit_cap nodes have been seen. The paths
+        returned all have the minimum length and are sorted by node index.
+        """
+        if source == target:
+            return {"paths": [[source]], "visited": 1, "capped": False}
+        parents = ({source: []}, {target: []})
+        frontiers = ([source], [target])
+        depth = [0, 0]
+        visited, meeting = 2, []
+
+        while frontiers[0] and frontiers[1] and depth[0] + depth[1] < max_length:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other = parents[side], parents[1 - side]
+            next_frontier, next_frontier_set = [], set()
+            for node in frontiers[side]:
+                for neighbour in self.neighbours(node).tolist():
+                    if neighbour in mine:
+                        # Another shortest route to a node found on this level
+                        if neighbour in next_frontier_set and node not in mine[neighbour]:
+                            mine[neighbour].append(node)
+                        continue
+                    mine[neighbour] = [node]
+                    next_frontier.append(neighbour)
+                    next_frontier_set.add(neighbour)
+                    visited += 1
+                    if neighbour in other:
+                        meeting.append(neighbour)
+                if visited > visit_cap:
+                    break
+            depth[side] += 1
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+            if meeting or visited > visit_cap:
+                break
+        capped = visited > visit_cap and not meeting
+
+        # The search stops on the first level that meets the other side, so every
+        # meeting node lies on a shortest connection; filtering on the length keeps
+        # that guarantee explicit for callers
+        paths = []
+        for node in sorted(set(meeting)):
+            for left in self._walk(parents[0], node, k):
+                for right in self._walk(parents[1], node, k):
+                    paths.append(left[::-1] + right[1:])
+            if len(paths) >= k:
+                break
+        shortest = min(map(len, paths), default=0)
+        paths = sorted(path for path in paths if len(path) == shortest)[:k]
+        return {"paths": paths, "visited": visited, "capped": capped}
+
+    def _walk(self, parents: Dict[int, List[int]], node: int, limit: int) -> List[List[int]]:
+        """Up to limit paths from node back to its BFS root (node first)"""
+        if not parents[node]:
+            return [[node]]
+        paths = []
+        for parent in parents[node]:
+            for rest in self._walk(parents, parent, limit - len(paths)):
+                paths.append([node] + rest)
+                if len(paths) >= limit:
+                    return paths
+        return paths
+
+    def explain(self, path: List[int]) -> Dict:
+        """A path as nodes plus one readable step per edge"""
+        nodes = [{"key": self.keys[i], "name": self.names[i], "kind": KINDS[self.kinds[i]]} for i in path]
+        steps = []
+        for a, b in zip(path, path[1:]):
+            rel_type = self.edge_type(a, b)
+            person, item = (a, b) if self.kinds[a] == PERSON else (b, a)
+            steps.append(f"{self.names[person]} —{rel_type}→ {KINDS[self.kinds[item]]} "
+                         f"\"{self.names[item][:80]}\"")
+        return {"length": len(path) - 1, "nodes": nodes, "steps": steps}
+
+
+def build_graph_store(rb, path: str = DEFAULT_PATH, fetch_size: int = 5000) -> Dict[str, int]:
+    """Stream both databases into a fresh GraphStore and save it"""
+    db1_persons = list(rb._stream_query("db1", "graph_store_persons", DB1_PERSONS_QUERY, fetch_size=fetch_size))
+    db2_persons = list(rb._stream_query("db2", "graph_store_persons", DB2_PERSONS_QUERY, fetch_size=fetch_size))
+    identities = cross_database_identities(db1_persons, db2_persons)
+
+    nodes: Dict[str, Tuple[int, str]] = {}
+    for record in db1_persons:
+        nodes[f"db1:{record['person_id']}"] = (PERSON, record["name"])
+    person_key = {record["person_id"]: f"db1:{identities[record['person_id']]}"
+                  if record["person_id"] in identities else f"db2:{record['person_id']}"
+                  for record in db2_persons}
+    for record in db2_persons:
+        nodes.setdefault(person_key[record["person_id"]], (PERSON, record["name"]))
+
+    edges = []
+    counts = defaultdict(int)
+    for rel_type, (kind, query) in DB1_EDGES_QUERIES.items():
+        for record in rb._stream_query("db1", f"graph_store_{rel_type.lower()}", query, fetch_size=fetch_size):
+            item = f"db1:{record['item_id']}"
+            nodes.setdefault(item, (kind, record["item_name"]))
+            edges.append((f"db1:{record['person_id']}", item, rel_type))
+            counts[rel_type] += 1
+    for record in rb._stream_query("db2", "graph_store_theses", DB2_EDGES_QUERY, fetch_size=fetch_size):
+        item = f"db2:{record['item_id']}"
+        nodes.setdefault(item, (THESIS, record["item_name"]))
+        edges.append((person_key[record["person_id"]], item, record["rel_type"]))
+        counts["thesis"] += 1
+
+    aliases = {f"db2:{db2_id}": f"db1:{db1_id}" for db2_id, db1_id in identities.items()}
+    store = GraphStore.build(nodes, edges, aliases)
+    store.save(path)
+    return {"nodes": len(nodes), "edges": len(edges), "joined_persons": len(identities), **counts}
+
+
+class GraphStoreReader(ArtifactReader):
+    def __init__(self, path: str = DEFAULT_PATH):
+        super().__init__(path, GraphStore.load)
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook_final import ResearchBookFinal
+
+    parser = argparse.ArgumentParser(description="Build the local graph store or find paths in it")
+    parser.add_argument("--path", nargs=2, metavar=("FROM", "TO"), help="show how two researchers connect")
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    rb = ResearchBookFinal()
+    try:
+        if args.path:
+            result = rb.connection_paths(*args.path, k=args.k)
+            if "error" in result:
+                print(f"❌ {result['error']}")
+            for path in result.get("paths", []):
+                print(f"\n🔗 {path['length']} steps")
+                for step in path["steps"]:
+                    print(f"   {step}")
+        else:
+            print("🕸️ Building local graph store from DB1 + DB2...")
+            start = time.perf_counter()
+            stats = build_graph_store(rb)
+            print(f"🎉 {stats['nodes']:,} nodes, {stats['edges']:,} edges, {stats['joined_persons']:,} persons "
+                  f"joined across databases ({time.perf_counter() - start:.1f}s) → {DEFAULT_PATH}")
+    finally:
+        rb.close_connections()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Normalized keyword vocabulary for DB2
+Folds thesis keywords to a canonical form (case, punctuation and hyphens,
+Swedish/English variants, light plural stemming) and materializes it as
+(:Thesis)-[:HAS_KEYWORD]->(:Keyword {canonical}) with a uniqueness constraint,
+so field and matching queries do exact indexed lookups instead of lowercasing
+every keyword of every thesis.
+
+    python keywords.py            # index theses that are new, changed or outdated
+    python keywords.py --full     # re-index every thesis
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List
+
+VOCABULARY_VERSION = 1
+
+_SEPARATORS = re.compile(r"[\-_/‐‑–—]+")
+_PUNCTUATION = re.compile(r"[^\w\s&+#]")
+_SPACES = re.compile(r"\s+")
+
+# Swedish keywords (and a few English synonyms) folded to one English canonical phrase
+PHRASE_VARIANTS: Dict[str, str] = {
+    "maskininlärning": "machine learning",
+    "djupinlärning": "deep learning",
+    "artificiell intelligens": "artificial intelligence",
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "datorseende": "computer vision",
+    "robotik": "robotics",
+    "hållbarhet": "sustainability",
+    "hållbar utveckling": "sustainable development",
+    "förnybar energi": "renewable energy",
+    "energisystem": "energy system",
+    "klimatförändringar": "climate change",
+    "elektrifiering": "electrification",
+    "livscykelanalys": "life cycle assessment",
+    "lca": "life cycle assessment",
+    "simulering": "simulation",
+    "optimering": "optimization",
+    "logistik": "logistics",
+    "arkitektur": "architecture",
+    "stadsplanering": "urban planning",
+    "signalbehandling": "signal processing",
+    "materialteknik": "materials engineering",
+    "bioteknik": "biotechnology",
+    "produktutveckling": "product development",
+    "digitalisering": "digitalization",
+    "digitalisation": "digitalization",
+    "maskinteknik": "mechanical engineering",
+    "byggteknik": "civil engineering",
+}
+
+# British -> American spellings, applied per word
+WORD_VARIANTS: Dict[str, str] = {
+    "optimisation": "optimization",
+    "optimise": "optimize",
+    "modelling": "modeling",
+    "behaviour": "behavior",
+    "behavioural": "behavioral",
+    "colour": "color",
+    "centre": "center",
+    "utilisation": "utilization",
+    "characterisation": "characterization",
+    "visualisation": "visualization",
+    "organisation": "organization",
+    "organisational": "organizational",
+    "analyse": "analyze",
+    "catalyse": "catalyze",
+    "labour": "labor",
+    "fibre": "fiber",
+    "aluminium": "aluminum",
+    "sulphur": "sulfur",
+}
+
+# Endings that look plural but are not (analysis, bus, glass, robotics)
+_NOT_PLURAL = ("ss", "us", "is", "ics")
+_INVARIANT = {"series", "species", "news", "means", "data"}
+
+
+def _stem(word: str) -> str:
+    """Light English plural stemming; short words and acronyms stay as they are"""
+    if len(word) <= 3 or not word.isalpha() or word in _INVARIANT:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(_NOT_PLURAL):
+        return word[:-1]
+    return word
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Canonical form of a keyword ('' for keywords that are only punctuation)"""
+    text = unicodedata.normalize("NFKC", str(keyword)).casefold()
+    text = _SEPARATORS.sub(" ", text)
+    text = _SPACES.sub(" ", _PUNCTUATION.sub(" ", text)).strip()
+    text = PHRASE_VARIANTS.get(text, text)
+    words = [WORD_VARIANTS.get(word, word) for word in text.split(" ") if word]
+    return " ".join(_stem(word) for word in words)
+
+
+def canonical_keywords(keywords: Iterable) -> List[str]:
+    """Distinct canonical forms of a thesis's keywords, in first-seen order"""
+    seen = {}
+    for keyword in keywords or []:
+        canonical = normalize_keyword(keyword) if keyword else ""
+        if canonical:
+            seen.setdefault(canonical, None)
+    return list(seen)
+
+
+CONSTRAINT_QUERY = """
+CREATE CONSTRAINT keyword_canonical IF NOT EXISTS
+FOR (k:Keyword) REQUIRE k.canonical IS UNIQUE
+"""
+
+MARK_ALL_STALE_QUERY = """
+MATCH (t:Thesis) WHERE t.keyword_version IS NOT NULL
+CALL { WITH t REMOVE t.keyword_version } IN TRANSACTIONS OF 10000 ROWS
+RETURN count(t) as marked
+"""
+
+# New, re-tagged (keywords differ from what was indexed) or indexed by an older normalizer
+STALE_BATCH_QUERY = """
+MATCH (t:Thesis)
+WHERE t.keywords IS NOT NULL
+  AND (t.keyword_version IS NULL OR t.keyword_version < $version OR
+       t.keywords_indexed <> t.keywords)
+RETURN elementId(t) as id, t.keywords as keywords
+LIMIT $batch_size
+"""
+
+WRITE_BATCH_QUERY = """
+UNWIND $rows as row
+MATCH (t:Thesis) WHERE elementId(t) = row.id
+OPTIONAL MATCH (t)-[old:HAS_KEYWORD]->(:Keyword)
+DELETE old
+WITH DISTINCT t, row
+SET t.keywords_indexed = t.keywords,
+    t.keywords_canonical = row.canonical,
+    t.keyword_version = $version
+WITH t, row
+UNWIND row.canonical as canonical
+MERGE (k:Keyword {canonical: canonical})
+MERGE (t)-[:HAS_KEYWORD]->(k)
+"""
+
+# Marker read by ResearchBook.keyword_vocabulary_ready() before using the indexed queries
+MARK_READY_QUERY = """
+MERGE (v:KeywordVocabulary {name: 'default'})
+SET v.version = $version, v.updated_at = datetime()
+"""
+
+READY_QUERY = """
+MATCH (v:KeywordVocabulary {name: 'default'})
+RETURN v.version as version
+"""
+
+
+def refresh_keyword_vocabulary(driver, batch_size: int = 1000, full: bool = False) -> Dict[str, int]:
+    """Canonicalize keywords of theses that are new, changed or outdated and link them to Keyword nodes"""
+    stats = {"marked": 0, "updated": 0, "batches": 0}
+    with driver.session(database="neo4j") as session:
+        session.run(CONSTRAINT_QUERY).consume()
+        if full:
+            stats["marked"] = session.run(MARK_ALL_STALE_QUERY).single()["marked"]
+
+        while True:
+            records = list(session.run(STALE_BATCH_QUERY, version=VOCABULARY_VERSION,
+                                       batch_size=batch_size))
+            if not records:
+                break
+            rows = [{"id": record["id"], "canonical": canonical_keywords(record["keywords"])}
+                    for record in records]
+            session.run(WRITE_BATCH_QUERY, rows=rows, version=VOCABULARY_VERSION).consume()
+            stats["updated"] += len(rows)
+            stats["batches"] += 1
+            print(f"   ✅ Batch {stats['batches']}: {stats['updated']:,} theses indexed")
+
+        session.run(MARK_READY_QUERY, version=VOCABULARY_VERSION).consume()
+
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook import ResearchBook
+
+    parser = argparse.ArgumentParser(description="Build the normalized keyword vocabulary in DB2")
+    parser.add_argument("--full", action="store_true", help="re-index every thesis")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rb = ResearchBook()
+    try:
+        print("🔤 Refreshing keyword vocabulary in DB2...")
+        result = refresh_keyword_vocabulary(rb.db2_driver, batch_size=args.batch_size, full=args.full)
+        print(f"🎉 Done: {result['updated']:,} theses indexed in {result['batches']} batches")
+    finally:
+        rb.close_connections()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Multi-item LLM batching
+Packs several items into one prompt with a shared instruction block and asks
+for one JSON entry per item, so bulk jobs send a fraction of the requests and
+instruction tokens. Items whose entry is missing or malformed are split off
+and retried on their own; the rest of the batch is kept.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+from metrics import REGISTRY
+
+BATCH_ITEMS = REGISTRY.counter(
+    "researchbook_llm_batch_items_total", "Items answered through batched LLM prompts", ["feature", "outcome"])
+
+BATCH_FORMAT = """
+Answer each ITEM below independently, following the instructions above.
+Respond with ONLY a JSON object, no text before or after it:
+{"results": [{"id": "<item id>", "output": "<your answer for that item>"}]}
+Include exactly one entry per item id. "output" must be a string (markdown allowed).
+"""
+
+RETRY_NOTE = "\nA previous answer for these items was not valid JSON. Follow the format exactly.\n"
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def build_batch_prompt(instructions: str, items: Dict[str, str], retry: bool = False) -> str:
+    """One prompt: shared instructions, the output format, then each item under its id"""
+    parts = [instructions.strip(), BATCH_FORMAT]
+    if retry:
+        parts.append(RETRY_NOTE)
+    for item_id, content in items.items():
+        parts.append(f"### ITEM id={json.dumps(item_id)}\n{content.strip()}\n")
+    return "\n".join(parts)
+
+
+def extract_json(text: str) -> Any:
+    """Parse the JSON object in a response, tolerating code fences and stray prose around it"""
+    text = _FENCE.sub("", text.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("no JSON object in response")
+    return json.loads(text[start:end + 1])
+
+
+def parse_batch_response(text: str, expected_ids: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Validate a batched answer. Returns (outputs by id, ids that must be retried).
+    An id fails if it is missing, duplicated or has an empty/non-string output.
+    """
+    expected = list(expected_ids)
+    try:
+        entries = extract_json(text).get("results")
+    except (ValueError, AttributeError):
+        return {}, expected
+    if not isinstance(entries, list):
+        return {}, expected
+
+    outputs: Dict[str, str] = {}
+    duplicated = set()
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        item_id, output = str(entry.get("id")), entry.get("output")
+        if item_id not in expected or not isinstance(output, str) or not output.strip():
+            continue
+        if item_id in outputs:
+            duplicated.add(item_id)
+        outputs[item_id] = output.strip()
+
+    for item_id in duplicated:
+        del outputs[item_id]
+    return outputs, [item_id for item_id in expected if item_id not in outputs]
+
+
+def chunk_ids(ids: List[str], size: int) -> List[List[str]]:
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
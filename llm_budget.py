@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - LLM Token & Latency Budget Controller
+Adaptive max_tokens per feature, per-window spend ceilings and graceful degradation
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+from metrics import CACHE_EVENTS, REGISTRY, percentile
+
+WINDOW_TOKENS = REGISTRY.gauge(
+    "researchbook_llm_window_tokens", "LLM tokens spent in the current budget window", ["feature"])
+BUDGET_DECISIONS = REGISTRY.counter(
+    "researchbook_llm_budget_decisions_total", "Budget controller decisions by feature and mode", ["feature", "mode"])
+
+
+@dataclass
+class BudgetDecision:
+    """What the controller allows for one LLM call"""
+    feature: str
+    mode: str                       # "normal", "short", "cached" or "exhausted"
+    max_tokens: int
+    cached_response: Optional[str] = None
+
+    @property
+    def degraded(self) -> bool:
+        return self.mode != "normal"
+
+
+class LLMBudget:
+    """
+    Tracks token spend and latency per feature over a sliding time window.
+
+    - max_tokens is derived from the observed completion lengths of each feature
+      (percentile × headroom, clamped to [min_tokens, requested]); lengths are
+      kept per item, so batched calls of any size are sized by items × per-item length
+    - above soft_fraction of a ceiling, calls are shortened to min_tokens
+    - at the ceiling, the last good response for the same prompt is returned,
+      or the call is refused if nothing is cached
+    """
+
+    def __init__(self, window_seconds: int = 3600,
+                 feature_ceilings: Optional[Dict[str, int]] = None,
+                 default_ceiling: Optional[int] = None,
+                 global_ceiling: Optional[int] = None,
+                 min_tokens: int = 200, headroom: float = 1.25,
+                 length_percentile: float = 95, min_samples: int = 5,
+                 soft_fraction: float = 0.8, cache_size: int = 256):
+        self.window_seconds = window_seconds
+        self.feature_ceilings = dict(feature_ceilings or {})
+        self.default_ceiling = default_ceiling
+        self.global_ceiling = global_ceiling
+        self.min_tokens = min_tokens
+        self.headroom = headroom
+        self.length_percentile = length_percentile
+        self.min_samples = min_samples
+        self.soft_fraction = soft_fraction
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        # feature -> deque of (timestamp, prompt_tokens, completion_tokens, latency_seconds)
+        self._events: Dict[str, Deque[Tuple[float, int, int, float]]] = {}
+        # feature -> recent completion lengths (kept beyond the window for max_tokens sizing)
+        self._lengths: Dict[str, Deque[int]] = {}
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "LLMBudget":
+        """Build a controller from RESEARCHBOOK_LLM_* environment variables"""
+        def _int(name: str) -> Optional[int]:
+            value = os.environ.get(name)
+            return int(value) if value else None
+
+        return cls(
+            window_seconds=_int("RESEARCHBOOK_LLM_WINDOW_SECONDS") or 3600,
+            default_ceiling=_int("RESEARCHBOOK_LLM_FEATURE_TOKEN_CEILING"),
+            global_ceiling=_int("RESEARCHBOOK_LLM_TOKEN_CEILING")
+        )
+
+    @staticmethod
+    def _prompt_key(feature: str, prompt: str) -> str:
+        return hashlib.sha256(f"{feature}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        for events in self._events.values():
+            while events and events[0][0] < cutoff:
+                events.popleft()
+
+    def _spent(self, feature: Optional[str] = None) -> int:
+        if feature is not None:
+            return sum(p + c for _, p, c, _ in self._events.get(feature, ()))
+        return sum(p + c for events in self._events.values() for _, p, c, _ in events)
+
+    def _adaptive_max_tokens(self, feature: str, requested: int, items: int = 1) -> int:
+        lengths = self._lengths.get(feature)
+        if not lengths or len(lengths) < self.min_samples:
+            return requested
+        observed = percentile(list(lengths), self.length_percentile)
+        return max(self.min_tokens, min(requested, int(observed * self.headroom * items)))
+
+    def _cached(self, feature: str, prompt: str) -> Optional[str]:
+        key = self._prompt_key(feature, prompt)
+        response = self._cache.get(key)
+        if response is not None:
+            self._cache.move_to_end(key)
+        CACHE_EVENTS.inc(cache="llm_budget", result="hit" if response is not None else "miss")
+        return response
+
+    def plan(self, feature: str, prompt: str, requested_max_tokens: int, items: int = 1) -> BudgetDecision:
+        """Decide max_tokens (or a cached/refused answer) for the next call of a feature answering `items` items"""
+        with self._lock:
+            self._prune(time.time())
+            feature_spent = self._spent(feature)
+            global_spent = self._spent()
+
+            # Fraction of the tightest applicable ceiling already used
+            usage = 0.0
+            ceiling = self.feature_ceilings.get(feature, self.default_ceiling)
+            if ceiling:
+                usage = max(usage, feature_spent / ceiling)
+            if self.global_ceiling:
+                usage = max(usage, global_spent / self.global_ceiling)
+
+            if usage >= 1.0:
+                cached = self._cached(feature, prompt)
+                mode = "cached" if cached is not None else "exhausted"
+                decision = BudgetDecision(feature, mode, 0, cached)
+            elif usage >= self.soft_fraction:
+                cached = self._cached(feature, prompt)
+                if cached is not None:
+                    decision = BudgetDecision(feature, "cached", 0, cached)
+                else:
+                    decision = BudgetDecision(feature, "short", min(self.min_tokens, requested_max_tokens))
+            else:
+                decision = BudgetDecision(feature, "normal",
+                                          self._adaptive_max_tokens(feature, requested_max_tokens, items))
+
+        BUDGET_DECISIONS.inc(feature=feature, mode=decision.mode)
+        return decision
+
+    def record(self, feature: str, prompt: str, usage: Optional[Dict], latency: float,
+               response: Optional[str] = None, length_sample: bool = True, items: int = 1):
+        """
+        Record a completed call; usage is the OpenAI-style usage block.
+        length_sample=False keeps the completion length out of max_tokens sizing:
+        shortened or truncated answers say nothing about the natural length and
+        would ratchet the percentile down. A call answering `items` items records
+        its length per item.
+        """
+        usage = usage or {}
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        now = time.time()
+
+        with self._lock:
+            self._events.setdefault(feature, deque()).append(
+                (now, prompt_tokens, completion_tokens, latency))
+            if completion_tokens and length_sample:
+                per_item = -(-completion_tokens // max(1, items))
+                self._lengths.setdefault(feature, deque(maxlen=200)).append(per_item)
+            if response is not None:
+                self._cache[self._prompt_key(feature, prompt)] = response
+                self._cache.move_to_end(self._prompt_key(feature, prompt))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            self._prune(now)
+            spent = self._spent(feature)
+
+        WINDOW_TOKENS.set(spent, feature=feature)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-feature spend and latency in the current window"""
+        with self._lock:
+            self._prune(time.time())
+            result = {}
+            for feature, events in self._events.items():
+                latencies = [latency for _, _, _, latency in events]
+                ceiling = self.feature_ceilings.get(feature, self.default_ceiling)
+                result[feature] = {
+                    "calls": len(events),
+                    "prompt_tokens": sum(p for _, p, _, _ in events),
+                    "completion_tokens": sum(c for _, _, c, _ in events),
+                    "ceiling": ceiling,
+                    "p50_latency": percentile(latencies, 50),
+                    "p95_latency": percentile(latencies, 95),
+                    "suggested_max_tokens": self._adaptive_max_tokens(feature, 1500)
+                }
+            return result
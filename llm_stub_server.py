@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Local LLM stand-in
+OpenAI-compatible server (/v1/chat/completions, streaming and not, /v1/models)
+with configurable time-to-first-token, per-token latency, error rates and
+deterministic canned outputs, for offline load tests and benchmarks.
+
+    python llm_stub_server.py --profile realistic --error-rate 0.02
+    RESEARCHBOOK_LLM_BASE_URL=http://127.0.0.1:8400/v1 python researchbook_final.py
+
+Outputs are a pure function of (model, prompt): canned responses (--canned
+file of {"match": regex, "response": text}) win, batched prompts from
+llm_batching.py get valid per-item JSON, anything else gets seeded filler text.
+"""
+
+import contextlib
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# name -> (time to first token s, seconds per output token, jitter fraction)
+LATENCY_PROFILES = {
+    "instant": (0.0, 0.0, 0.0),
+    "fast": (0.15, 0.004, 0.1),
+    "realistic": (0.8, 0.02, 0.25),     # ~50 tokens/s after a sub-second first token
+    "slow": (3.0, 0.05, 0.5),
+}
+
+MODELS = ["claude-sonnet-4", "gpt-4", "gpt-3.5-turbo", "stub-echo"]
+
+_FILLER = ("research", "thesis", "supervision", "collaboration", "publications", "expertise",
+           "network", "analysis", "methods", "field", "impact", "projects", "students",
+           "industry", "results", "approach", "data", "models", "systems", "evaluation")
+_BATCH_ITEM = re.compile(r'^### ITEM id=("[^"\n]*")', re.MULTILINE)
+_TOKEN = re.compile(r"\S+\s*")
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for usage accounting"""
+    return max(1, len(text) // 4)
+
+
+class StubBehaviour:
+    """Latency, failure and output configuration shared by all request handlers"""
+
+    def __init__(self, profile: str = "fast", ttft: Optional[float] = None,
+                 per_token: Optional[float] = None, jitter: Optional[float] = None,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, error_status: int = 503,
+                 response_tokens: int = 120, canned: Optional[List[Dict]] = None,
+                 api_key: Optional[str] = None, seed: int = 0, capacity: Optional[int] = None):
+        base_ttft, base_per_token, base_jitter = LATENCY_PROFILES[profile]
+        self.ttft = base_ttft if ttft is None else ttft
+        self.per_token = base_per_token if per_token is None else per_token
+        self.jitter = base_jitter if jitter is None else jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.error_status = error_status
+        self.response_tokens = response_tokens
+        self.canned = [(re.compile(c["match"], re.IGNORECASE | re.DOTALL), c["response"]) for c in canned or []]
+        self.api_key = api_key
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        # Concurrent generations the "GPU" can run; further requests queue
+        self.slots = threading.BoundedSemaphore(capacity) if capacity else contextlib.nullcontext()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def delay(self, seconds: float) -> float:
+        """seconds +- jitter, never negative"""
+        if not seconds:
+            return 0.0
+        return max(0.0, seconds * (1 + self.jitter * (2 * self._random() - 1)))
+
+    def injected_error(self) -> Optional[int]:
+        """HTTP status to fail this request with, if any"""
+        with self._lock:
+            self.requests += 1
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return self.error_status
+        return None
+
+    def respond(self, model: str, prompt: str) -> str:
+        """Deterministic completion text for a prompt"""
+        for pattern, response in self.canned:
+            if pattern.search(prompt):
+                return response
+
+        digest = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+        rng = random.Random(digest)
+        item_ids = [json.loads(raw) for raw in _BATCH_ITEM.findall(prompt)]
+        if item_ids:
+            per_item = max(5, self.response_tokens // len(item_ids))
+            results = [{"id": item_id, "output": self._filler(rng, per_item)} for item_id in item_ids]
+            return json.dumps({"results": results})
+        return f"[stub {digest[:8]}] " + self._filler(rng, self.response_tokens)
+
+    @staticmethod
+    def _filler(rng: random.Random, words: int) -> str:
+        text = " ".join(rng.choice(_FILLER) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    behaviour: StubBehaviour = StubBehaviour()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: Dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json(status, {"error": {"message": message, "type": "stub_error", "code": status}})
+
+    def _authorized(self) -> bool:
+        key = self.behaviour.api_key
+        if key and self.headers.get("Authorization") != f"Bearer {key}":
+            self._send_error(401, "Invalid API key")
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path.rstrip("/") != "/v1/models":
+            return self._send_error(404, f"No route for GET {self.path}")
+        self._send_json(200, {"object": "list", "data": [
+            {"id": model, "object": "model", "owned_by": "researchbook-stub"} for model in MODELS]})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            return self._send_error(404, f"No route for POST {self.path}")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            messages = request["messages"]
+        except (ValueError, KeyError) as e:
+            return self._send_error(400, f"Invalid request: {e}")
+
+        behaviour = self.behaviour
+        status = behaviour.injected_error()
+        if status:
+            time.sleep(behaviour.delay(behaviour.ttft))
+            return self._send_error(status, "Injected failure" if status != 429 else "Rate limit exceeded")
+
+        model = request.get("model", MODELS[0])
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        tokens = _TOKEN.findall(behaviour.respond(model, prompt))
+        max_tokens = request.get("max_tokens")
+        finish_reason = "stop"
+        if max_tokens and len(tokens) > max_tokens:
+            tokens, finish_reason = tokens[:max_tokens], "length"
+        usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": len(tokens),
+                 "total_tokens": count_tokens(prompt) + len(tokens)}
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+        if request.get("stream"):
+            with behaviour.slots:
+                self._stream(completion_id, model, tokens, finish_reason, usage)
+            return
+
+        with behaviour.slots:
+            time.sleep(behaviour.delay(behaviour.ttft) + behaviour.delay(behaviour.per_token * len(tokens)))
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                         "finish_reason": finish_reason}],
+            "usage": usage
+        })
+
+    def _stream(self, completion_id: str, model: str, tokens: List[str], finish_reason: str, usage: Dict):
+        """Server-sent events, one chunk per token, OpenAI chunk format"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(delta: Dict, reason: Optional[str] = None, **extra):
+            body = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": reason}]}
+            body.update(extra)
+            self.wfile.write(f"data: {json.dumps(body)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        behaviour = self.behaviour
+        time.sleep(behaviour.delay(behaviour.ttft))
+        chunk({"role": "assistant", "content": ""})
+        for token in tokens:
+            chunk({"content": token})
+            time.sleep(behaviour.delay(behaviour.per_token))
+        chunk({}, finish_reason, usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Load-test clients drop connections mid-stream all the time; not worth a traceback
+        pass
+
+
+def make_stub_server(behaviour: StubBehaviour, port: int = 8400, host: str = "127.0.0.1") -> StubServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"behaviour": behaviour})
+    return StubServer((host, port), handler)
+
+
+def start_stub_server(behaviour: StubBehaviour, port: int = 8400, host: str = "127.0.0.1") -> StubServer:
+    """Serve on a daemon thread (port=0 picks a free port; see server.server_address)"""
+    server = make_stub_server(behaviour, port, host)
+    threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8400)
+    parser.add_argument("--profile", choices=sorted(LATENCY_PROFILES), default="fast")
+    parser.add_argument("--ttft", type=float, help="seconds to first token (overrides profile)")
+    parser.add_argument("--per-token", type=float, help="seconds per output token (overrides profile)")
+    parser.add_argument("--jitter", type=float, help="+- fraction applied to every delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--response-tokens", type=int, default=120, help="length of generated filler answers")
+    parser.add_argument("--canned", help='JSON file: [{"match": "<regex>", "response": "<text>"}, ...]')
+    parser.add_argument("--api-key", help="require this bearer token (default: accept any)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for injected errors and jitter")
+    parser.add_argument("--capacity", type=int, help="max concurrent generations (default: unlimited)")
+    args = parser.parse_args()
+
+    canned = None
+    if args.canned:
+        with open(args.canned, encoding="utf-8") as f:
+            canned = json.load(f)
+
+    behaviour = StubBehaviour(args.profile, args.ttft, args.per_token, args.jitter, args.error_rate,
+                              args.rate_limit_rate, args.error_status, args.response_tokens, canned,
+                              args.api_key, args.seed, args.capacity)
+    server = make_stub_server(behaviour, args.port, args.host)
+    print(f"🤖 LLM stand-in on http://{args.host}:{args.port}/v1 ({args.profile}: "
+          f"ttft={behaviour.ttft}s, {behaviour.per_token}s/token, errors={args.error_rate}, "
+          f"429s={args.rate_limit_rate})")
+    print(f"   RESEARCHBOOK_LLM_BASE_URL=http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
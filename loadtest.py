@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Load Test Harness
+Replays a weighted mix of the four features at target request rates (open loop,
+so a slow service builds a queue instead of slowing the generator down) and
+reports throughput, latency percentiles, error rates and per-backend
+saturation for each stage.
+
+    # in-process, against local stand-ins for Neo4j and the LLM
+    python loadtest.py --stub-neo4j --stub-llm --rates 5,10,20,40 --duration 30
+
+    # against the HTTP surface (python api_server.py --stub-neo4j --stub-llm)
+    python loadtest.py --url http://127.0.0.1:8500 --workload workload.json
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+import requests
+
+from metrics import percentile
+
+FEATURES = ("lookup", "expert", "field_brief", "match")
+
+# Used when no --workload file is given
+DEFAULT_WORKLOAD = {
+    "mix": {"lookup": 0.4, "expert": 0.3, "field_brief": 0.15, "match": 0.15},
+    "inputs": {
+        "lookup": ["Anders", "Maria", "Erik", "Karin", "Johan", "Eva", "Lars", "Anna"],
+        "expert": ["machine learning", "sustainability", "robotics", "energy systems",
+                   "biotechnology", "signal processing", "materials science", "logistics"],
+        "field_brief": ["artificial intelligence", "sustainability", "biotechnology",
+                        "architecture", "automotive engineering"],
+        "match": ["Anders", "Maria", "Erik", "Karin"]
+    },
+    # Popular inputs repeat: input i is picked with weight 1 / (i + 1) ** skew
+    "skew": 1.0
+}
+
+
+class BackendProbe:
+    """Times every single-attempt backend call (db1, db2, llm) of a ResearchBook instance"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            self.latencies: Dict[str, List[float]] = defaultdict(list)
+            self.errors: Counter = Counter()
+            self.in_flight: Counter = Counter()
+            self.max_in_flight: Counter = Counter()
+
+    def _timed(self, backend: str, fn: Callable, *args):
+        with self._lock:
+            self.in_flight[backend] += 1
+            self.max_in_flight[backend] = max(self.max_in_flight[backend], self.in_flight[backend])
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception:
+            with self._lock:
+                self.errors[backend] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight[backend] -= 1
+                self.latencies[backend].append(elapsed)
+
+    def install(self, rb):
+        execute_query, llm_post = rb._execute_query, rb._llm_post
+        rb._execute_query = lambda db, query, params: self._timed(db, execute_query, db, query, params)
+        rb._llm_post = lambda payload: self._timed("llm", llm_post, payload)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per backend: calls, calls/s, latency percentiles, error rate, peak and mean concurrency"""
+        with self._lock:
+            elapsed = max(1e-9, time.perf_counter() - self.started)
+            result = {}
+            for backend, values in sorted(self.latencies.items()):
+                result[backend] = {
+                    "calls": len(values),
+                    "calls_per_s": round(len(values) / elapsed, 2),
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "p99": percentile(values, 99),
+                    "error_rate": round(self.errors[backend] / len(values), 4),
+                    "max_in_flight": self.max_in_flight[backend],
+                    # Little's law: average number of calls in progress
+                    "mean_in_flight": round(sum(values) / elapsed, 2)
+                }
+            return result
+
+
+def build_service(stub_neo4j: bool = False, db_latency: float = 0.03, db_capacity: Optional[int] = 16,
+                  stub_llm: bool = False, llm_profile: str = "fast", llm_capacity: Optional[int] = None,
+                  llm_error_rate: float = 0.0, seed: int = 0):
+    """A shared ResearchBookFinal (as streamlit_app uses), optionally wired to local stand-ins"""
+    from researchbook_final import ResearchBookFinal
+
+    rb = ResearchBookFinal()
+    if stub_neo4j:
+        from neo4j_stub import StubDriver, check_columns
+        check_columns()
+        rb.close_connections()
+        rb.db1_driver = StubDriver("db1", latency=db_latency, capacity=db_capacity, seed=seed)
+        rb.db2_driver = StubDriver("db2", latency=db_latency, capacity=db_capacity, seed=seed + 1)
+    if stub_llm:
+        from llm_stub_server import StubBehaviour, start_stub_server
+        server = start_stub_server(StubBehaviour(llm_profile, error_rate=llm_error_rate, seed=seed,
+                                                 capacity=llm_capacity), port=0)
+        rb.llm_url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        rb.llm_verify_tls = True
+    return rb
+
+
+class Workload:
+    """Weighted feature mix with skewed (Zipf-like) input popularity"""
+
+    def __init__(self, spec: Dict, seed: int = 0):
+        self.mix = {feature: weight for feature, weight in spec["mix"].items() if weight > 0}
+        unknown = set(self.mix) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown features in workload mix: {', '.join(sorted(unknown))}")
+        self.inputs = spec["inputs"]
+        skew = spec.get("skew", 1.0)
+        self.input_weights = {feature: [1 / (i + 1) ** skew for i in range(len(values))]
+                              for feature, values in self.inputs.items()}
+        self._rng = random.Random(seed)
+
+    def next_request(self):
+        feature = self._rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        value = self._rng.choices(self.inputs[feature], weights=self.input_weights[feature])[0]
+        return feature, value
+
+
+def library_caller(rb) -> Callable[[str, str], Dict]:
+    methods = {
+        "lookup": lambda v: rb.lookup_person(v),
+        "expert": lambda v: rb.find_expert(v, limit=10),
+        "field_brief": lambda v: rb.generate_field_brief(v),
+        "match": lambda v: rb.match_researchers(v),
+    }
+    return lambda feature, value: methods[feature](value)
+
+
+# HTTP surface of api_server.py: feature -> (path, query parameter)
+HTTP_ROUTES = {"lookup": ("/lookup", "name"), "expert": ("/experts", "topic"),
+               "field_brief": ("/field_brief", "field"), "match": ("/match", "name")}
+
+
+def http_caller(base_url: str, timeout: float = 120) -> Callable[[str, str], Dict]:
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=256))
+
+    def call(feature, value):
+        path, param = HTTP_ROUTES[feature]
+        response = session.get(f"{base_url}{path}?{urlencode({param: value})}", timeout=timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return response.json()
+    return call
+
+
+def run_stage(call: Callable, workload: Workload, rate: float, duration: float, users: int,
+              poisson: bool = True, seed: int = 0) -> Dict:
+    """
+    Offer `rate` requests/s for `duration` seconds through at most `users` concurrent
+    callers. Latency is measured from the scheduled send time, so queueing counts.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    samples = []  # (feature, total latency, service time, outcome)
+
+    def execute(feature, value, scheduled):
+        started = time.perf_counter()
+        try:
+            result = call(feature, value)
+            outcome = "degraded" if isinstance(result, dict) and result.get("ai_error") else "ok"
+        except Exception as e:
+            outcome = type(e).__name__
+        finished = time.perf_counter()
+        with lock:
+            samples.append((feature, finished - scheduled, finished - started, outcome))
+
+    start = time.perf_counter()
+    sent = 0
+    with ThreadPoolExecutor(max_workers=users, thread_name_prefix="loadgen") as pool:
+        next_send = start
+        while next_send < start + duration:
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            feature, value = workload.next_request()
+            pool.submit(execute, feature, value, next_send)
+            sent += 1
+            next_send += rng.expovariate(rate) if poisson else 1.0 / rate
+    elapsed = time.perf_counter() - start
+
+    latencies = [s[1] for s in samples]
+    outcomes = Counter(s[3] for s in samples)
+    per_feature = {}
+    for feature in FEATURES:
+        values = [s[1] for s in samples if s[0] == feature]
+        if values:
+            per_feature[feature] = {"requests": len(values), "p50": percentile(values, 50),
+                                    "p95": percentile(values, 95), "p99": percentile(values, 99)}
+    return {
+        "offered_rate": rate,
+        "sent": sent,
+        "completed": len(samples),
+        "throughput": round(len(samples) / elapsed, 2),
+        "elapsed": round(elapsed, 2),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "service_p95": percentile([s[2] for s in samples], 95),
+        "error_rate": round(sum(n for o, n in outcomes.items() if o not in ("ok", "degraded")) / max(1, len(samples)), 4),
+        "degraded_rate": round(outcomes["degraded"] / max(1, len(samples)), 4),
+        "outcomes": dict(outcomes),
+        "features": per_feature
+    }
+
+
+def find_saturation(stages: List[Dict]) -> Optional[Dict]:
+    """
+    First stage where the service stops keeping up: completed/offered falls 20% below
+    the first stage's ratio (which absorbs the drain at the end of short stages), or
+    p95 exceeds 3x the first stage. The bottleneck is the backend whose p95 grew
+    the most relative to the first stage.
+    """
+    if not stages:
+        return None
+    baseline = stages[0]
+    base_ratio = baseline["throughput"] / baseline["offered_rate"]
+    for stage in stages[1:]:
+        lagging = stage["throughput"] / stage["offered_rate"] < 0.8 * base_ratio
+        slow = bool(baseline["p95"] and stage["p95"] and stage["p95"] > 3 * baseline["p95"])
+        if not (lagging or slow):
+            continue
+        growth = {}
+        for backend, stats in stage.get("backends", {}).items():
+            base = baseline.get("backends", {}).get(backend, {}).get("p95")
+            if base and stats.get("p95"):
+                growth[backend] = stats["p95"] / base
+        return {"rate": stage["offered_rate"], "reason": "throughput" if lagging else "latency",
+                "bottleneck": max(growth, key=growth.get) if growth else None,
+                "backend_p95_growth": {b: round(g, 2) for b, g in growth.items()}}
+    return None
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+
+def print_stage(stage: Dict):
+    print(f"\n📈 {stage['offered_rate']} req/s offered → {stage['throughput']} req/s completed "
+          f"({stage['completed']}/{stage['sent']})")
+    print(f"   latency p50={_ms(stage['p50'])} p95={_ms(stage['p95'])} p99={_ms(stage['p99'])} "
+          f"| errors {stage['error_rate']:.1%} | AI degraded {stage['degraded_rate']:.1%}")
+    for feature, stats in stage["features"].items():
+        print(f"   • {feature:<12} n={stats['requests']:<5} p50={_ms(stats['p50'])} "
+              f"p95={_ms(stats['p95'])} p99={_ms(stats['p99'])}")
+    for backend, stats in stage.get("backends", {}).items():
+        print(f"   ◦ {backend:<4} {stats['calls_per_s']:>7} calls/s p95={_ms(stats['p95'])} "
+              f"errors={stats['error_rate']:.1%} in-flight mean={stats['mean_in_flight']} "
+              f"max={stats['max_in_flight']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for ResearchBook")
+    parser.add_argument("--workload", help="JSON file with mix, inputs and optional skew")
+    parser.add_argument("--rates", default="2,5,10,20", help="comma-separated req/s, one stage each")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per stage")
+    parser.add_argument("--users", type=int, default=50, help="max concurrent requests in flight")
+    parser.add_argument("--constant", action="store_true", help="fixed inter-arrival times instead of Poisson")
+    parser.add_argument("--url", help="test the HTTP surface (api_server.py) instead of the library")
+    parser.add_argument("--stub-neo4j", action="store_true", help="library mode: local Neo4j stand-in")
+    parser.add_argument("--db-latency", type=float, default=0.03)
+    parser.add_argument("--db-capacity", type=int, default=16, help="stand-in concurrent query slots")
+    parser.add_argument("--stub-llm", action="store_true", help="library mode: local LLM stand-in")
+    parser.add_argument("--llm-profile", default="fast")
+    parser.add_argument("--llm-capacity", type=int, help="stand-in concurrent generations")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write the full report as JSON")
+    args = parser.parse_args()
+
+    spec = DEFAULT_WORKLOAD
+    if args.workload:
+        with open(args.workload, encoding="utf-8") as f:
+            spec = json.load(f)
+    workload = Workload(spec, seed=args.seed)
+
+    rb = probe = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+        call = http_caller(base_url)
+        fetch_backends = lambda reset=False: requests.get(
+            f"{base_url}/stats" + ("?reset=1" if reset else ""), timeout=10).json()
+    else:
+        rb = build_service(args.stub_neo4j, args.db_latency, args.db_capacity, args.stub_llm,
+                           args.llm_profile, args.llm_capacity, args.llm_error_rate, args.seed)
+        probe = BackendProbe()
+        probe.install(rb)
+        call = library_caller(rb)
+        fetch_backends = lambda reset=False: probe.reset() if reset else probe.summary()
+
+    mode = f"HTTP {args.url}" if args.url else "library"
+    print(f"🚦 Load test ({mode}): stages {args.rates} req/s, {args.duration:.0f}s each, "
+          f"{args.users} users, mix {workload.mix}")
+    stages = []
+    try:
+        for i, rate in enumerate(float(r) for r in args.rates.split(",")):
+            fetch_backends(reset=True)
+            stage = run_stage(call, workload, rate, args.duration, args.users,
+                              poisson=not args.constant, seed=args.seed + i)
+            stage["backends"] = fetch_backends()
+            stages.append(stage)
+            print_stage(stage)
+    finally:
+        if rb:
+            rb.close_connections()
+
+    saturation = find_saturation(stages)
+    if saturation:
+        print(f"\n🔥 Saturated at {saturation['rate']} req/s ({saturation['reason']}); "
+              f"bottleneck: {saturation['bottleneck'] or 'unknown'} {saturation['backend_p95_growth']}")
+    else:
+        print("\n✅ No saturation within the tested rates")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"mode": mode, "workload": spec, "stages": stages, "saturation": saturation}, f, indent=2)
+        print(f"💾 Report written to {args.output}")
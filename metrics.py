@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Metrics Registry
+Prometheus-style counters, gauges and histograms for latency, cache and token usage
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Tuple[str, ...], labelvalues: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0-100) of a list of observations"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: List[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, key)), "value": value}
+                    for key, value in sorted(self._values.items())]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: List[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state["counts"]):
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {state['count']}")
+                plain = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{plain} {state['sum']}")
+                lines.append(f"{self.name}_count{plain} {state['count']}")
+        return lines
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [{
+                "labels": dict(zip(self.labelnames, key)),
+                "buckets": dict(zip(self.buckets, state["counts"])),
+                "sum": state["sum"],
+                "count": state["count"]
+            } for key, state in sorted(self._values.items())]
+
+
+class MetricsRegistry:
+    """Holds all metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: List[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: List[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: List[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Text exposition format served on /metrics"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Programmatic view of every metric, keyed by metric name"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: {"type": metric.kind, "help": metric.documentation,
+                              "samples": metric.snapshot()}
+                for metric in metrics}
+
+
+REGISTRY = MetricsRegistry()
+
+FEATURE_LATENCY = REGISTRY.histogram(
+    "researchbook_feature_latency_seconds", "End-to-end latency of ResearchBook features", ["feature"])
+QUERY_LATENCY = REGISTRY.histogram(
+    "researchbook_query_latency_seconds", "Latency of individual database and LLM calls", ["backend", "query"])
+LLM_TOKENS = REGISTRY.counter(
+    "researchbook_llm_tokens_total", "LLM tokens reported in response usage blocks", ["model", "kind"])
+LLM_REQUESTS = REGISTRY.counter(
+    "researchbook_llm_requests_total", "LLM completion requests by feature and outcome", ["feature", "outcome"])
+ERRORS = REGISTRY.counter(
+    "researchbook_errors_total", "Errors by backend and exception type", ["backend", "error_type"])
+IN_FLIGHT = REGISTRY.gauge(
+    "researchbook_in_flight", "Calls currently in progress per backend or feature", ["component"])
+CACHE_EVENTS = REGISTRY.counter(
+    "researchbook_cache_events_total", "Cache lookups by cache name and result", ["cache", "result"])
+
+
+def track_feature(feature: str):
+    """Decorator recording latency, in-flight count and errors of a feature method"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            component = f"feature:{feature}"
+            with IN_FLIGHT.track_inprogress(component=component), FEATURE_LATENCY.time(feature=feature):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    ERRORS.inc(backend=component, error_type=type(e).__name__)
+                    raise
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def track_call(backend: str, query: str):
+    """Context manager recording latency, in-flight count and errors of a backend call"""
+    with IN_FLIGHT.track_inprogress(component=backend), QUERY_LATENCY.time(backend=backend, query=query):
+        try:
+            yield
+        except Exception as e:
+            ERRORS.inc(backend=backend, error_type=type(e).__name__)
+            raise
+
+
+def record_llm_usage(model: str, usage: Optional[Dict]):
+    """Count prompt/completion tokens from an OpenAI-style usage block"""
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        value = usage.get(kind)
+        if value:
+            LLM_TOKENS.inc(value, model=model, kind=kind.replace("_tokens", ""))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_servers: Dict[int, ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = 9108, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread (idempotent per port)"""
+    with _servers_lock:
+        if port in _servers:
+            return _servers[port]
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        server = ThreadingHTTPServer((host, port), handler)
+        thread = threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True)
+        thread.start()
+        _servers[port] = server
+        print(f"📈 Metrics endpoint on http://{host}:{port}/metrics")
+        return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve ResearchBook metrics")
+    parser.add_argument("--port", type=int, default=9108)
+    args = parser.parse_args()
+
+    start_metrics_server(args.port)
+    while True:
+        time.sleep(3600)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - In-memory prefix index over researcher names
+Typeahead for the person lookup and matching pages: normalized names from both
+databases in one sorted array, answered by binary search instead of a CONTAINS
+scan per keystroke. Every word of a name is indexed, so "svens" finds
+"Anna Svensson" as well as "Svensson, Anna".
+
+The same entries carry a trigram index for fuzzy matching, which lookup_person
+uses to turn a misspelt or partial name ("Soderberg" for "Söderberg") into
+ranked candidates with per-database ids.
+
+    python name_index.py "anna sv"
+"""
+
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+DB1_NAMES_QUERY = """
+MATCH (p:Person)
+WHERE p.name IS NOT NULL
+RETURN elementId(p) as person_id,
+       p.name as name,
+       p.orcid_id as orcid_id,
+       coalesce(head(p.summary_organizations),
+                head(COLLECT { MATCH (p)-[:WORKED_AT]->(o:Organization) RETURN o.name LIMIT 1 })) as organization,
+       coalesce(p.summary_pub_count, p.orcid_publication_count, 0) as weight
+"""
+
+DB2_NAMES_QUERY = """
+MATCH (p:Person)
+WHERE p.name IS NOT NULL
+RETURN elementId(p) as person_id,
+       p.name as name,
+       COUNT { (p)-->(:Thesis) } as weight
+"""
+
+# Prefixes matching more keys than this get their top completions precomputed,
+# so a query never ranks more than HEAVY_RANGE candidates
+HEAVY_RANGE = 256
+PRECOMPUTED_TOP_K = 20
+# Queries asking for more than PRECOMPUTED_TOP_K rank at most this many candidates
+MAX_RANKED = 5000
+# Fuzzy candidates below this similarity are dropped
+MIN_SIMILARITY = 0.3
+# Without an exact name match, candidates this close to the best one are taken as the person
+SAME_PERSON_MARGIN = 0.05
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case-, accent- and punctuation-insensitive form of a name ("Sjöberg, K." -> "sjoberg k")"""
+    text = unicodedata.normalize("NFKD", str(name).casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def trigrams(name: str) -> Set[str]:
+    """Trigrams of each word padded as "  word " (the pg_trgm scheme)"""
+    grams = set()
+    for word in normalize_name(name).split(" "):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def cross_database_identities(db1_records: Iterable[Dict], db2_records: Iterable[Dict]) -> Dict[str, str]:
+    """
+    DB2 person id -> DB1 person id for people present in both databases: same
+    normalized name, and exactly one person of that name on each side
+    """
+    db1_by_name: Dict[str, List[str]] = {}
+    for record in db1_records:
+        db1_by_name.setdefault(normalize_name(record["name"]), []).append(record["person_id"])
+    db2_by_name: Dict[str, List[str]] = {}
+    for record in db2_records:
+        db2_by_name.setdefault(normalize_name(record["name"]), []).append(record["person_id"])
+    return {db2_ids[0]: db1_by_name[name][0] for name, db2_ids in db2_by_name.items()
+            if len(db2_ids) == 1 and len(db1_by_name.get(name, ())) == 1}
+
+
+def select_candidates(name: str, candidates: List[Dict],
+                      margin: float = SAME_PERSON_MARGIN) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Split fuzzy candidates into (the person meant, other suggestions): the exact
+    normalized-name matches if there are any, else the candidates within margin
+    of the best similarity
+    """
+    exact = [c for c in candidates if normalize_name(c["name"]) == normalize_name(name)]
+    if exact:
+        chosen = exact
+    elif candidates:
+        best = max(c["similarity"] for c in candidates)
+        chosen = [c for c in candidates if c["similarity"] >= best - margin]
+    else:
+        chosen = []
+    return chosen, [c for c in candidates if c not in chosen]
+
+
+class NameIndex:
+    """Sorted (key, entry) arrays: one key per name suffix starting at a word boundary"""
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.built_at = time.time()
+        # DB2 person id -> DB1 person id of the entries joined across databases
+        self.identities = {entry["person_ids"]["db2"]: entry["person_ids"]["db1"] for entry in entries
+                           if "db1" in entry["person_ids"] and "db2" in entry["person_ids"]}
+        keys = []
+        for i, entry in enumerate(entries):
+            words = normalize_name(entry["name"]).split(" ")
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), i))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.entry_ids = [i for _, i in keys]
+        self._top: Dict[str, List[int]] = {}
+        self._precompute_heavy_prefixes()
+        self._build_trigrams()
+
+    @classmethod
+    def from_records(cls, db1_records: List[Dict], db2_records: List[Dict]) -> "NameIndex":
+        """
+        One entry per DB1 person. DB2 persons attach to the DB1 entry they are
+        identified with (cross_database_identities), else get an entry of their own.
+        """
+        entries, by_db1_id = [], {}
+        for record in db1_records:
+            entry = {"name": record["name"], "orcid_id": record.get("orcid_id"),
+                     "organization": record.get("organization"), "theses": 0,
+                     "weight": record.get("weight") or 0, "sources": ["database_1"],
+                     "person_ids": {"db1": record["person_id"]}}
+            by_db1_id[record["person_id"]] = entry
+            entries.append(entry)
+        identities = cross_database_identities(db1_records, db2_records)
+        for record in db2_records:
+            theses = record.get("weight") or 0
+            if record["person_id"] in identities:
+                entry = by_db1_id[identities[record["person_id"]]]
+                entry["theses"] = theses
+                entry["weight"] += theses
+                entry["sources"].append("database_2")
+                entry["person_ids"]["db2"] = record["person_id"]
+            else:
+                entries.append({"name": record["name"], "orcid_id": None, "organization": None,
+                                "theses": theses, "weight": theses, "sources": ["database_2"],
+                                "person_ids": {"db2": record["person_id"]}})
+        return cls(entries)
+
+    def _range(self, prefix: str) -> range:
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        return range(lo, hi)
+
+    def _ranked(self, positions, k: int) -> List[int]:
+        """Distinct entries at the given key positions, heaviest first"""
+        seen = {self.entry_ids[pos] for pos in positions}
+        return heapq.nlargest(k, seen, key=lambda i: (self.entries[i]["weight"], -i))
+
+    def _precompute_heavy_prefixes(self):
+        """Top completions of every prefix whose key range exceeds HEAVY_RANGE, one length at a time"""
+        pending, length = [(0, len(self.keys))], 1
+        while pending:
+            heavy = []
+            for lo, hi in pending:
+                pos = lo
+                while pos < hi:
+                    if len(self.keys[pos]) < length:
+                        pos += 1
+                        continue
+                    prefix = self.keys[pos][:length]
+                    end = bisect_left(self.keys, prefix + "\U0010ffff", pos, hi)
+                    if end - pos > HEAVY_RANGE:
+                        self._top[prefix] = self._ranked(range(pos, end), PRECOMPUTED_TOP_K)
+                        heavy.append((pos, end))
+                    pos = end
+            pending, length = heavy, length + 1
+
+    def _build_trigrams(self):
+        postings: Dict[str, List[int]] = {}
+        self.trigram_counts = np.zeros(len(self.entries), dtype=np.int32)
+        self.weights = np.array([entry["weight"] for entry in self.entries], dtype=np.float64)
+        for i, entry in enumerate(self.entries):
+            grams = trigrams(entry["name"])
+            self.trigram_counts[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def fuzzy(self, name: str, k: int = 10, min_similarity: float = MIN_SIMILARITY) -> List[Dict]:
+        """
+        Entries ranked by trigram similarity to name, heaviest first among equals.
+        Similarity averages coverage (share of the query's trigrams found, so a
+        partial name like "Anders" still scores) and Jaccard (prefers close full names).
+        """
+        query = trigrams(name)
+        lists = [self.postings[gram] for gram in query if gram in self.postings]
+        if not lists:
+            return []
+        overlap = np.bincount(np.concatenate(lists), minlength=len(self.entries))
+        ids = np.flatnonzero(overlap)
+        shared = overlap[ids]
+        union = len(query) + self.trigram_counts[ids] - shared
+        similarity = (shared / len(query) + shared / union) / 2
+        keep = similarity >= min_similarity
+        ids, similarity = ids[keep], similarity[keep]
+        order = np.lexsort((-self.weights[ids], -similarity))[:k]
+        return [{**self.suggestion(self.entries[ids[j]]), "similarity": round(float(similarity[j]), 3)}
+                for j in order]
+
+    def complete(self, prefix: str, k: int = 10) -> List[Dict]:
+        """Top-k entries with a name word starting with prefix, heaviest first"""
+        needle = normalize_name(prefix)
+        if not needle:
+            return []
+        if needle in self._top and k <= PRECOMPUTED_TOP_K:
+            ids = self._top[needle][:k]
+        else:
+            positions = self._range(needle)
+            ids = self._ranked(positions[:MAX_RANKED], k)
+        return [self.suggestion(self.entries[i]) for i in ids]
+
+    @staticmethod
+    def suggestion(entry: Dict) -> Dict:
+        """Entry plus a one-line disambiguation hint (organization, ORCID, thesis count)"""
+        hints = [entry["organization"]] if entry.get("organization") else []
+        if entry.get("orcid_id"):
+            hints.append(f"ORCID {entry['orcid_id']}")
+        if entry.get("theses"):
+            hints.append(f"{entry['theses']} theses")
+        return {**entry, "hint": " · ".join(hints)}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class NameIndexHolder:
+    """
+    Keeps a NameIndex fresh: the first call builds it, later calls past the TTL
+    rebuild in a background thread while the old index keeps answering. After a
+    failed first build, calls raise at once for retry_after seconds instead of
+    scanning both databases again.
+    """
+
+    def __init__(self, loader: Callable[[], NameIndex], ttl: float = 3600, retry_after: float = 60):
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._index: Optional[NameIndex] = None
+        self._loaded_at = 0.0
+        self._failed_at: Optional[float] = None
+        self._error = ""
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> NameIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_after:
+                        raise RuntimeError(f"Name index build failed, retrying later: {self._error}")
+                    try:
+                        self._index = self.loader()
+                    except Exception as e:
+                        self._failed_at, self._error = time.monotonic(), str(e)
+                        raise
+                    self._loaded_at = time.monotonic()
+                    self._failed_at = None
+        elif time.monotonic() - self._loaded_at > self.ttl and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh, daemon=True).start()
+        return self._index
+
+    def _refresh(self):
+        try:
+            index = self.loader()
+            self._index, self._loaded_at = index, time.monotonic()
+        except Exception as e:
+            print(f"⚠️ Name index refresh failed, keeping the old one: {e}")
+            self._loaded_at = time.monotonic()
+        finally:
+            self._refreshing = False
+
+
+if __name__ == "__main__":
+    import sys
+    from researchbook import ResearchBook
+
+    rb = ResearchBook()
+    try:
+        start = time.perf_counter()
+        index = rb.name_index()
+        print(f"🔤 Indexed {len(index):,} names ({len(index.keys):,} keys) in {time.perf_counter() - start:.1f}s")
+        for prefix in sys.argv[1:] or ["an"]:
+            start = time.perf_counter()
+            suggestions = index.complete(prefix)
+            print(f"\n'{prefix}' ({(time.perf_counter() - start) * 1000:.2f} ms)")
+            for suggestion in suggestions:
+                print(f"   {suggestion['name']}  {suggestion['hint']}")
+    finally:
+        rb.close_connections()
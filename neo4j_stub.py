@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Neo4j stand-in for load tests
+Drop-in for the driver/session/result surface ResearchBook uses. Queries are
+answered with synthetic rows shaped by the RETURN clause (column names decide
+the value types) after a configurable latency; a capacity limit models a
+database that queues work once its workers are busy.
+
+    rb.db1_driver = StubDriver("db1", latency=0.03, capacity=8)
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_RETURN = re.compile(r"\bRETURN\b", re.IGNORECASE)
+_RETURN_END = re.compile(r"\bORDER\s+BY\b|\bSKIP\b|\bLIMIT\b", re.IGNORECASE)
+_LIMIT = re.compile(r"\bLIMIT\s+(\d+)\s*$", re.IGNORECASE)
+_ALIAS = re.compile(r"\s+as\s+(\w+)\s*$", re.IGNORECASE)
+
+_INT_HINTS = ("count", "pubs", "publications", "theses", "relevance", "degree", "total", "marked",
+              "changed", "updated", "weight")
+_LIST_HINTS = ("roles", "keywords", "organizations", "departments", "sample", "titles", "types",
+               "affiliations", "labels")
+_WORDS = ("machine learning", "sustainability", "robotics", "energy systems", "biotechnology",
+          "architecture", "signal processing", "materials", "logistics", "urban planning")
+_ROLES = ("SUPERVISOR", "EXAMINER", "CO_SUPERVISOR", "ADVISOR", "AUTHOR", "OPPONENT")
+
+
+def return_columns(query: str) -> List[str]:
+    """
+    Column names of the last top-level RETURN clause (alias if present, else the
+    bare expression); RETURNs of subqueries such as COLLECT { ... } are skipped
+    """
+    depths = _depths(query)
+    starts = [m.end() for m in _RETURN.finditer(query) if depths[m.start()] == 0]
+    if not starts:
+        return []
+    clause = query[starts[-1]:]
+    clause_depths = depths[starts[-1]:]
+    end = next((m.start() for m in _RETURN_END.finditer(clause) if clause_depths[m.start()] == 0), len(clause))
+    columns, depth, current = [], 0, ""
+    for char in clause[:end]:
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        if char == "," and depth == 0:
+            columns.append(current)
+            current = ""
+        else:
+            current += char
+    columns.append(current)
+
+    names = []
+    for column in (c.strip() for c in columns):
+        if not column:
+            continue
+        alias = _ALIAS.search(column)
+        names.append(alias.group(1) if alias else column.split(".")[-1].strip())
+    return names
+
+
+def _depths(query: str) -> List[int]:
+    """Bracket nesting depth at every character of query"""
+    depths, depth = [], 0
+    for char in query:
+        if char in ")]}":
+            depth -= 1
+        depths.append(depth)
+        if char in "([{":
+            depth += 1
+    return depths
+
+
+def check_columns():
+    """Raise if the stub would shape the rows of a known library query wrongly"""
+    from name_index import DB1_NAMES_QUERY, DB2_NAMES_QUERY
+
+    expected = [(DB1_NAMES_QUERY, ["person_id", "name", "orcid_id", "organization", "weight"]),
+                (DB2_NAMES_QUERY, ["person_id", "name", "weight"])]
+    for query, columns in expected:
+        if return_columns(query) != columns:
+            raise AssertionError(f"Stub columns {return_columns(query)} != {columns} for:{query}")
+
+
+def synthetic_value(column: str, rng: random.Random, row: int) -> Any:
+    """A plausible value for a column, judged by its name"""
+    name = column.lower()
+    if name.endswith("_json"):
+        return json.dumps([{"organization": "Chalmers", "role": "Researcher", "department": "CSE"}])
+    if name.endswith("dirty"):
+        return False
+    if name.endswith("version"):
+        return 1
+    if "year" in name:
+        return rng.randint(2015, 2025)
+    if name in ("id", "person_id") or name.endswith("_id"):
+        return f"stub:{rng.getrandbits(32):08x}:{row}"
+    if any(hint in name for hint in _LIST_HINTS):
+        pool = _ROLES if "role" in name or "type" in name else _WORDS
+        return rng.sample(pool, k=min(len(pool), rng.randint(1, 3)))
+    if any(hint in name for hint in _INT_HINTS):
+        return max(1, 12 - row + rng.randint(0, 3))
+    if "name" in name:
+        return f"Researcher {rng.randint(1, 5000)}"
+    return f"{column} {rng.randint(1, 1000)}"
+
+
+class StubRecord(dict):
+    """Record stand-in: supports record["key"], dict(record) and record.data()"""
+
+    def data(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+class StubDriver:
+    """Driver stand-in with latency = base + per_row * rows (+- jitter), capacity-limited"""
+
+    def __init__(self, name: str = "neo4j", latency: float = 0.02, per_row: float = 0.0005,
+                 jitter: float = 0.2, capacity: Optional[int] = None, default_rows: int = 5,
+                 seed: int = 0):
+        self.name = name
+        self.latency = latency
+        self.per_row = per_row
+        self.jitter = jitter
+        self.default_rows = default_rows
+        self._slots = threading.BoundedSemaphore(capacity) if capacity else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def session(self, database: str = "neo4j", **config) -> "StubSession":
+        return StubSession(self)
+
+    def close(self):
+        pass
+
+    def _delay(self, rows: int) -> float:
+        with self._lock:
+            roll = self._rng.random()
+        return max(0.0, (self.latency + self.per_row * rows) * (1 + self.jitter * (2 * roll - 1)))
+
+    def run(self, query: str, params: Dict[str, Any]) -> List[StubRecord]:
+        limit = _LIMIT.search(query.strip())
+        rows = params.get("limit") or (int(limit.group(1)) if limit else self.default_rows)
+        if params.get("batch_size"):
+            rows = 0  # maintenance loops (summaries etc.) terminate immediately
+
+        if self._slots:
+            self._slots.acquire()
+        try:
+            with self._lock:
+                self.queries += 1
+            time.sleep(self._delay(rows))
+        finally:
+            if self._slots:
+                self._slots.release()
+
+        # Deterministic per (query, params) so caches and coalescing behave like the real thing
+        seed = hashlib.sha256((query + json.dumps(params, sort_keys=True, default=str)).encode()).hexdigest()
+        rng = random.Random(seed)
+        columns = return_columns(query)
+        return [StubRecord((c, synthetic_value(c, rng, i)) for c in columns) for i in range(rows)]
+
+
+class StubSession:
+    def __init__(self, driver: StubDriver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query: str, parameters: Optional[Dict] = None, **params) -> List[StubRecord]:
+        return self.driver.run(query, {**(parameters or {}), **params})
+
+    def close(self):
+        pass
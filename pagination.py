@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Keyset Pagination
+Opaque cursors over (score DESC, id ASC) orderings, so page N+1 continues
+after the last row of page N instead of re-running the query with a bigger LIMIT
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+
+def keyset_where(score: str, row_id: str) -> str:
+    """Cypher predicate selecting rows after ($after_score, $after_id) in score DESC, id ASC order"""
+    return (f"($after_score IS NULL OR {score} < $after_score OR "
+            f"({score} = $after_score AND {row_id} > $after_id))")
+
+
+def keyset_params(after: Optional[List]) -> Dict[str, Any]:
+    """Query parameters for keyset_where; after is [score, id] or None for the first page"""
+    if not after:
+        return {"after_score": None, "after_id": None}
+    return {"after_score": after[0], "after_id": after[1]}
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """Short hash binding a cursor to the query it was issued for"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Dict[str, Any]:
+    """Decode a cursor, rejecting malformed ones or cursors issued for a different query"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(state, dict) or state.get("q") != fingerprint:
+        raise ValueError("Cursor does not belong to this query")
+    return state
+
+
+def advance(rows: List[Dict], consumed: int, fetched_limit: int,
+            score_key: str, id_key: str, after: Optional[List]) -> Dict[str, Any]:
+    """
+    New per-source position after consuming the first `consumed` of `rows`.
+    The source is exhausted once a short page has been fully consumed.
+    """
+    if consumed:
+        last = rows[consumed - 1]
+        after = [last[score_key], last[id_key]]
+    return {"after": after, "done": len(rows) < fetched_limit and consumed == len(rows)}
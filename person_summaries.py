@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Per-person summary aggregates in DB1
+Materializes publication count, first/last publication year, affiliations and
+top keywords on each Person node so profile lookups read one node instead of
+expanding the WORKED_AT x AUTHORED neighbourhood.
+
+    python person_summaries.py            # refresh stale / changed persons
+    python person_summaries.py --full     # recompute every person
+
+Which summaries are stale:
+  - persons flagged by mark_dirty / mark_publications_changed (ingest should
+    call these for every person or publication it touches)
+  - persons whose AUTHORED / WORKED_AT degree changed (detect_changes). This
+    only catches added or removed relationships, not in-place edits such as a
+    publication's year or keywords, nor one add plus one remove; it also
+    reads the degree of every Person
+  - summaries older than max_age_days, so anything the two above miss is
+    recomputed within that many days
+"""
+
+import json
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+SUMMARY_VERSION = 1
+TOP_KEYWORDS = 10
+# Every summary is recomputed at least this often
+MAX_AGE_DAYS = 7
+
+# Persons whose relationship degrees no longer match what the summary was built from
+# (misses in-place edits; see the module docstring)
+DETECT_CHANGES_QUERY = """
+MATCH (p:Person)
+WHERE p.summary_version IS NOT NULL
+  AND (COUNT { (p)-[:AUTHORED]->() } <> p.summary_authored_degree OR
+       COUNT { (p)-[:WORKED_AT]->() } <> p.summary_worked_at_degree)
+CALL { WITH p SET p.summary_dirty = true } IN TRANSACTIONS OF 10000 ROWS
+RETURN count(p) as changed
+"""
+
+MARK_ALL_DIRTY_QUERY = """
+MATCH (p:Person)
+CALL { WITH p SET p.summary_dirty = true } IN TRANSACTIONS OF 10000 ROWS
+RETURN count(p) as marked
+"""
+
+MARK_DIRTY_BY_NAME_QUERY = """
+UNWIND $names as person_name
+MATCH (p:Person {name: person_name})
+SET p.summary_dirty = true
+RETURN count(p) as marked
+"""
+
+# Authors of publications edited in place (year, keywords, title, ...)
+MARK_DIRTY_BY_PUBLICATION_QUERY = """
+UNWIND $publication_ids as publication_id
+MATCH (pub:Publication)<-[:AUTHORED]-(p:Person)
+WHERE elementId(pub) = publication_id
+SET p.summary_dirty = true
+RETURN count(DISTINCT p) as marked
+"""
+
+# Each neighbourhood is aggregated in its own subquery: no affiliations x publications product
+STALE_BATCH_QUERY = """
+MATCH (p:Person)
+WHERE p.summary_version IS NULL OR p.summary_version < $version OR p.summary_dirty = true
+   OR p.summary_updated_at < datetime() - duration({days: $max_age_days})
+WITH p LIMIT $batch_size
+CALL {
+    WITH p
+    OPTIONAL MATCH (p)-[:AUTHORED]->(pub:Publication)
+    RETURN count(pub) as pub_count,
+           min(coalesce(pub.year, pub.publication_year)) as first_year,
+           max(coalesce(pub.year, pub.publication_year)) as last_year,
+           collect(pub.keywords) as keyword_values
+}
+CALL {
+    WITH p
+    OPTIONAL MATCH (p)-[w:WORKED_AT]->(org:Organization)
+    RETURN collect(DISTINCT {
+               organization: org.name,
+               role: w.role,
+               department: w.department,
+               start_year: w.start_year,
+               end_year: w.end_year
+           }) as affiliations
+}
+RETURN elementId(p) as id,
+       pub_count, first_year, last_year, keyword_values, affiliations,
+       COUNT { (p)-[:AUTHORED]->() } as authored_degree,
+       COUNT { (p)-[:WORKED_AT]->() } as worked_at_degree
+"""
+
+WRITE_BATCH_QUERY = """
+UNWIND $rows as row
+MATCH (p:Person) WHERE elementId(p) = row.id
+SET p.summary_pub_count = row.pub_count,
+    p.summary_first_pub_year = row.first_year,
+    p.summary_last_pub_year = row.last_year,
+    p.summary_affiliations_json = row.affiliations_json,
+    p.summary_organizations = row.organizations,
+    p.summary_top_keywords = row.top_keywords,
+    p.summary_authored_degree = row.authored_degree,
+    p.summary_worked_at_degree = row.worked_at_degree,
+    p.summary_version = $version,
+    p.summary_updated_at = datetime(),
+    p.summary_dirty = false
+"""
+
+_KEYWORD_SPLIT = re.compile(r"[;,|]")
+
+
+def top_keywords(keyword_values: Iterable, limit: int = TOP_KEYWORDS) -> List[str]:
+    """Most frequent keywords across publications (keywords may be strings or lists)"""
+    counts = Counter()
+    for value in keyword_values:
+        if not value:
+            continue
+        items = value if isinstance(value, list) else _KEYWORD_SPLIT.split(value)
+        for keyword in items:
+            keyword = str(keyword).strip().lower()
+            if keyword:
+                counts[keyword] += 1
+    return [keyword for keyword, _ in counts.most_common(limit)]
+
+
+def build_summary_row(record: Dict) -> Dict:
+    """Turn one aggregated record into the properties written back to the Person node"""
+    affiliations = [aff for aff in record["affiliations"] if aff.get("organization")]
+    return {
+        "id": record["id"],
+        "pub_count": record["pub_count"],
+        "first_year": record["first_year"],
+        "last_year": record["last_year"],
+        "affiliations_json": json.dumps(affiliations, default=str),
+        "organizations": sorted({aff["organization"] for aff in affiliations}),
+        "top_keywords": top_keywords(record["keyword_values"]),
+        "authored_degree": record["authored_degree"],
+        "worked_at_degree": record["worked_at_degree"]
+    }
+
+
+def mark_dirty(driver, names: List[str]) -> int:
+    """Flag persons for recomputation (call after ingesting new publications/affiliations)"""
+    with driver.session(database="neo4j") as session:
+        return session.run(MARK_DIRTY_BY_NAME_QUERY, names=names).single()["marked"]
+
+
+def mark_publications_changed(driver, publication_ids: List[str]) -> int:
+    """Flag the authors of publications whose properties were edited (degrees do not change)"""
+    with driver.session(database="neo4j") as session:
+        return session.run(MARK_DIRTY_BY_PUBLICATION_QUERY,
+                           publication_ids=publication_ids).single()["marked"]
+
+
+def refresh_person_summaries(driver, batch_size: int = 500, full: bool = False,
+                             detect_changes: bool = True, max_age_days: int = MAX_AGE_DAYS) -> Dict[str, int]:
+    """
+    Recompute summaries for persons that are missing, outdated, dirty or older
+    than max_age_days. detect_changes first flags persons whose AUTHORED/WORKED_AT
+    degree changed, which only reads per-node degree counts, not the neighbourhood.
+    """
+    stats = {"marked": 0, "updated": 0, "batches": 0}
+    with driver.session(database="neo4j") as session:
+        if full:
+            stats["marked"] = session.run(MARK_ALL_DIRTY_QUERY).single()["marked"]
+        elif detect_changes:
+            stats["marked"] = session.run(DETECT_CHANGES_QUERY).single()["changed"]
+
+        while True:
+            records = list(session.run(STALE_BATCH_QUERY, version=SUMMARY_VERSION, batch_size=batch_size,
+                                       max_age_days=max_age_days))
+            if not records:
+                break
+            rows = [build_summary_row(record) for record in records]
+            session.run(WRITE_BATCH_QUERY, rows=rows, version=SUMMARY_VERSION).consume()
+            stats["updated"] += len(rows)
+            stats["batches"] += 1
+            print(f"   ✅ Batch {stats['batches']}: {stats['updated']:,} persons summarized")
+
+    return stats
+
+
+def summary_to_profile(record: Dict) -> Dict:
+    """Profile dict (as returned by _get_researcher_profile_db1) from summary properties"""
+    return {
+        "name": record["name"],
+        "orcid_id": record["orcid_id"],
+        "given_names": record["given_names"],
+        "family_name": record["family_name"],
+        "orcid_publication_count": record["pub_count"],
+        "total_publications": record["summary_pub_count"],
+        "first_publication_year": record["summary_first_pub_year"],
+        "last_publication_year": record["summary_last_pub_year"],
+        "top_keywords": record["summary_top_keywords"] or [],
+        "affiliations": json.loads(record["summary_affiliations_json"] or "[]")
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook import ResearchBook
+
+    parser = argparse.ArgumentParser(description="Materialize per-person summaries in DB1")
+    parser.add_argument("--full", action="store_true", help="recompute every person")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-age-days", type=int, default=MAX_AGE_DAYS,
+                        help="also recompute summaries older than this")
+    args = parser.parse_args()
+
+    rb = ResearchBook()
+    try:
+        print("🧮 Refreshing per-person summaries in DB1...")
+        result = refresh_person_summaries(rb.db1_driver, batch_size=args.batch_size, full=args.full,
+                                          max_age_days=args.max_age_days)
+        print(f"🎉 Done: {result['marked']:,} flagged, {result['updated']:,} updated "
+              f"in {result['batches']} batches")
+    finally:
+        rb.close_connections()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Relationship catalog
+Every relationship type of a database with its count, the (source label,
+target label) patterns it connects and its property keys, gathered in two
+aggregated passes instead of one query per type. Saved as a versioned JSON
+file; ResearchBook reads it for role categorization and typed patterns
+instead of introspecting DB2 at runtime.
+
+    python relationship_catalog.py            # rebuild the DB2 catalog
+"""
+
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import config
+from artifacts import ArtifactReader
+
+CATALOG_VERSION = 1
+
+
+def catalog_path(db: str = "db2") -> str:
+    return os.path.join(config.ARTIFACT_DIR, f"relationship_catalog_{db}.json")
+
+
+DEFAULT_PATH = catalog_path("db2")
+
+PATTERNS_QUERY = """
+MATCH (s)-[r]->(t)
+RETURN type(r) as rel_type, labels(s) as source_labels, labels(t) as target_labels, count(*) as count
+"""
+
+PROPERTIES_QUERY = """
+MATCH ()-[r]->()
+WHERE size(keys(r)) > 0
+UNWIND keys(r) as key
+RETURN type(r) as rel_type, collect(DISTINCT key) as properties
+"""
+
+
+def _label(labels: List[str]) -> str:
+    return ":".join(sorted(labels)) or "(no label)"
+
+
+class RelationshipCatalog:
+    """rel type -> {"count", "patterns": [{"source", "target", "count"}], "properties"}"""
+
+    def __init__(self, types: Dict[str, Dict], db: str = "db2", built_at: float = 0.0):
+        self.types = types
+        self.db = db
+        self.built_at = built_at
+
+    @classmethod
+    def build(cls, rb, db: str = "db2") -> "RelationshipCatalog":
+        types: Dict[str, Dict] = {}
+        patterns = defaultdict(lambda: defaultdict(int))
+        for record in rb._query(db, "relationship_catalog_patterns", PATTERNS_QUERY):
+            patterns[record["rel_type"]][(_label(record["source_labels"]), _label(record["target_labels"]))] += \
+                record["count"]
+        properties = {record["rel_type"]: sorted(record["properties"])
+                      for record in rb._query(db, "relationship_catalog_properties", PROPERTIES_QUERY)}
+        for rel_type, by_pattern in patterns.items():
+            types[rel_type] = {
+                "count": sum(by_pattern.values()),
+                "patterns": [{"source": source, "target": target, "count": count}
+                             for (source, target), count in sorted(by_pattern.items(), key=lambda p: -p[1])],
+                "properties": properties.get(rel_type, [])
+            }
+        return cls(types, db, time.time())
+
+    def rel_types(self) -> List[str]:
+        """All relationship types, most frequent first"""
+        return sorted(self.types, key=lambda rel_type: (-self.types[rel_type]["count"], rel_type))
+
+    def count(self, rel_type: str) -> int:
+        return self.types.get(rel_type, {}).get("count", 0)
+
+    def types_between(self, source: str, target: str) -> List[str]:
+        """Types with at least one (source)-[type]->(target) relationship, most frequent first"""
+        return [rel_type for rel_type in self.rel_types()
+                if any(source in p["source"].split(":") and target in p["target"].split(":")
+                       for p in self.types[rel_type]["patterns"])]
+
+    def total(self) -> int:
+        return sum(entry["count"] for entry in self.types.values())
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CATALOG_VERSION, "db": self.db, "built_at": self.built_at,
+                       "types": self.types}, f, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional["RelationshipCatalog"]:
+        """The stored catalog, or None if missing or written by an incompatible version"""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CATALOG_VERSION:
+            return None
+        return cls(data["types"], data["db"], data["built_at"])
+
+
+class RelationshipCatalogReader(ArtifactReader):
+    def __init__(self, path: str = DEFAULT_PATH):
+        super().__init__(path, RelationshipCatalog.load)
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook import ResearchBook
+
+    parser = argparse.ArgumentParser(description="Build the relationship catalog of a database")
+    parser.add_argument("--db", choices=["db1", "db2"], default="db2")
+    parser.add_argument("--path", help="default: artifacts/relationship_catalog_<db>.json")
+    args = parser.parse_args()
+    path = args.path or catalog_path(args.db)
+
+    rb = ResearchBook()
+    try:
+        start = time.perf_counter()
+        catalog = RelationshipCatalog.build(rb, args.db)
+        catalog.save(path)
+        print(f"🎉 {len(catalog.types):,} relationship types, {catalog.total():,} relationships "
+              f"({time.perf_counter() - start:.1f}s) → {path}")
+    finally:
+        rb.close_connections()
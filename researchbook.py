@@ -6,54 +6,356 @@ Using 2 Neo4j databases + LightLLM for research intelligence
 
 from neo4j import GraphDatabase
 import requests
+import hashlib
 import json
+import os
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+import config
+from metrics import track_call, track_feature, record_llm_usage, LLM_REQUESTS
+from llm_budget import LLMBudget
+from resilience import (CircuitBreaker, CircuitOpenError, LatencyTracker, LLMBudgetExceeded,
+                        LLMError, RetryPolicy, call_resilient, hedged_call, is_transient_error)
+from role_taxonomy import RoleTaxonomy
+from relationship_catalog import RelationshipCatalogReader
+from schema_service import SchemaService
+from name_index import DB1_NAMES_QUERY, DB2_NAMES_QUERY, NameIndex, NameIndexHolder, select_candidates
+from graph_analytics import PersonScoresReader
+from expert_ranking import RANK_MODES, PendingResults, fast_rank
+from keywords import READY_QUERY as VOCABULARY_READY_QUERY, VOCABULARY_VERSION
+from person_summaries import SUMMARY_VERSION, summary_to_profile
+from llm_batching import BATCH_ITEMS, build_batch_prompt, chunk_ids, parse_batch_response
+from pagination import advance, decode_cursor, encode_cursor, keyset_params, keyset_where, query_fingerprint
+
+# Text matched against a topic per database: (label, {property: "text" | "list"})
+TOPIC_PROPERTIES = {
+    "db1": ("Publication", {"keywords": "text", "abstract": "text", "title": "text"}),
+    "db2": ("Thesis", {"title": "text", "keywords": "list", "abstract": "text"}),
+}
+
+def _name_digest(name: Optional[str]) -> str:
+    """Short, cursor-sized key of an expert name"""
+    return hashlib.sha1((name or "").encode("utf-8")).hexdigest()[:10]
 
 class ResearchBook:
     def __init__(self):
         # Database 1 - Research Intelligence (Chalmers + ORCID)
         self.db1_driver = GraphDatabase.driver(
-            "neo4j+s://84711dd6.databases.neo4j.io",
-            auth=("neo4j", "kvWkwedbwzpifLYyA_lhgUTIVdR-l37Gz1XJHKB7bWI")
+            config.DB1_URI,
+            auth=(config.DB1_USER, config.DB1_PASSWORD)
         )
         
         # Database 2 - Thesis Relationships  
         self.db2_driver = GraphDatabase.driver(
-            "neo4j+s://7ae716c3.databases.neo4j.io",
-            auth=("neo4j", "NmDzl4lSyYJqhAAtJinGbhNgbNFeiQIsH2M6IrfFECM")
+            config.DB2_URI,
+            auth=(config.DB2_USER, config.DB2_PASSWORD)
         )
         
-        # LightLLM API
-        self.llm_url = "https://anast.ita.chalmers.se:4000/v1/chat/completions"
-        self.llm_key = "sk-u_7AVwCgIBRZF9IXwzPqtA"
-        self.llm_model = "claude-sonnet-4"
+        # LightLLM API (or any OpenAI-compatible endpoint, see config.py)
+        self.llm_url = config.LLM_CHAT_URL
+        self.llm_key = config.LLM_API_KEY
+        self.llm_model = config.LLM_MODEL
+        self.llm_verify_tls = config.LLM_VERIFY_TLS
+        
+        # Token/latency budget shared by all features
+        self.llm_budget = LLMBudget.from_env()
+        
+        # Resilience: one circuit breaker per backend, shared retry policy,
+        # optional hedged LLM requests once a call exceeds the latency percentile
+        self.breakers = {name: CircuitBreaker(name) for name in ("db1", "db2", "llm")}
+        self.retry_policy = RetryPolicy()
+        self.llm_latency = LatencyTracker()
+        hedge_percentile = os.environ.get("RESEARCHBOOK_LLM_HEDGE_PERCENTILE")
+        self.llm_hedge_percentile = float(hedge_percentile) if hedge_percentile else None
+        
+        # DB2 role taxonomy, from the relationship catalog (relationship_catalog.py) when
+        # one has been built, else loaded from the live schema on first use
+        self.role_taxonomy_ttl = 3600
+        self._role_taxonomy = None
+        self._role_taxonomy_loaded_at = 0.0
+        self._relationship_catalog = RelationshipCatalogReader()
+        self._role_taxonomy_catalog = None
+        
+        # Normalized keyword vocabulary in DB2 (keywords.py), checked every keyword_vocabulary_ttl seconds
+        self.keyword_vocabulary_ttl = 300
+        self._keyword_vocabulary_ready = False
+        self._keyword_vocabulary_checked_at = None
+        
+        # Researcher-name typeahead over both databases (name_index.py), rebuilt hourly
+        self._name_index = NameIndexHolder(self._load_name_index, ttl=3600)
+        
+        # Offline centrality scores (graph_analytics.py) used as expert ranking features
+        self._person_scores = PersonScoresReader()
         
-    def ai_query(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Send query to LightLLM and get AI response"""
+        # LLM expert narratives of rank_mode="hybrid" calls, computed after the call returns
+        self._pending_rankings = PendingResults()
+        
+        # Labels, property fill rates and indexes of both databases (schema_service.py),
+        # introspected in the background and refreshed every 6 hours
+        self.schema_service = SchemaService(self._introspection_query)
+        
+    def _execute_query(self, db: str, query: str, params: Dict) -> list:
+        """Single attempt of a read query (the unit that gets retried)"""
+        driver = self.db1_driver if db == "db1" else self.db2_driver
+        with driver.session(database="neo4j") as session:
+            return list(session.run(query, **params))
+    
+    def _query(self, db: str, query_label: str, query: str, **params) -> list:
+        """Run a read query against db1/db2 and return its records (instrumented, retried)"""
+        with track_call(db, query_label):
+            return call_resilient(lambda: self._execute_query(db, query, params),
+                                  self.breakers[db], self.retry_policy)
+    
+    def _introspection_query(self, db: str, query_label: str, query: str, **params) -> list:
+        """
+        Schema introspection read: a single attempt on its own session, outside the
+        circuit breakers and recorded under "<db>_schema" rather than the user-facing
+        backends. SchemaService backs off on failure itself.
+        """
+        with track_call(f"{db}_schema", query_label):
+            return self._execute_query(db, query, params)
+    
+    def _execute_stream(self, db: str, query: str, params: Dict, fetch_size: int) -> Iterator[Dict]:
+        """Lazily yield records as dicts, fetching fetch_size records per round trip"""
+        driver = self.db1_driver if db == "db1" else self.db2_driver
+        with driver.session(database="neo4j", fetch_size=fetch_size) as session:
+            for record in session.run(query, **params):
+                yield record.data()
+    
+    def _stream_query(self, db: str, query_label: str, query: str,
+                      fetch_size: int = 1000, **params) -> Iterator[Dict]:
+        """
+        Streaming counterpart of _query for exports: memory stays flat in the result size.
+        Goes through the circuit breaker but is not retried, since a half-consumed
+        stream cannot be replayed transparently. A stream the consumer closes early
+        counts as a success, so a half-open probe is always released.
+        """
+        breaker = self.breakers[db]
+        breaker.before_call()
+        outcome_recorded = False
+        with track_call(db, query_label):
+            try:
+                yield from self._execute_stream(db, query, params, fetch_size)
+            except Exception as e:
+                outcome_recorded = True
+                if is_transient_error(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                raise
+            finally:
+                if not outcome_recorded:
+                    breaker.record_success()
+    
+    def role_taxonomy(self) -> RoleTaxonomy:
+        """
+        Role categories for DB2 relationship types: the Person->Thesis types of the
+        relationship catalog, else the live schema (cached for role_taxonomy_ttl seconds)
+        """
+        catalog = self._relationship_catalog.get()
+        if catalog is not None:
+            if self._role_taxonomy_catalog is not catalog:
+                self._role_taxonomy = RoleTaxonomy(catalog.types_between("Person", "Thesis") or
+                                                   catalog.rel_types())
+                self._role_taxonomy_catalog = catalog
+            return self._role_taxonomy
+        if (self._role_taxonomy is None or self._role_taxonomy_catalog is not None or 
+                time.monotonic() - self._role_taxonomy_loaded_at > self.role_taxonomy_ttl):
+            self._role_taxonomy = RoleTaxonomy.from_schema(
+                lambda query: self._query("db2", "relationship_types", query))
+            self._role_taxonomy_loaded_at = time.monotonic()
+            self._role_taxonomy_catalog = None
+        return self._role_taxonomy
+    
+    def keyword_vocabulary_ready(self) -> bool:
+        """Whether DB2 has the Keyword nodes built by keywords.py (cached for keyword_vocabulary_ttl seconds)"""
+        if (self._keyword_vocabulary_checked_at is None or
+                time.monotonic() - self._keyword_vocabulary_checked_at > self.keyword_vocabulary_ttl):
+            records = self._query("db2", "keyword_vocabulary", VOCABULARY_READY_QUERY)
+            self._keyword_vocabulary_ready = bool(records) and records[0]["version"] == VOCABULARY_VERSION
+            self._keyword_vocabulary_checked_at = time.monotonic()
+        return self._keyword_vocabulary_ready
+    
+    def _load_name_index(self) -> NameIndex:
+        return NameIndex.from_records(
+            [dict(record) for record in self._query("db1", "name_index", DB1_NAMES_QUERY)],
+            [dict(record) for record in self._query("db2", "name_index", DB2_NAMES_QUERY)])
+    
+    def name_index(self) -> NameIndex:
+        """Prefix index over researcher names from both databases"""
+        return self._name_index.get()
+    
+    def complete_name(self, prefix: str, k: int = 10) -> List[Dict]:
+        """Top-k researcher names starting with prefix (any word), with disambiguation hints"""
+        return self.name_index().complete(prefix, k)
+    
+    def _role_pattern(self, roles: Optional[List[str]]) -> str:
+        """Typed relationship expression for role categories ('' = any relationship)"""
+        return self.role_taxonomy().rel_pattern(roles) if roles else ""
+    
+    def schema(self, db: str):
+        """Cached schema snapshot of db1/db2, None until the first introspection finished"""
+        return self.schema_service.get(db)
+    
+    def _topic_predicate(self, db: str, alias: str, param: str = "topic",
+                         keys: Optional[List[str]] = None) -> str:
+        """
+        Substring match of $param against the topic properties of `alias`, leaving out
+        properties that never occur in the database and matching each one as the type
+        it is stored with (all properties, as documented, while the schema is unknown).
+        A property stored both as a string and as a list is matched per value.
+        """
+        label, properties = TOPIC_PROPERTIES[db]
+        if keys:
+            properties = {key: properties[key] for key in keys}
+        schema = self.schema(db)
+        clauses = []
+        for key in (schema.present(label, properties) if schema else properties):
+            kind = properties[key]
+            types = schema.property_types(label, key) if schema else []
+            if types:
+                arrays = [t.endswith("Array") for t in types]
+                kind = "list" if all(arrays) else ("mixed" if any(arrays) else "text")
+            list_match = f"any(item IN {alias}.{key} WHERE toLower(item) CONTAINS toLower(${param}))"
+            text_match = f"toLower({alias}.{key}) CONTAINS toLower(${param})"
+            if kind == "mixed":
+                clauses.append(f"CASE WHEN valueType({alias}.{key}) STARTS WITH 'LIST' "
+                               f"THEN {list_match} ELSE {text_match} END")
+            else:
+                clauses.append(list_match if kind == "list" else text_match)
+        return " OR\n              ".join(clauses) or "false"
+    
+    def _llm_post(self, payload: Dict) -> Dict:
+        """Single LLM completion request; raises LLMError on non-200 responses"""
         headers = {
             "Authorization": f"Bearer {self.llm_key}",
             "Content-Type": "application/json"
         }
+        response = requests.post(self.llm_url, headers=headers, json=payload, 
+                               timeout=30, verify=self.llm_verify_tls)
+        if response.status_code != 200:
+            retryable = response.status_code == 429 or response.status_code >= 500
+            raise LLMError(f"LLM returned HTTP {response.status_code}", 
+                           status_code=response.status_code, retryable=retryable)
+        return response.json()
+    
+    def ai_query(self, prompt: str, max_tokens: int = 1000, feature: str = "general",
+                 items: int = 1, allow_short: bool = True) -> str:
+        """
+        Send query to LightLLM and get AI response.
+        items: how many items the prompt asks answers for (sizes max_tokens per item).
+        allow_short=False refuses instead of sending a shortened call once the budget
+        is nearly used up (a shortened batch answer cannot be parsed).
+        Raises LLMError (or CircuitOpenError) when no answer can be produced.
+        """
+        decision = self.llm_budget.plan(feature, prompt, max_tokens, items)
+        if decision.cached_response is not None:
+            return decision.cached_response
+        if decision.mode == "exhausted" or (decision.mode == "short" and not allow_short):
+            LLM_REQUESTS.inc(feature=feature, outcome="budget_exhausted")
+            state = "used up" if decision.mode == "exhausted" else "nearly used up"
+            raise LLMBudgetExceeded(f"The LLM token budget for '{feature}' is {state} for this period")
+        
+        request_prompt = prompt
+        if decision.mode == "short":
+            request_prompt = prompt + "\n\nThe token budget is nearly used up: answer briefly, in at most 150 words."
         
         payload = {
             "model": self.llm_model,
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": request_prompt}],
+            "max_tokens": decision.max_tokens,
             "temperature": 0.3
         }
         
+        def attempt():
+            return hedged_call(lambda: self._llm_post(payload), self.llm_latency,
+                               self.llm_hedge_percentile)
+        
         try:
-            response = requests.post(self.llm_url, headers=headers, json=payload, 
-                                   timeout=30, verify=False)
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                return f"AI Error: {response.status_code}"
+            start = time.perf_counter()
+            with track_call("llm", feature):
+                result = call_resilient(attempt, self.breakers["llm"], self.retry_policy)
+            content = result['choices'][0]['message']['content']
+        except (LLMError, CircuitOpenError):
+            LLM_REQUESTS.inc(feature=feature, outcome="error")
+            raise
+        except (KeyError, IndexError, ValueError) as e:
+            LLM_REQUESTS.inc(feature=feature, outcome="error")
+            raise LLMError(f"Unexpected LLM response format: {e}")
         except Exception as e:
-            return f"AI Error: {e}"
+            LLM_REQUESTS.inc(feature=feature, outcome="error")
+            raise LLMError(f"LLM request failed: {e}") from e
+        
+        record_llm_usage(self.llm_model, result.get('usage'))
+        truncated = result['choices'][0].get('finish_reason') == "length"
+        self.llm_budget.record(feature, prompt, result.get('usage'),
+                               time.perf_counter() - start,
+                               content if decision.mode == "normal" else None,
+                               length_sample=decision.mode == "normal" and not truncated, items=items)
+        LLM_REQUESTS.inc(feature=feature, outcome="ok")
+        return content
+    
+    def _try_ai_query(self, prompt: str, max_tokens: int = 1000, 
+                      feature: str = "general") -> Tuple[Optional[str], Optional[str]]:
+        """ai_query for features: returns (analysis, None) or (None, error message)"""
+        try:
+            return self.ai_query(prompt, max_tokens=max_tokens, feature=feature), None
+        except (LLMError, CircuitOpenError) as e:
+            print(f"⚠️ AI analysis unavailable for {feature}: {e}")
+            return None, str(e)
     
+    def ai_query_batch(self, instructions: str, items: Dict[str, str], feature: str = "general",
+                       items_per_call: int = 10, max_tokens_per_item: int = 300,
+                       max_retries: int = 1) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        Answer many items with few LLM calls: items_per_call items share one prompt
+        and one copy of the instructions. Items that come back unparseable are split
+        into halves and retried; a single item is retried max_retries times. Once the
+        budget is nearly used up, batches fail instead of being sent shortened (the
+        answer would be cut off and every split retried).
+        Returns {item id: (answer, None) or (None, error message)}.
+        """
+        results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        queue = deque((ids, 0) for ids in chunk_ids(list(items), items_per_call))
+        
+        while queue:
+            ids, attempt = queue.popleft()
+            prompt = build_batch_prompt(instructions, {i: items[i] for i in ids}, retry=attempt > 0)
+            try:
+                # Own budget key, sized per item: single-item answer lengths must not size
+                # batch calls, and a batch is never sent shortened
+                text = self.ai_query(prompt, max_tokens=max_tokens_per_item * len(ids) + 100, 
+                                     feature=f"{feature}_batch", items=len(ids), allow_short=False)
+            except (LLMError, CircuitOpenError) as e:
+                print(f"⚠️ Batched AI analysis unavailable for {feature}: {e}")
+                results.update((i, (None, str(e))) for i in ids)
+                BATCH_ITEMS.inc(len(ids), feature=feature, outcome="error")
+                continue
+            
+            outputs, failed = parse_batch_response(text, ids)
+            results.update((i, (output, None)) for i, output in outputs.items())
+            BATCH_ITEMS.inc(len(outputs), feature=feature, outcome="ok")
+            if not failed:
+                continue
+            
+            if len(failed) > 1:
+                half = len(failed) // 2
+                queue.append((failed[:half], attempt + 1))
+                queue.append((failed[half:], attempt + 1))
+                BATCH_ITEMS.inc(len(failed), feature=feature, outcome="retried")
+            elif attempt < max_retries:
+                queue.append((failed, attempt + 1))
+                BATCH_ITEMS.inc(feature=feature, outcome="retried")
+            else:
+                results[failed[0]] = (None, "LLM answer for this item could not be parsed")
+                BATCH_ITEMS.inc(feature=feature, outcome="error")
+        
+        return results
+    
+    @track_feature("person_lookup")
     def lookup_person(self, name: str) -> Dict[str, Any]:
         """
         RESEARCHBOOK CORE FEATURE 1: Person Lookup
@@ -61,15 +363,27 @@ class ResearchBook:
         """
         print(f"🔍 Looking up: {name}")
         
+        # Ranked candidates from the fuzzy name index, then point reads by id;
+        # the CONTAINS scans remain for names the index cannot place. Only the
+        # exact (or, failing that, best-scoring) names are read; the rest are
+        # offered as suggestions rather than merged into one profile
+        candidates, suggestions = select_candidates(name, self.find_person_candidates(name))
+        db1_ids = [c["person_ids"]["db1"] for c in candidates if "db1" in c["person_ids"]]
+        db2_ids = [c["person_ids"]["db2"] for c in candidates if "db2" in c["person_ids"]]
+        
         # Database 1: Get researcher profile
-        db1_profile = self._get_researcher_profile_db1(name)
+        db1_profile = self._get_researcher_profile_db1(name, db1_ids or None)
         
         # Database 2: Get thesis involvement
-        db2_profile = self._get_thesis_activities_db2(name)
+        db2_profile = self._get_thesis_activities_db2(name, db2_ids or None)
         
         # Combine data
         combined_data = {
             "name": name,
+            "candidates": [{"name": c["name"], "hint": c["hint"], "similarity": c["similarity"]} 
+                           for c in candidates],
+            "did_you_mean": [{"name": c["name"], "hint": c["hint"], "similarity": c["similarity"]} 
+                             for c in suggestions],
             "found_in_db1": len(db1_profile) > 0,
             "found_in_db2": len(db2_profile) > 0,
             "researcher_data": db1_profile,
@@ -79,83 +393,138 @@ class ResearchBook:
         # Generate AI summary if we found data
         if combined_data["found_in_db1"] or combined_data["found_in_db2"]:
             ai_prompt = self._create_person_analysis_prompt(combined_data)
-            combined_data["ai_analysis"] = self.ai_query(ai_prompt)
+            combined_data["ai_analysis"], combined_data["ai_error"] = self._try_ai_query(
+                ai_prompt, feature="person_lookup")
         else:
             combined_data["ai_analysis"] = "Person not found in either database"
+            combined_data["ai_error"] = None
         
         return combined_data
     
-    def _get_researcher_profile_db1(self, name: str) -> List[Dict]:
-        """Get researcher data from Database 1"""
-        with self.db1_driver.session(database="neo4j") as session:
-            query = """
-            MATCH (p:Person)
-            WHERE toLower(p.name) CONTAINS toLower($name)
+    def find_person_candidates(self, name: str, k: int = 10) -> List[Dict]:
+        """Persons ranked by name similarity, with per-database ids ([] if the name index is unavailable)"""
+        try:
+            return self.name_index().fuzzy(name, k)
+        except Exception as e:
+            print(f"⚠️ Name index unavailable, falling back to a name scan: {e}")
+            return []
+    
+    def _get_researcher_profile_db1(self, name: str, person_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Get researcher data from Database 1 (by id when candidates are known, else by name scan)"""
+        # Matching persons with their precomputed summary properties (see person_summaries.py)
+        query = """
+        MATCH (p:Person)
+        WHERE %s
+        RETURN elementId(p) as id,
+               p.name as name,
+               p.orcid_id as orcid_id,
+               p.orcid_given_names as given_names,
+               p.orcid_family_name as family_name,
+               p.orcid_publication_count as pub_count,
+               p.summary_version as summary_version,
+               p.summary_dirty as summary_dirty,
+               p.summary_pub_count as summary_pub_count,
+               p.summary_first_pub_year as summary_first_pub_year,
+               p.summary_last_pub_year as summary_last_pub_year,
+               p.summary_top_keywords as summary_top_keywords,
+               p.summary_affiliations_json as summary_affiliations_json
+        LIMIT 10
+        """ % ("elementId(p) IN $ids" if person_ids else "toLower(p.name) CONTAINS toLower($name)")
+        
+        result = self._query("db1", "researcher_profile", query, name=name, ids=person_ids)
+        if person_ids:
+            rank = {person_id: i for i, person_id in enumerate(person_ids)}
+            result = sorted(result, key=lambda record: rank[record["id"]])
+        profiles = []
+        unsummarized = []
+        
+        for record in result:
+            if record["summary_version"] == SUMMARY_VERSION and not record["summary_dirty"]:
+                profiles.append(summary_to_profile(record))
+            else:
+                unsummarized.append(record["id"])
+        
+        if unsummarized:
+            profiles.extend(self._expand_researcher_profiles_db1(unsummarized))
+        
+        return profiles
+    
+    def _expand_researcher_profiles_db1(self, person_ids: List[str]) -> List[Dict]:
+        """Fallback for persons without a current summary: aggregate their neighbourhood"""
+        query = """
+        MATCH (p:Person)
+        WHERE elementId(p) IN $ids
+        CALL {
+            WITH p
             OPTIONAL MATCH (p)-[w:WORKED_AT]->(org:Organization)
-            OPTIONAL MATCH (p)-[auth:AUTHORED]->(pub:Publication)
-            RETURN p.name as name,
-                   p.orcid_id as orcid_id,
-                   p.orcid_given_names as given_names,
-                   p.orcid_family_name as family_name,
-                   p.orcid_publication_count as pub_count,
-                   collect(DISTINCT {
+            RETURN collect(DISTINCT {
                        organization: org.name,
                        role: w.role,
                        department: w.department,
                        start_year: w.start_year,
                        end_year: w.end_year
-                   }) as affiliations,
-                   count(DISTINCT pub) as total_publications
-            LIMIT 10
-            """
-            
-            result = session.run(query, name=name)
-            profiles = []
-            
-            for record in result:
-                profile = {
-                    "name": record["name"],
-                    "orcid_id": record["orcid_id"],
-                    "given_names": record["given_names"], 
-                    "family_name": record["family_name"],
-                    "orcid_publication_count": record["pub_count"],
-                    "total_publications": record["total_publications"],
-                    "affiliations": [aff for aff in record["affiliations"] if aff["organization"]]
-                }
-                profiles.append(profile)
-            
-            return profiles
-    
-    def _get_thesis_activities_db2(self, name: str) -> List[Dict]:
-        """Get thesis involvement from Database 2"""
-        with self.db2_driver.session(database="neo4j") as session:
-            query = """
-            MATCH (p:Person)-[r]->(t:Thesis)
-            WHERE toLower(p.name) CONTAINS toLower($name)
-            RETURN p.name as person_name,
-                   type(r) as relationship_type,
-                   t.title as thesis_title,
-                   t.type as thesis_type,
-                   t.keywords as keywords,
-                   t.abstract as abstract
-            LIMIT 20
-            """
-            
-            result = session.run(query, name=name)
-            activities = []
-            
-            for record in result:
-                activity = {
-                    "person_name": record["person_name"],
-                    "role": record["relationship_type"],
-                    "thesis_title": record["thesis_title"],
-                    "thesis_type": record["thesis_type"],
-                    "keywords": record["keywords"] or [],
-                    "abstract": record["abstract"] or ""
-                }
-                activities.append(activity)
-            
-            return activities
+                   }) as affiliations
+        }
+        CALL {
+            WITH p
+            OPTIONAL MATCH (p)-[:AUTHORED]->(pub:Publication)
+            RETURN count(pub) as total_publications
+        }
+        RETURN p.name as name,
+               p.orcid_id as orcid_id,
+               p.orcid_given_names as given_names,
+               p.orcid_family_name as family_name,
+               p.orcid_publication_count as pub_count,
+               affiliations,
+               total_publications
+        """
+        
+        result = self._query("db1", "researcher_profile_expand", query, ids=person_ids)
+        profiles = []
+        
+        for record in result:
+            profile = {
+                "name": record["name"],
+                "orcid_id": record["orcid_id"],
+                "given_names": record["given_names"], 
+                "family_name": record["family_name"],
+                "orcid_publication_count": record["pub_count"],
+                "total_publications": record["total_publications"],
+                "affiliations": [aff for aff in record["affiliations"] if aff["organization"]]
+            }
+            profiles.append(profile)
+        
+        return profiles
+    
+    def _get_thesis_activities_db2(self, name: str, person_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Get thesis involvement from Database 2 (by id when candidates are known, else by name scan)"""
+        query = """
+        MATCH (p:Person)-[r]->(t:Thesis)
+        WHERE %s
+        RETURN p.name as person_name,
+               type(r) as relationship_type,
+               t.title as thesis_title,
+               t.type as thesis_type,
+               t.keywords as keywords,
+               t.abstract as abstract
+        LIMIT 20
+        """ % ("elementId(p) IN $ids" if person_ids else "toLower(p.name) CONTAINS toLower($name)")
+        
+        result = self._query("db2", "thesis_activities", query, name=name, ids=person_ids)
+        activities = []
+        
+        for record in result:
+            activity = {
+                "person_name": record["person_name"],
+                "role": record["relationship_type"],
+                "thesis_title": record["thesis_title"],
+                "thesis_type": record["thesis_type"],
+                "keywords": record["keywords"] or [],
+                "abstract": record["abstract"] or ""
+            }
+            activities.append(activity)
+        
+        return activities
     
     def _create_person_analysis_prompt(self, person_data: Dict) -> str:
         """Create AI prompt for person analysis"""
@@ -182,109 +551,260 @@ class ResearchBook:
         
         return prompt
     
-    def find_expert(self, topic: str, limit: int = 10) -> Dict[str, Any]:
+    @track_feature("expert_finder")
+    def find_expert(self, topic: str, limit: int = 10, 
+                    roles: Optional[List[str]] = None, rank_mode: str = "ai") -> Dict[str, Any]:
         """
         RESEARCHBOOK CORE FEATURE 2: Expert Finder
-        Find experts on a topic across both databases with AI ranking
+        Find experts on a topic across both databases with AI ranking.
+        roles restricts DB2 matches to role categories, e.g. ["supervision"].
+        rank_mode: "ai" waits for the LLM ranking, "fast" ranks locally
+        (expert_ranking.py) without the LLM, "hybrid" ranks locally and returns
+        an ai_ranking_id to fetch the LLM narrative from with expert_ai_ranking.
+        Returns the first page of `limit` experts; pass next_cursor to 
+        find_expert_page for more (later pages never go through the LLM, but
+        are fast-ranked within the page for "fast" and "hybrid").
         """
+        if rank_mode not in RANK_MODES:
+            raise ValueError(f"rank_mode must be one of {', '.join(RANK_MODES)}")
         print(f"🎯 Finding experts on: {topic}")
         
-        # Search Database 1
-        db1_experts = self._search_experts_db1(topic, limit)
-        
-        # Search Database 2  
-        db2_experts = self._search_experts_db2(topic, limit)
-        
-        # Combine and deduplicate
-        all_experts = self._merge_expert_results(db1_experts, db2_experts)
-        
-        # AI ranking and analysis
-        if all_experts:
-            ranking_prompt = self._create_expert_ranking_prompt(topic, all_experts)
-            ai_ranking = self.ai_query(ranking_prompt, max_tokens=1500)
-        else:
-            ai_ranking = f"No experts found for topic: {topic}"
+        # First page from both databases, merged in keyset order
+        page = self._expert_page(topic, limit, roles, None, rank_mode)
+        all_experts = page["experts"]
         
         return {
             "topic": topic,
+            "roles": roles,
             "experts_found": len(all_experts),
-            "db1_matches": len(db1_experts),
-            "db2_matches": len(db2_experts),
+            "db1_matches": page["db1_matches"],
+            "db2_matches": page["db2_matches"],
             "expert_list": all_experts,
-            "ai_ranking": ai_ranking
+            "next_cursor": page["next_cursor"],
+            "rank_mode": rank_mode,
+            **self._expert_narrative(topic, all_experts, rank_mode)
         }
     
-    def _search_experts_db1(self, topic: str, limit: int) -> List[Dict]:
-        """Search for experts in Database 1"""
-        with self.db1_driver.session(database="neo4j") as session:
-            # Search in publication keywords and abstracts
-            query = """
-            MATCH (p:Person)-[auth:AUTHORED]->(pub:Publication)
-            WHERE toLower(pub.keywords) CONTAINS toLower($topic) OR
-                  toLower(pub.abstract) CONTAINS toLower($topic) OR
-                  toLower(pub.title) CONTAINS toLower($topic)
-            WITH p, count(pub) as relevant_pubs, collect(pub.title)[..3] as sample_pubs
-            MATCH (p)-[w:WORKED_AT]->(org:Organization)
-            RETURN p.name as name,
-                   p.orcid_id as orcid_id,
-                   relevant_pubs,
-                   sample_pubs,
-                   collect(DISTINCT org.name)[..2] as organizations,
-                   collect(DISTINCT w.department)[..2] as departments
-            ORDER BY relevant_pubs DESC
-            LIMIT $limit
-            """
-            
-            result = session.run(query, topic=topic, limit=limit)
-            experts = []
-            
-            for record in result:
-                expert = {
-                    "name": record["name"],
-                    "orcid_id": record["orcid_id"],
-                    "relevant_publications": record["relevant_pubs"],
-                    "sample_publications": record["sample_pubs"],
-                    "organizations": record["organizations"],
-                    "departments": record["departments"],
-                    "source": "database_1"
-                }
-                experts.append(expert)
-            
-            return experts
-    
-    def _search_experts_db2(self, topic: str, limit: int) -> List[Dict]:
-        """Search for experts in Database 2"""
-        with self.db2_driver.session(database="neo4j") as session:
-            # Search thesis titles, keywords, abstracts
-            query = """
-            MATCH (p:Person)-[r]->(t:Thesis)
-            WHERE toLower(t.title) CONTAINS toLower($topic) OR
-                  any(keyword IN t.keywords WHERE toLower(keyword) CONTAINS toLower($topic)) OR
-                  toLower(t.abstract) CONTAINS toLower($topic)
-            WITH p, type(r) as role_type, count(t) as relevant_theses, 
-                 collect(t.title)[..3] as sample_theses
-            RETURN p.name as name,
-                   collect(DISTINCT role_type) as roles,
-                   relevant_theses,
-                   sample_theses
-            ORDER BY relevant_theses DESC
-            LIMIT $limit
-            """
-            
-            result = session.run(query, topic=topic, limit=limit)
-            experts = []
-            
-            for record in result:
-                expert = {
-                    "name": record["name"],
-                    "roles": record["roles"],
-                    "relevant_theses": record["relevant_theses"],
-                    "sample_theses": record["sample_theses"],
-                    "source": "database_2"
-                }
-                experts.append(expert)
-            
-            return experts
+    def _expert_narrative(self, topic: str, experts: List[Dict], rank_mode: str) -> Dict[str, Any]:
+        """AI ranking fields of a find_expert result: none (fast), inline (ai) or pending by id (hybrid)"""
+        if rank_mode == "fast" or (rank_mode == "hybrid" and not experts):
+            return {"ai_ranking": None, "ai_error": None}
+        if rank_mode == "hybrid":
+            ranking_id = self._pending_rankings.submit(self._ai_rank_experts, topic, experts)
+            return {"ai_ranking": None, "ai_error": None, "ai_ranking_id": ranking_id}
+        ai_ranking, ai_error = self._ai_rank_experts(topic, experts)
+        return {"ai_ranking": ai_ranking, "ai_error": ai_error}
+    
+    def expert_ai_ranking(self, ranking_id: str, timeout: float = 0.0) -> Dict[str, Any]:
+        """
+        LLM narrative of a rank_mode="hybrid" find_expert call, waiting up to
+        timeout seconds: status "done", "pending" or "unknown" (expired or never issued)
+        """
+        future = self._pending_rankings.get(ranking_id)
+        if future is None:
+            return {"status": "unknown", "error": f"Unknown or expired ranking id {ranking_id}"}
+        try:
+            ai_ranking, ai_error = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return {"status": "pending"}
+        except Exception as e:
+            ai_ranking, ai_error = None, f"{type(e).__name__}: {e}"
+        return {"status": "done", "ai_ranking": ai_ranking, "ai_error": ai_error}
+    
+    def _ai_rank_experts(self, topic: str, experts: List[Dict]) -> Tuple[Optional[str], Optional[str]]:
+        """(AI ranking text, error) for an expert list"""
+        if not experts:
+            return f"No experts found for topic: {topic}", None
+        ranking_prompt = self._create_expert_ranking_prompt(topic, experts)
+        return self._try_ai_query(ranking_prompt, max_tokens=1500, feature="expert_finder")
+    
+    def find_expert_page(self, topic: str, cursor: str, limit: int = 10,
+                         roles: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Next page of experts after `cursor` (no AI ranking). Cursors of fast and
+        hybrid searches carry their rank mode, and those pages are fast-ranked too.
+        A person already shown on an earlier page is left out, even when this page
+        has their matches from the other database.
+        """
+        return self._expert_page(topic, limit, roles, cursor)
+    
+    def _expert_page(self, topic: str, limit: int, roles: Optional[List[str]], 
+                     cursor: Optional[str], rank_mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of experts, merged from both databases.
+        Each database is read in (score DESC, id ASC) keyset order after its own
+        position in the cursor; the merged page consumes a prefix of each source.
+        With rank_mode "fast"/"hybrid" (or a cursor issued for one) the page is
+        then ordered by fast_rank; pages are ranked one at a time, so experts
+        already shown are never reordered.
+        """
+        fingerprint = query_fingerprint("experts", topic.strip().lower(), sorted(roles or []))
+        if cursor:
+            state = decode_cursor(cursor, fingerprint)
+        else:
+            state = {"q": fingerprint, "rank": rank_mode, "db1": {"after": None, "done": False}, 
+                     "db2": {"after": None, "done": False}}
+        rank_mode = state.get("rank")
+        
+        db1_rows = [] if state["db1"]["done"] else self._search_experts_db1(
+            topic, limit, state["db1"]["after"])
+        db2_rows = [] if state["db2"]["done"] else self._search_experts_db2(
+            topic, limit, roles, state["db2"]["after"])
+        
+        # Same weighting as _merge_expert_results (theses count half)
+        candidates = ([(e["relevant_publications"], "db1", e) for e in db1_rows] +
+                      [(e["relevant_theses"] * 0.5, "db2", e) for e in db2_rows])
+        candidates.sort(key=lambda c: (-c[0], c[1], c[2]["person_id"]))
+        page = candidates[:limit]
+        db1_taken = sum(1 for c in page if c[1] == "db1")
+        db2_taken = len(page) - db1_taken
+        
+        state["db1"] = advance(db1_rows, db1_taken, limit, "relevant_publications", 
+                               "person_id", state["db1"]["after"])
+        state["db2"] = advance(db2_rows, db2_taken, limit, "relevant_theses", 
+                               "person_id", state["db2"]["after"])
+        exhausted = state["db1"]["done"] and state["db2"]["done"]
+        experts = self._merge_expert_results(db1_rows[:db1_taken], db2_rows[:db2_taken])
+        
+        # The other database's stream can bring a name back on a later page: the cursor
+        # carries short digests of the names already emitted
+        seen = set(state.get("seen", []))
+        experts = [e for e in experts if _name_digest(e["name"]) not in seen]
+        state["seen"] = sorted(seen | {_name_digest(e["name"]) for e in experts})
+        if rank_mode in ("fast", "hybrid"):
+            experts = fast_rank(experts)
+        
+        return {
+            "experts": experts,
+            "db1_matches": db1_taken,
+            "db2_matches": db2_taken,
+            "next_cursor": None if exhausted else encode_cursor(state)
+        }
+    
+    def _search_experts_db1(self, topic: str, limit: int, after: Optional[List] = None) -> List[Dict]:
+        """Search for experts in Database 1 (keyset page after [score, id])"""
+        # Search in publication keywords and abstracts
+        query = """
+        MATCH (p:Person)-[auth:AUTHORED]->(pub:Publication)
+        WHERE %s
+        WITH p, count(pub) as relevant_pubs, collect(pub.title)[..3] as sample_pubs,
+             max(coalesce(pub.year, pub.publication_year)) as last_year
+        WITH p, relevant_pubs, sample_pubs, last_year, elementId(p) as person_id
+        WHERE %s
+        MATCH (p)-[w:WORKED_AT]->(org:Organization)
+        RETURN person_id,
+               p.name as name,
+               p.orcid_id as orcid_id,
+               relevant_pubs,
+               sample_pubs,
+               last_year,
+               p.summary_first_pub_year as first_year,
+               p.summary_pub_count as total_publications,
+               collect(DISTINCT org.name)[..2] as organizations,
+               collect(DISTINCT w.department)[..2] as departments
+        ORDER BY relevant_pubs DESC, person_id ASC
+        LIMIT $limit
+        """ % (self._topic_predicate("db1", "pub"), keyset_where("relevant_pubs", "person_id"))
+        
+        result = self._query("db1", "search_experts", query, topic=topic, limit=limit,
+                             **keyset_params(after))
+        experts = []
+        
+        for record in result:
+            expert = {
+                "person_id": record["person_id"],
+                "name": record["name"],
+                "orcid_id": record["orcid_id"],
+                "relevant_publications": record["relevant_pubs"],
+                "sample_publications": record["sample_pubs"],
+                "organizations": record["organizations"],
+                "departments": record["departments"],
+                "last_publication_year": record["last_year"],
+                "first_publication_year": record["first_year"],
+                "total_publications": record["total_publications"],
+                "source": "database_1"
+            }
+            experts.append(expert)
+        
+        return experts
+    
+    def _search_experts_db2(self, topic: str, limit: int, roles: Optional[List[str]] = None,
+                            after: Optional[List] = None) -> List[Dict]:
+        """Search for experts in Database 2 (keyset page after [score, id])"""
+        # Search thesis titles, keywords, abstracts
+        query = """
+        MATCH (p:Person)-[r%s]->(t:Thesis)
+        WHERE %s
+        WITH p, collect(DISTINCT type(r)) as roles, count(t) as relevant_theses, 
+             collect(t.title)[..3] as sample_theses,
+             min(t.created_date.year) as first_year, max(t.created_date.year) as last_year
+        WITH p, roles, relevant_theses, sample_theses, first_year, last_year, elementId(p) as person_id
+        WHERE %s
+        RETURN person_id,
+               p.name as name,
+               roles,
+               relevant_theses,
+               sample_theses,
+               first_year,
+               last_year
+        ORDER BY relevant_theses DESC, person_id ASC
+        LIMIT $limit
+        """ % (self._role_pattern(roles), self._topic_predicate("db2", "t"),
+               keyset_where("relevant_theses", "person_id"))
+        
+        result = self._query("db2", "search_experts", query, topic=topic, limit=limit,
+                             **keyset_params(after))
+        experts = []
+        
+        for record in result:
+            expert = {
+                "person_id": record["person_id"],
+                "name": record["name"],
+                "roles": record["roles"],
+                "relevant_theses": record["relevant_theses"],
+                "sample_theses": record["sample_theses"],
+                "first_thesis_year": record["first_year"],
+                "last_thesis_year": record["last_year"],
+                "source": "database_2"
+            }
+            experts.append(expert)
+        
+        return experts
+    
+    def stream_experts(self, topic: str, roles: Optional[List[str]] = None,
+                       fetch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Every expert on a topic, DB1 then DB2, yielded lazily for exports.
+        Same matching as find_expert, without the LIMIT, merging or AI ranking.
+        """
+        db1_query = """
+        MATCH (p:Person)-[auth:AUTHORED]->(pub:Publication)
+        WHERE %s
+        WITH p, count(pub) as relevant_pubs
+        OPTIONAL MATCH (p)-[w:WORKED_AT]->(org:Organization)
+        RETURN p.name as name,
+               p.orcid_id as orcid_id,
+               relevant_pubs as relevant_publications,
+               collect(DISTINCT org.name) as organizations
+        ORDER BY relevant_publications DESC
+        """ % self._topic_predicate("db1", "pub")
+        for record in self._stream_query("db1", "stream_experts", db1_query, 
+                                         fetch_size=fetch_size, topic=topic):
+            record["source"] = "database_1"
+            yield record
+        
+        db2_query = """
+        MATCH (p:Person)-[r%s]->(t:Thesis)
+        WHERE %s
+        RETURN p.name as name,
+               collect(DISTINCT type(r)) as roles,
+               count(t) as relevant_theses
+        ORDER BY relevant_theses DESC
+        """ % (self._role_pattern(roles), self._topic_predicate("db2", "t"))
+        for record in self._stream_query("db2", "stream_experts", db2_query, 
+                                         fetch_size=fetch_size, topic=topic):
+            record["source"] = "database_2"
+            yield record
     
     def _merge_expert_results(self, db1_experts: List[Dict], db2_experts: List[Dict]) -> List[Dict]:
         """Merge and deduplicate expert results from both databases"""
@@ -304,14 +824,25 @@ class ResearchBook:
                 merged[name]["thesis_roles"] = expert["roles"]
                 merged[name]["relevant_theses"] = expert["relevant_theses"]
                 merged[name]["sample_theses"] = expert["sample_theses"]
+                merged[name]["first_thesis_year"] = expert["first_thesis_year"]
+                merged[name]["last_thesis_year"] = expert["last_thesis_year"]
                 merged[name]["combined_score"] += expert["relevant_theses"] * 0.5  # Weight theses lower
                 merged[name]["source"] = "both_databases"
             else:
                 expert["combined_score"] = expert["relevant_theses"] * 0.5
                 merged[name] = expert
         
-        # Sort by combined score
-        return sorted(merged.values(), key=lambda x: x["combined_score"], reverse=True)
+        # Re-rank by match score times graph centrality, when the scores have been computed
+        scores = self._person_scores.get()
+        if scores is None:
+            return sorted(merged.values(), key=lambda x: x["combined_score"], reverse=True)
+        for expert in merged.values():
+            db = "db2" if expert["source"] == "database_2" else "db1"
+            features = scores.lookup(db, expert["person_id"])
+            centrality = scores.centrality(features)
+            expert["graph_features"] = features
+            expert["rank_score"] = round(expert["combined_score"] * (0.5 + centrality), 4)
+        return sorted(merged.values(), key=lambda x: (x["rank_score"], x["combined_score"]), reverse=True)
     
     def _create_expert_ranking_prompt(self, topic: str, experts: List[Dict]) -> str:
         """Create AI prompt for expert ranking"""
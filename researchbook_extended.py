@@ -31,7 +31,7 @@ class ResearchBookExtended(ResearchBook):
             collaboration_data, trends_data
         )
         
-        ai_brief = self.ai_query(brief_prompt, max_tokens=2000)
+        ai_brief, ai_error = self._try_ai_query(brief_prompt, max_tokens=2000, feature="field_brief")
         
         return {
             "field": research_field,
@@ -40,7 +40,8 @@ class ResearchBookExtended(ResearchBook):
             "total_unique_researchers": len(set([r["name"] for r in db1_researchers + db2_researchers])),
             "collaboration_networks": collaboration_data,
             "trends": trends_data,
-            "ai_intelligence_brief": ai_brief
+            "ai_intelligence_brief": ai_brief,
+            "ai_error": ai_error
         }
     
     def _get_field_researchers_db1(self, field: str) -> list:
@@ -185,14 +186,16 @@ class ResearchBookExtended(ResearchBook):
         
         # Generate AI matching analysis
         matching_prompt = self._create_matching_prompt(target_profile, matches, match_type)
-        ai_analysis = self.ai_query(matching_prompt, max_tokens=1500)
+        ai_analysis, ai_error = self._try_ai_query(matching_prompt, max_tokens=1500, 
+                                                   feature="researcher_matching")
         
         return {
             "target_researcher": researcher_name,
             "match_type": match_type,
             "potential_matches": len(matches),
             "matches": matches,
-            "ai_matching_analysis": ai_analysis
+            "ai_matching_analysis": ai_analysis,
+            "ai_error": ai_error
         }
     
     def _find_collaboration_matches(self, target_profile: dict) -> list:
@@ -228,20 +231,23 @@ class ResearchBookExtended(ResearchBook):
             return [dict(record) for record in result]
     
     def _find_supervision_matches(self, target_profile: dict) -> list:
-        """Find supervision matches (supervisors for students or students for supervisors)"""
-        with self.db2_driver.session(database="neo4j") as session:
-            query = """
-            MATCH (p:Person)-[r:SUPERVISOR]->(t:Thesis)
-            WHERE p.name <> $target_name
-            WITH p, count(t) as supervised_count,
-                 collect(DISTINCT t.title)[..2] as sample_theses
-            RETURN p.name as name, supervised_count, sample_theses
-            ORDER BY supervised_count DESC
-            LIMIT 10
-            """
-            
-            result = session.run(query, target_name=target_profile["name"])
-            return [dict(record) for record in result]
+        """
+        Find supervision matches (supervisors for students or students for supervisors).
+        Only the SUPERVISOR type counts here, not the whole "supervision" role
+        category, which also holds company and industrial supervisors.
+        """
+        query = """
+        MATCH (p:Person)-[r:SUPERVISOR]->(t:Thesis)
+        WHERE p.name <> $target_name
+        WITH p, count(t) as supervised_count,
+             collect(DISTINCT t.title)[..2] as sample_theses
+        RETURN p.name as name, supervised_count, sample_theses
+        ORDER BY supervised_count DESC
+        LIMIT 10
+        """
+        
+        result = self._query("db2", "supervision_matches", query, target_name=target_profile["name"])
+        return [dict(record) for record in result]
     
     def _find_expertise_matches(self, target_profile: dict) -> list:
         """Find researchers with similar expertise"""
@@ -4,22 +4,251 @@ ResearchBook - Final Working Version
 Optimized queries to avoid memory issues
 """
 
-from researchbook import ResearchBook
+import config
+from researchbook import TOPIC_PROPERTIES, ResearchBook
+from metrics import track_feature
+from singleflight import coalesce_calls
+from trend_cube import TrendCubeReader
+from keywords import normalize_keyword
+from ego_network import DEFAULT_MAX_NODES, EgoNetworkCache, build_ego_network
+from genealogy import Genealogy
+from name_index import select_candidates
+from graph_store import DEFAULT_VISIT_CAP, GraphStoreReader
+from graph_analytics import topic_experts
+from expert_ranking import RANK_MODES
+from analyze_coverage import CoverageStatsReader
+from pagination import advance, decode_cursor, encode_cursor, keyset_params, keyset_where, query_fingerprint
 import json
 
+# Matching publications (DB1) and theses (DB2) that seed a topic PageRank, per database
+TOPIC_SEED_LIMIT = 5000
+
+def lucene_phrase(text: str) -> str:
+    """text as one quoted phrase for a fulltext index query"""
+    return '"%s"' % text.replace("\\", "\\\\").replace('"', '\\"')
+
 class ResearchBookFinal(ResearchBook):
     
-    def generate_field_brief(self, research_field: str) -> dict:
+    # Identical concurrent requests (e.g. a newsletter link hitting many sessions of
+    # the shared @st.cache_resource instance) share one backend computation
+    @coalesce_calls
+    def lookup_person(self, name: str) -> dict:
+        return super().lookup_person(name)
+    
+    @coalesce_calls
+    def find_expert(self, topic: str, limit: int = 10, roles: list = None, scoring: str = "match",
+                    rank_mode: str = "ai") -> dict:
+        """
+        scoring="match" ranks by matching publications/theses (pageable);
+        scoring="pagerank" ranks by topic-personalized PageRank on the graph store.
+        rank_mode picks how the LLM narrative is produced (see ResearchBook.find_expert).
+        """
+        if scoring == "pagerank":
+            return self._find_expert_pagerank(topic, limit, roles, rank_mode)
+        if scoring != "match":
+            raise ValueError("scoring must be 'match' or 'pagerank'")
+        return super().find_expert(topic, limit, roles, rank_mode)
+    
+    @track_feature("expert_finder_pagerank")
+    def _find_expert_pagerank(self, topic: str, limit: int, roles: list = None, rank_mode: str = "ai") -> dict:
+        """
+        Experts central to the topic's own subgraph: the matching publications
+        and theses seed a local personalized PageRank (graph_analytics.py), and
+        every expert lists the items their score came through
+        """
+        if rank_mode not in RANK_MODES:
+            raise ValueError(f"rank_mode must be one of {', '.join(RANK_MODES)}")
+        store = self._graph_store()
+        if store is None:
+            return {"error": "Graph store not built yet (run python graph_store.py)"}
+        print(f"🎯 Finding experts on: {topic} (topic PageRank)")
+        
+        db1_query = """
+        %s
+        RETURN elementId(pub) as item_id
+        LIMIT $limit
+        """ % self._publication_seed_clause()
+        db2_query = """
+        %s
+        MATCH (:Person)-[%s]->(t)
+        RETURN DISTINCT elementId(t) as item_id
+        LIMIT $limit
+        """ % (self._field_theses_clause(), self._role_pattern(roles))
+        seed_keys = [f"db1:{r['item_id']}" for r in self._query(
+            "db1", "expert_seeds", db1_query, topic=topic, phrase=lucene_phrase(topic),
+            limit=TOPIC_SEED_LIMIT)]
+        seed_keys += [f"db2:{r['item_id']}" for r in self._query(
+            "db2", "expert_seeds", db2_query, field=topic, canonical=normalize_keyword(topic),
+            limit=TOPIC_SEED_LIMIT)]
+        
+        ranked = topic_experts(store, seed_keys, k=limit)
+        experts = ranked["experts"]
+        return {
+            "topic": topic,
+            "roles": roles,
+            "scoring": "pagerank",
+            "experts_found": len(experts),
+            "db1_matches": sum(1 for e in experts if e["source"] != "database_2"),
+            "db2_matches": sum(1 for e in experts if e["source"] != "database_1"),
+            "expert_list": experts,
+            "next_cursor": None,
+            "seed_items": ranked["seeds"],
+            "pagerank_stats": {key: ranked[key] for key in ("pushes", "touched", "converged")},
+            "rank_mode": rank_mode,
+            **self._expert_narrative(topic, experts, rank_mode)
+        }
+    
+    def _publication_seed_clause(self) -> str:
+        """
+        Clause binding pub to the publications of $topic: the substring scan, or with
+        config.FULLTEXT_TOPIC_SEEDS a fulltext index lookup of the phrase ($phrase)
+        when DB1 has an index over every topic property the scan would read. The
+        index matches analyzed tokens, not substrings, so it yields different seeds
+        (and rankings) than the scan, which is why it is opt-in.
+        """
+        schema = self.schema("db1") if config.FULLTEXT_TOPIC_SEEDS else None
+        label, properties = TOPIC_PROPERTIES["db1"]
+        index = schema.find_index(label, schema.present(label, properties), "FULLTEXT") if schema else None
+        if index:
+            return "CALL db.index.fulltext.queryNodes('%s', $phrase) YIELD node as pub" % index
+        return """MATCH (pub:Publication)
+        WHERE %s""" % self._topic_predicate("db1", "pub")
+    
+    @coalesce_calls
+    @track_feature("ego_network")
+    def ego_network(self, name: str, hops: int = 1, max_nodes: int = DEFAULT_MAX_NODES) -> dict:
+        """
+        Co-author and thesis network around the best name match for `name`,
+        with server-side layout (see ego_network.py); cached per person and size
+        """
+        candidates = self.find_person_candidates(name, k=1)
+        if not candidates:
+            return {"error": f"No researcher found matching {name}"}
+        center = candidates[0]
+        
+        cache = self.__dict__.get("_ego_network_cache")
+        if cache is None:
+            cache = self.__dict__.setdefault("_ego_network_cache", EgoNetworkCache())
+        key = (tuple(sorted(center["person_ids"].items())), hops, max_nodes)
+        network = cache.get(key)
+        if network is None:
+            print(f"🕸️ Building ego network for: {center['name']}")
+            network = build_ego_network(self, center, hops, max_nodes)
+            cache.put(key, network)
+        return network
+    
+    def _graph_store(self):
+        reader = self.__dict__.get("_graph_store_reader")
+        if reader is None:
+            reader = self.__dict__.setdefault("_graph_store_reader", GraphStoreReader())
+        return reader.get()
+    
+    @track_feature("connection_paths")
+    def connection_paths(self, name_a: str, name_b: str, k: int = 3,
+                         visit_cap: int = DEFAULT_VISIT_CAP) -> dict:
+        """
+        How two researchers are connected: up to k shortest paths through
+        co-authorship, shared organizations and thesis roles (see graph_store.py)
+        """
+        store = self._graph_store()
+        if store is None:
+            return {"error": "Graph store not built yet (run python graph_store.py)"}
+        
+        ends = []
+        for name in (name_a, name_b):
+            candidates = self.find_person_candidates(name, k=1)
+            if not candidates:
+                return {"error": f"No researcher found matching {name}"}
+            ids = candidates[0]["person_ids"]
+            key = f"db1:{ids['db1']}" if "db1" in ids else f"db2:{ids['db2']}"
+            if key not in store.key_index:
+                return {"error": f"{candidates[0]['name']} is not in the graph store yet"}
+            ends.append((candidates[0]["name"], store.key_index[key]))
+        
+        (person_a, source), (person_b, target) = ends
+        result = store.shortest_paths(source, target, k=k, visit_cap=visit_cap)
+        return {
+            "person_a": person_a,
+            "person_b": person_b,
+            "paths": [store.explain(path) for path in result["paths"]],
+            "visited": result["visited"],
+            "capped": result["capped"]
+        }
+    
+    def coverage_stats(self) -> dict:
+        """Latest coverage counters of both databases (see analyze_coverage.py), None if never computed"""
+        reader = self.__dict__.get("_coverage_stats_reader")
+        if reader is None:
+            reader = self.__dict__.setdefault("_coverage_stats_reader", CoverageStatsReader())
+        return reader.get()
+    
+    def _genealogy_person(self, name: str) -> dict:
+        """
+        {"id", "name"} of the DB2 person a name means: the one exact normalized-name
+        match, else the best-scoring candidate, with a DB2 id. Otherwise an error
+        with the candidates to choose from (did_you_mean).
+        """
+        candidates = self.find_person_candidates(name, k=5)
+        if candidates:
+            selected, others = select_candidates(name, candidates)
+            in_theses = [c for c in selected if "db2" in c["person_ids"]]
+            if len(in_theses) == 1:
+                return {"id": in_theses[0]["person_ids"]["db2"], "name": in_theses[0]["name"]}
+            alternatives = in_theses or [c for c in others if "db2" in c["person_ids"]]
+            error = (f"Several researchers match {name}" if len(in_theses) > 1 else
+                     f"No researcher in the thesis database matching {name}")
+            return {"error": error, "did_you_mean": [{"name": c["name"], "hint": c["hint"]}
+                                                      for c in alternatives]}
+        # No name index: exact names in the genealogy itself
+        ids = Genealogy().person_ids(name)
+        if len(ids) == 1:
+            return {"id": ids[0], "name": name}
+        return {"error": f"Several researchers are named {name}" if ids else f"No researcher found matching {name}",
+                "did_you_mean": []}
+    
+    @track_feature("academic_lineage")
+    def academic_lineage(self, name: str, direction: str = "descendants", max_depth: int = None) -> dict:
+        """Academic ancestors or descendants from the genealogy closure table (see genealogy.py)"""
+        genealogy = Genealogy()
+        if direction not in ("ancestors", "descendants"):
+            raise ValueError("direction must be 'ancestors' or 'descendants'")
+        if not genealogy.available():
+            return {"error": "Genealogy not built yet (run python genealogy.py)"}
+        person = self._genealogy_person(name)
+        if "error" in person:
+            return person
+        lineage = getattr(genealogy, direction)(person["id"], max_depth)
+        return {"person": person["name"], "direction": direction, "people": lineage,
+                "max_depth": max((p["depth"] for p in lineage), default=0)}
+    
+    @track_feature("academic_lineage")
+    def common_academic_ancestor(self, name_a: str, name_b: str) -> dict:
+        """Closest shared academic ancestors of two researchers"""
+        genealogy = Genealogy()
+        if not genealogy.available():
+            return {"error": "Genealogy not built yet (run python genealogy.py)"}
+        person_a, person_b = self._genealogy_person(name_a), self._genealogy_person(name_b)
+        for person in (person_a, person_b):
+            if "error" in person:
+                return person
+        common = genealogy.common_ancestors(person_a["id"], person_b["id"])
+        return {"person_a": person_a["name"], "person_b": person_b["name"], "common_ancestors": common,
+                "closest": common[0] if common else None}
+    
+    @coalesce_calls
+    @track_feature("field_brief")
+    def generate_field_brief(self, research_field: str, roles: list = None) -> dict:
         """
         RESEARCHBOOK CORE FEATURE 3: Field Intelligence Brief (Optimized)
         """
         print(f"📊 Generating field brief for: {research_field}")
         
-        # Get researchers from DB2 (more reliable)
-        db2_researchers = self._get_field_researchers_db2(research_field)
+        # Get researchers from DB2 (more reliable); further pages via field_researchers_page
+        page = self.field_researchers_page(research_field, roles=roles)
+        db2_researchers = page["researchers"]
         
         # Get recent activity trends
-        trends_data = self._get_field_trends(research_field)
+        trends_data = self._get_field_trends(research_field, roles)
         
         # Generate AI intelligence brief
         brief_prompt = f"""
@@ -42,101 +271,167 @@ class ResearchBookFinal(ResearchBook):
         Keep response comprehensive but under 1000 words.
         """
         
-        ai_brief = self.ai_query(brief_prompt, max_tokens=1500)
+        ai_brief, ai_error = self._try_ai_query(brief_prompt, max_tokens=1500, feature="field_brief")
         
         return {
             "field": research_field,
             "researchers_found": len(db2_researchers),
+            "researchers": db2_researchers,
+            "next_cursor": page["next_cursor"],
             "trends": trends_data,
-            "ai_intelligence_brief": ai_brief
+            "ai_intelligence_brief": ai_brief,
+            "ai_error": ai_error
+        }
+    
+    def field_researchers_page(self, research_field: str, cursor: str = None, 
+                               limit: int = 15, roles: list = None) -> dict:
+        """Researchers in a field, one keyset page at a time (no AI brief)"""
+        fingerprint = query_fingerprint("field", research_field.strip().lower(), sorted(roles or []))
+        after = decode_cursor(cursor, fingerprint)["after"] if cursor else None
+        
+        researchers = self._get_field_researchers_db2(research_field, roles, limit, after)
+        position = advance(researchers, len(researchers), limit, "thesis_count", "person_id", after)
+        
+        return {
+            "field": research_field,
+            "researchers": researchers,
+            "next_cursor": None if position["done"] else encode_cursor(
+                {"q": fingerprint, "after": position["after"]})
         }
     
-    def _get_field_researchers_db2(self, field: str) -> list:
-        """Get researchers in field from DB2 - optimized query"""
-        with self.db2_driver.session(database="neo4j") as session:
-            query = """
-            MATCH (p:Person)-[r]->(t:Thesis)
-            WHERE toLower(t.title) CONTAINS toLower($field) OR
-                  any(keyword IN t.keywords WHERE toLower(keyword) CONTAINS toLower($field))
-            WITH p, type(r) as role, count(t) as thesis_count,
-                 collect(t.title)[..2] as sample_titles
-            RETURN p.name as name,
-                   collect(DISTINCT role) as thesis_roles,
-                   thesis_count,
-                   sample_titles
-            ORDER BY thesis_count DESC
-            LIMIT 15
-            """
-            
-            result = session.run(query, field=field)
-            return [dict(record) for record in result]
-    
-    def _get_field_trends(self, field: str) -> dict:
-        """Get recent trends - optimized"""
-        with self.db2_driver.session(database="neo4j") as session:
-            query = """
-            MATCH (t:Thesis)
-            WHERE toLower(t.title) CONTAINS toLower($field) OR
-                  any(keyword IN t.keywords WHERE toLower(keyword) CONTAINS toLower($field))
-            WITH t.created_date.year as year, count(t) as count
-            WHERE year >= 2020 AND year IS NOT NULL
-            RETURN year, count
-            ORDER BY year DESC
-            LIMIT 10
-            """
-            
-            result = session.run(query, field=field)
-            yearly_data = [dict(record) for record in result]
-            
+    def _get_field_researchers_db2(self, field: str, roles: list = None, limit: int = 15,
+                                   after: list = None) -> list:
+        """Get researchers in field from DB2 - optimized query, keyset page after [count, id]"""
+        query = """
+        %s
+        MATCH (p:Person)-[r%s]->(t)
+        WITH p, collect(DISTINCT type(r)) as thesis_roles, count(t) as thesis_count,
+             collect(t.title)[..2] as sample_titles
+        WITH p, thesis_roles, thesis_count, sample_titles, elementId(p) as person_id
+        WHERE %s
+        RETURN person_id,
+               p.name as name,
+               thesis_roles,
+               thesis_count,
+               sample_titles
+        ORDER BY thesis_count DESC, person_id ASC
+        LIMIT $limit
+        """ % (self._field_theses_clause(), self._role_pattern(roles), 
+               keyset_where("thesis_count", "person_id"))
+        
+        result = self._query("db2", "field_researchers", query, field=field, 
+                             canonical=normalize_keyword(field), limit=limit, **keyset_params(after))
+        return [dict(record) for record in result]
+    
+    def stream_field_researchers(self, field: str, roles: list = None, fetch_size: int = 1000):
+        """Every researcher in a field, yielded lazily (for exports; no LIMIT)"""
+        query = """
+        %s
+        MATCH (p:Person)-[r%s]->(t)
+        RETURN p.name as name,
+               collect(DISTINCT type(r)) as thesis_roles,
+               count(t) as thesis_count
+        ORDER BY thesis_count DESC
+        """ % (self._field_theses_clause(), self._role_pattern(roles))
+        
+        return self._stream_query("db2", "stream_field_researchers", query, fetch_size=fetch_size, 
+                                  field=field, canonical=normalize_keyword(field))
+    
+    def _field_theses_clause(self) -> str:
+        """
+        Clause binding t to the theses of $field: an exact lookup of the field's
+        canonical keyword ($canonical) once keywords.py has built the vocabulary,
+        else the title/keyword substring scan
+        """
+        if self.keyword_vocabulary_ready():
+            return "MATCH (:Keyword {canonical: $canonical})<-[:HAS_KEYWORD]-(t:Thesis)"
+        return """MATCH (t:Thesis)
+        WHERE %s""" % self._topic_predicate("db2", "t", "field", keys=["title", "keywords"])
+    
+    def _keyword_theses_clause(self) -> str:
+        """Clause binding t to the theses tagged with any of $keywords (canonical once indexed)"""
+        if self.keyword_vocabulary_ready():
+            return """MATCH (k:Keyword) WHERE k.canonical IN $keywords
+        MATCH (t:Thesis)-[:HAS_KEYWORD]->(k)
+        WITH DISTINCT t"""
+        return """MATCH (t:Thesis)
+        WHERE any(keyword IN t.keywords WHERE keyword IN $keywords)"""
+    
+    def _trend_cube(self):
+        reader = self.__dict__.get("_trend_cube_reader")
+        if reader is None:
+            reader = self.__dict__.setdefault("_trend_cube_reader", TrendCubeReader())
+        return reader.get()
+    
+    def field_trends(self, field: str, roles: list = None, start_year: int = None,
+                     end_year: int = None) -> dict:
+        """
+        Full-history {year: thesis count} for a field from the trend cube
+        (see trend_cube.py). None when no cube is built or the field is not exactly
+        a keyword; substring matches are left to the DB2 query, which counts each
+        thesis once and also matches titles.
+        """
+        cube = self._trend_cube()
+        if cube is None or not cube.matching_keywords(field):
+            return None
+        return cube.trend(field, roles, start_year, end_year)
+    
+    def _get_field_trends(self, field: str, roles: list = None) -> dict:
+        """Get trends - from the precomputed trend cube when available, else a DB2 scan"""
+        by_year = self.field_trends(field, roles)
+        if by_year is not None:
             return {
-                "yearly_activity": yearly_data,
-                "total_recent": sum(record["count"] for record in yearly_data)
+                "yearly_activity": [{"year": year, "count": count} 
+                                    for year, count in sorted(by_year.items(), reverse=True)],
+                "total_recent": sum(count for year, count in by_year.items() if year >= 2020),
+                "source": "trend_cube"
             }
+        
+        # Same counting as the cube: with roles, a thesis counts once per role category it has
+        role_filter = ""
+        if roles:
+            role_filter = """WITH DISTINCT t
+        CALL {
+            %s
+        }""" % "\n            UNION ALL\n            ".join(
+                "WITH t MATCH (:Person)-[%s]->(t) RETURN 1 as hit LIMIT 1" % self._role_pattern([slug])
+                for slug in roles)
+        query = """
+        %s
+        %s
+        WITH t.created_date.year as year, count(*) as count
+        WHERE year >= 2020 AND year IS NOT NULL
+        RETURN year, count
+        ORDER BY year DESC
+        LIMIT 10
+        """ % (self._field_theses_clause(), role_filter)
+        
+        result = self._query("db2", "field_trends", query, field=field, canonical=normalize_keyword(field))
+        yearly_data = [dict(record) for record in result]
+        
+        return {
+            "yearly_activity": yearly_data,
+            "total_recent": sum(record["count"] for record in yearly_data),
+            "source": "query"
+        }
     
-    def match_researchers(self, researcher_name: str) -> dict:
+    @coalesce_calls
+    @track_feature("researcher_matching")
+    def match_researchers(self, researcher_name: str, roles: list = None) -> dict:
         """
         RESEARCHBOOK CORE FEATURE 4: Researcher Matching (Simple)
+        roles restricts candidate matches to role categories, e.g. ["supervision"].
         """
         print(f"💝 Finding matches for: {researcher_name}")
         
-        # Get target researcher's thesis involvement
-        with self.db2_driver.session(database="neo4j") as session:
-            # Get target's keywords
-            target_query = """
-            MATCH (p:Person)-[r]->(t:Thesis)
-            WHERE toLower(p.name) CONTAINS toLower($name)
-            WITH collect(t.keywords) as all_keywords
-            UNWIND all_keywords as keyword_list
-            UNWIND keyword_list as keyword
-            RETURN collect(DISTINCT keyword) as unique_keywords
-            LIMIT 1
-            """
-            
-            target_result = session.run(target_query, name=researcher_name)
-            target_record = target_result.single()
-            
-            if not target_record or not target_record["unique_keywords"]:
-                return {"error": f"No thesis data found for {researcher_name}"}
-            
-            target_keywords = target_record["unique_keywords"][:10]  # Limit keywords
-            
-            # Find similar researchers
-            match_query = """
-            MATCH (p:Person)-[r]->(t:Thesis)
-            WHERE any(keyword IN t.keywords WHERE keyword IN $keywords)
-              AND NOT toLower(p.name) CONTAINS toLower($target_name)
-            WITH p, count(t) as relevance,
-                 collect(DISTINCT type(r)) as roles,
-                 collect(t.title)[..2] as sample_work
-            RETURN p.name as name, relevance, roles, sample_work
-            ORDER BY relevance DESC
-            LIMIT 10
-            """
-            
-            match_result = session.run(match_query, 
-                                     keywords=target_keywords, 
-                                     target_name=researcher_name)
-            matches = [dict(record) for record in match_result]
+        # Get target researcher's keywords
+        target_keywords = self._get_target_keywords(researcher_name)
+        if not target_keywords:
+            return {"error": f"No thesis data found for {researcher_name}"}
+        
+        # Find similar researchers (first page; more via match_researchers_page)
+        page = self._match_page(researcher_name, target_keywords, roles, 10, None)
+        matches = page["potential_matches"]
         
         # Generate AI analysis
         ai_prompt = f"""
@@ -156,16 +451,163 @@ class ResearchBookFinal(ResearchBook):
         Keep response concise but actionable.
         """
         
-        ai_analysis = self.ai_query(ai_prompt, max_tokens=1000)
+        ai_analysis, ai_error = self._try_ai_query(ai_prompt, max_tokens=1000, 
+                                                   feature="researcher_matching")
         
         return {
             "target_researcher": researcher_name,
             "target_keywords": target_keywords,
             "matches_found": len(matches),
             "potential_matches": matches,
-            "ai_analysis": ai_analysis
+            "next_cursor": page["next_cursor"],
+            "ai_analysis": ai_analysis,
+            "ai_error": ai_error
         }
     
+    def _get_target_keywords(self, researcher_name: str, limit: int = 10) -> list:
+        """Thesis keywords of the researcher being matched, canonical once indexed (empty if none)"""
+        target_query = """
+        MATCH (p:Person)-[r]->(t:Thesis)-[:HAS_KEYWORD]->(k:Keyword)
+        WHERE toLower(p.name) CONTAINS toLower($name)
+        RETURN collect(DISTINCT k.canonical) as unique_keywords
+        """ if self.keyword_vocabulary_ready() else """
+        MATCH (p:Person)-[r]->(t:Thesis)
+        WHERE toLower(p.name) CONTAINS toLower($name)
+        WITH collect(t.keywords) as all_keywords
+        UNWIND all_keywords as keyword_list
+        UNWIND keyword_list as keyword
+        RETURN collect(DISTINCT keyword) as unique_keywords
+        LIMIT 1
+        """
+        
+        target_result = self._query("db2", "match_target_keywords", target_query, name=researcher_name)
+        target_record = target_result[0] if target_result else None
+        if not target_record or not target_record["unique_keywords"]:
+            return []
+        return target_record["unique_keywords"][:limit]  # Limit keywords
+    
+    def match_researchers_page(self, researcher_name: str, cursor: str, limit: int = 10,
+                               roles: list = None) -> dict:
+        """Next page of matches after `cursor` (target keywords travel in the cursor)"""
+        fingerprint = query_fingerprint("match", researcher_name.strip().lower(), sorted(roles or []))
+        state = decode_cursor(cursor, fingerprint)
+        return self._match_page(researcher_name, state["keywords"], roles, limit, state["after"])
+    
+    def _match_page(self, researcher_name: str, target_keywords: list, roles: list,
+                    limit: int, after: list) -> dict:
+        """One keyset page of candidate matches in (relevance DESC, id ASC) order"""
+        match_query = """
+        %s
+        MATCH (p:Person)-[r%s]->(t)
+        WHERE NOT toLower(p.name) CONTAINS toLower($target_name)
+        WITH p, count(t) as relevance,
+             collect(DISTINCT type(r)) as roles,
+             collect(t.title)[..2] as sample_work
+        WITH p, relevance, roles, sample_work, elementId(p) as person_id
+        WHERE %s
+        RETURN person_id, p.name as name, relevance, roles, sample_work
+        ORDER BY relevance DESC, person_id ASC
+        LIMIT $limit
+        """ % (self._keyword_theses_clause(), self._role_pattern(roles), 
+               keyset_where("relevance", "person_id"))
+        
+        match_result = self._query("db2", "match_candidates", match_query, 
+                                   keywords=target_keywords, 
+                                   target_name=researcher_name,
+                                   limit=limit,
+                                   **keyset_params(after))
+        matches = [dict(record) for record in match_result]
+        position = advance(matches, len(matches), limit, "relevance", "person_id", after)
+        
+        fingerprint = query_fingerprint("match", researcher_name.strip().lower(), sorted(roles or []))
+        return {
+            "target_researcher": researcher_name,
+            "potential_matches": matches,
+            "next_cursor": None if position["done"] else encode_cursor(
+                {"q": fingerprint, "after": position["after"], "keywords": target_keywords})
+        }
+    
+    def stream_matches(self, researcher_name: str, target_keywords: list, roles: list = None,
+                       fetch_size: int = 1000):
+        """Every candidate match for the given keywords, yielded lazily (for exports)"""
+        query = """
+        %s
+        MATCH (p:Person)-[r%s]->(t)
+        WHERE NOT toLower(p.name) CONTAINS toLower($target_name)
+        RETURN p.name as name, count(t) as relevance, collect(DISTINCT type(r)) as roles
+        ORDER BY relevance DESC
+        """ % (self._keyword_theses_clause(), self._role_pattern(roles))
+        
+        return self._stream_query("db2", "stream_matches", query, fetch_size=fetch_size,
+                                  keywords=target_keywords, target_name=researcher_name)
+    
+    # Batched AI for bulk jobs: one instruction block per completion instead of per item
+    EXPERT_RANKING_INSTRUCTIONS = """
+        You rank researchers as experts on a topic. For each item you get a topic and
+        the experts found for it (publications, thesis work, roles, organizations).
+        Rank the top 5 by relevance to the topic, explain in one sentence each why they
+        are qualified, and name the best pick for media interviews, research
+        collaboration and student supervision. Keep each answer under 250 words.
+        """
+    
+    PROFILE_INSTRUCTIONS = """
+        You write short researcher profiles. For each item you get research profile data
+        (publications, affiliations, keywords) and thesis activities (roles).
+        Summarize research focus, career stage, academic roles and collaboration
+        potential in at most 120 words.
+        """
+    
+    @track_feature("expert_ranking_batch")
+    def rank_experts_batch(self, topics: list, limit: int = 10, roles: list = None,
+                           items_per_call: int = 8) -> dict:
+        """AI-ranked experts for many topics with batched LLM calls; returns {topic: result}"""
+        found = {topic: self._expert_page(topic, limit, roles, None) for topic in topics}
+        compact_fields = ("name", "relevant_publications", "relevant_theses", "organizations", "roles")
+        items = {
+            str(i): f"TOPIC: {topic}\nEXPERTS: " + json.dumps(
+                [{k: e[k] for k in compact_fields if k in e} for e in page["experts"]])
+            for i, (topic, page) in enumerate(found.items()) if page["experts"]
+        }
+        answers = self.ai_query_batch(self.EXPERT_RANKING_INSTRUCTIONS, items, "expert_finder",
+                                      items_per_call=items_per_call, max_tokens_per_item=400)
+        
+        results = {}
+        for i, (topic, page) in enumerate(found.items()):
+            ranking, error = answers.get(str(i), (f"No experts found for topic: {topic}", None))
+            results[topic] = {
+                "topic": topic,
+                "experts_found": len(page["experts"]),
+                "expert_list": page["experts"],
+                "next_cursor": page["next_cursor"],
+                "ai_ranking": ranking,
+                "ai_error": error
+            }
+        return results
+    
+    @track_feature("profile_batch")
+    def summarize_people_batch(self, names: list, items_per_call: int = 15) -> dict:
+        """Short AI profiles for many people with batched LLM calls; returns {name: result}"""
+        found = {}
+        for name in names:
+            found[name] = {"research_profile": self._get_researcher_profile_db1(name),
+                           "thesis_activities": self._get_thesis_activities_db2(name)}
+        items = {
+            str(i): f"RESEARCHER: {name}\nDATA: " + json.dumps(data, default=str)
+            for i, (name, data) in enumerate(found.items())
+            if data["research_profile"] or data["thesis_activities"]
+        }
+        answers = self.ai_query_batch(self.PROFILE_INSTRUCTIONS, items, "person_lookup",
+                                      items_per_call=items_per_call, max_tokens_per_item=200)
+        
+        results = {}
+        for i, (name, data) in enumerate(found.items()):
+            if str(i) not in items:
+                results[name] = {"name": name, "error": f"{name} not found in either database"}
+                continue
+            summary, error = answers[str(i)]
+            results[name] = {"name": name, **data, "ai_summary": summary, "ai_error": error}
+        return results
+    
     def quick_demo(self):
         """Quick demonstration of all ResearchBook features"""
         print("🚀 RESEARCHBOOK FULL DEMONSTRATION\n")
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Resilient Call Layer
+Retries with jittered exponential backoff, per-backend circuit breakers,
+hedged LLM requests and a fault-injecting stand-in for exercising them
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Tuple, Type
+
+import requests
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+from metrics import REGISTRY, percentile
+
+RETRIES = REGISTRY.counter(
+    "researchbook_retries_total", "Retried calls by backend and exception type", ["backend", "error_type"])
+CIRCUIT_STATE = REGISTRY.gauge(
+    "researchbook_circuit_open", "1 while a backend circuit breaker is open or half-open", ["backend"])
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "researchbook_circuit_rejections_total", "Calls rejected by an open circuit breaker", ["backend"])
+HEDGES = REGISTRY.counter(
+    "researchbook_hedged_requests_total", "Hedged second requests by outcome", ["backend", "winner"])
+
+
+class LLMError(Exception):
+    """The LLM could not produce an answer"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class LLMBudgetExceeded(LLMError):
+    """The token budget for a feature is used up and nothing is cached"""
+
+
+class CircuitOpenError(Exception):
+    """A backend is failing and calls are being short-circuited"""
+
+    def __init__(self, backend: str, retry_in: float):
+        super().__init__(f"{backend} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.backend = backend
+        self.retry_in = retry_in
+
+
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    ServiceUnavailable, SessionExpired, TransientError,
+    requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+    ConnectionError, TimeoutError
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Errors worth retrying: network failures, timeouts, 429/5xx and Neo4j transient errors"""
+    if isinstance(error, LLMError):
+        return error.retryable
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep ~ U(0, min(max_delay, base * 2^n))"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 rng: Optional[random.Random] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive transient failures.
+    Open -> half-open after reset_timeout; one probe call decides whether to close again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return self._state
+
+    def before_call(self):
+        """Raise CircuitOpenError unless the call may proceed"""
+        with self._lock:
+            if self._state == "closed":
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self._state == "open" and elapsed >= self.reset_timeout:
+                self._state = "half_open"
+            if self._state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            CIRCUIT_REJECTIONS.inc(backend=self.name)
+            raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+        CIRCUIT_STATE.set(0, backend=self.name)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    print(f"⚠️ Circuit opened for {self.name} after {self._failures} failures")
+                self._state = "open"
+                self._opened_at = time.monotonic()
+        if self._state == "open":
+            CIRCUIT_STATE.set(1, backend=self.name)
+
+
+def call_resilient(fn: Callable, breaker: CircuitBreaker, policy: RetryPolicy,
+                   is_transient: Callable[[BaseException], bool] = is_transient_error):
+    """Call fn through a circuit breaker, retrying transient errors with backoff"""
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_transient(e):
+                # The backend answered; the request itself was bad
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= policy.max_attempts or breaker.state != "closed":
+                raise
+            RETRIES.inc(backend=breaker.name, error_type=type(e).__name__)
+            time.sleep(policy.delay(attempt))
+            continue
+        breaker.record_success()
+        return result
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+
+    def __init__(self, size: int = 200):
+        self._lock = threading.Lock()
+        self._values = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._values.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            return percentile(list(self._values), q)
+
+
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+
+def hedged_call(fn: Callable, tracker: LatencyTracker, hedge_percentile: Optional[float] = 95,
+                min_samples: int = 20, backend: str = "llm"):
+    """
+    Start fn; if it has not finished after the tracker's latency percentile,
+    start a second identical call and return whichever succeeds first.
+    """
+    def timed():
+        start = time.perf_counter()
+        result = fn()
+        tracker.observe(time.perf_counter() - start)
+        return result
+
+    hedge_after = tracker.percentile(hedge_percentile) if hedge_percentile and len(tracker) >= min_samples else None
+    if hedge_after is None:
+        return timed()
+
+    primary = _hedge_executor.submit(timed)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    hedge = _hedge_executor.submit(timed)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                error = e
+                continue
+            HEDGES.inc(backend=backend, winner="hedge" if future is hedge else "primary")
+            return result
+    raise error
+
+
+class FaultInjector:
+    """
+    Local stand-in that wraps a callable and injects failures and latency.
+
+        rb._execute_query = FaultInjector(rb._execute_query, error_rate=0.3)
+        rb._llm_post = FaultInjector(rb._llm_post, slow_rate=0.1, slow_latency=20)
+    """
+
+    def __init__(self, fn: Callable, error_rate: float = 0.0, latency: float = 0.0,
+                 slow_rate: float = 0.0, slow_latency: float = 5.0,
+                 error_factory: Callable[[], BaseException] = lambda: ConnectionError("injected fault"),
+                 seed: Optional[int] = None):
+        self.fn = fn
+        self.error_rate = error_rate
+        self.latency = latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_factory = error_factory
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.error_rate
+            slow = self._rng.random() < self.slow_rate
+            if fail:
+                self.failures += 1
+        if self.latency or slow:
+            time.sleep(self.latency + (self.slow_latency if slow else 0.0))
+        if fail:
+            raise self.error_factory()
+        return self.fn(*args, **kwargs)
+
+
+if __name__ == "__main__":
+    # Offline demonstration against a fault-injecting stand-in
+    print("🧪 Retry + circuit breaker against a 40% failing backend")
+    backend = FaultInjector(lambda: "ok", error_rate=0.4, seed=7)
+    breaker = CircuitBreaker("demo", failure_threshold=3, reset_timeout=0.2)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+    outcomes = {"ok": 0, "failed": 0, "rejected": 0}
+    for _ in range(50):
+        time.sleep(0.02)
+        try:
+            call_resilient(backend, breaker, policy)
+            outcomes["ok"] += 1
+        except CircuitOpenError:
+            outcomes["rejected"] += 1
+        except ConnectionError:
+            outcomes["failed"] += 1
+    print(f"   {outcomes} after {backend.calls} backend calls ({backend.failures} injected failures)")
+
+    print("\n🧪 Hedged requests against a backend with 3% stuck calls")
+    tracker = LatencyTracker()
+    slow_backend = FaultInjector(lambda: "ok", latency=0.01, slow_rate=0.03, slow_latency=1.0, seed=3)
+    latencies = []
+    for _ in range(100):
+        start = time.perf_counter()
+        hedged_call(slow_backend, tracker, hedge_percentile=90, min_samples=10)
+        latencies.append(time.perf_counter() - start)
+    print(f"   p50={percentile(latencies, 50):.3f}s p99={percentile(latencies, 99):.3f}s "
+          f"max={max(latencies):.3f}s")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Role Taxonomy for DB2 relationship types
+Groups the ~731 Person->Thesis relationship types into role categories and
+expands categories into typed Cypher patterns (-[r:SUPERVISOR|CO_SUPERVISOR]->)
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+# Category slug -> (display label, known relationship types)
+ROLE_CATEGORIES: Dict[str, tuple] = {
+    "supervision": ("Thesis Supervision", [
+        "SUPERVISOR", "CO_SUPERVISOR", "MAIN_SUPERVISOR", "EXTERNAL_SUPERVISOR",
+        "COMPANY_SUPERVISOR", "ACADEMIC_SUPERVISOR", "INDUSTRIAL_SUPERVISOR",
+        "THESIS_SUPERVISOR", "DEPUTY_SUPERVISOR", "ASSISTANT_SUPERVISOR",
+        "PRINCIPAL_SUPERVISOR", "HEAD_SUPERVISOR", "LEAD_SUPERVISOR", "SECOND_SUPERVISOR",
+        "FORMER_SUPERVISOR", "UNIVERSITY_SUPERVISOR", "COLLEGE_SUPERVISOR",
+        "RESEARCH_SUPERVISOR", "INTERNAL_SUPERVISOR"
+    ]),
+    "examination": ("Thesis Examination", [
+        "EXAMINER", "EXTERNAL_EXAMINER", "STUDENT_EXAMINER", "EXAMINATOR",
+        "ASSISTANT_EXAMINER", "FORMER_EXAMINER", "INITIAL_EXAMINER", "ACADEMIC_EXAMINER",
+        "GUARDIAN_EXAMINER"
+    ]),
+    "advisory": ("Advisory & Mentorship", [
+        "ADVISOR", "MENTOR", "THESIS_ADVISOR", "TECHNICAL_ADVISOR", "ACADEMIC_ADVISOR",
+        "COMPANY_ADVISOR", "INDUSTRIAL_ADVISOR", "ADVISER", "EXPERT_ADVISOR",
+        "RESEARCH_ADVISOR", "MEDICAL_ADVISOR", "CLINICAL_ADVISOR", "ARCHITECTURAL_ADVISOR",
+        "UX_ADVISOR", "EXTERNAL_ADVISOR", "SCIENTIFIC_ADVISOR", "ACADEMIC_MENTOR",
+        "MASTER_STUDENT_MENTOR", "TECHNICAL_MENTOR", "INDUSTRY_MENTOR"
+    ]),
+    "authorship": ("Authorship & Publications", [
+        "AUTHOR", "CO_AUTHOR", "REFERENCED_AUTHOR", "REPORT_AUTHOR",
+        "PREVIOUS_REPORT_AUTHOR", "PRIOR_THESIS_AUTHOR"
+    ]),
+    "project_leadership": ("Project Management & Leadership", [
+        "PROJECT_LEADER", "PROJECT_MANAGER", "PROJECT_COORDINATOR", "PROJECT_SUPERVISOR",
+        "PROJECT_INITIATOR", "PROJECT_OWNER", "PROJECT_SPONSOR", "PROJECT_DEVELOPER",
+        "PROJECT_FACILITATOR", "PROJECT_ORGANIZER", "PROJECT_COMMISSIONER",
+        "PROJECT_PROVIDER", "PROJECT_SUPPORTER", "PROJECT_ADVISOR", "PROJECT_CONTACT",
+        "PROJECT_STARTER", "PROJECT_CREATOR", "PROJECT_PROPOSER", "PROJECT_PARTNER",
+        "PROJECT_CLIENT", "PROJECT_CONTRIBUTOR", "PROJECT_ADMINISTRATOR", "PROJECT_SECRETARY"
+    ]),
+    "technical_support": ("Technical Support & Consultation", [
+        "TECHNICAL_SUPPORT", "TECHNICAL_CONSULTANT", "CONSULTANT", "EXPERT_CONSULTANT",
+        "TECHNICAL_EXPERT", "EXPERT", "SPECIALIST", "TECHNICAL_SPECIALIST",
+        "RESEARCH_CONSULTANT", "INDUSTRY_CONSULTANT", "ACADEMIC_CONSULTANT",
+        "MEDICAL_CONSULTANT", "CLINICAL_CONSULTANT", "STATISTICAL_CONSULTANT",
+        "TECHNICAL_ADVISOR", "TECHNICAL_COACH", "TECHNICAL_MENTOR", "TECHNICAL_GUIDANCE",
+        "GUIDANCE_PROVIDER"
+    ]),
+    "collaboration": ("Collaboration & Research", [
+        "COLLABORATOR", "RESEARCH_COLLABORATOR", "INDUSTRY_COLLABORATOR",
+        "ACADEMIC_COLLABORATOR", "EXTERNAL_COLLABORATOR", "RESEARCH_PARTNER", "CONTRIBUTOR",
+        "RESEARCH_CONTRIBUTOR", "TECHNICAL_CONTRIBUTOR", "INDUSTRY_CONTRIBUTOR",
+        "RESEARCH_PARTICIPANT", "RESEARCHER", "RESEARCH_ASSISTANT", "RESEARCH_ENGINEER",
+        "RESEARCH_MANAGER"
+    ]),
+    "administrative": ("Administrative & Support", [
+        "SUPPORT", "ADMINISTRATIVE_SUPPORT", "ACADEMIC_SUPPORT", "RESEARCH_SUPPORT",
+        "INDUSTRY_SUPPORT", "LABORATORY_SUPPORT", "SUPPORT_STAFF", "SUPPORT_PROVIDER",
+        "SUPPORTER", "LAB_SUPPORT", "IT_SUPPORT", "FINANCIAL_SUPPORT_PROVIDER",
+        "FINANCIAL_SUPPORT", "PERSONAL_SUPPORT", "MORAL_SUPPORT", "DATA_SUPPORT"
+    ]),
+    "teaching": ("Teaching & Education", [
+        "TEACHER", "LECTURER", "PROFESSOR", "ASSISTANT_PROFESSOR", "ASSOCIATE_PROFESSOR",
+        "SENIOR_LECTURER", "UNIVERSITY_LECTURER", "TECHNICAL_LECTURER", "GUEST_LECTURER",
+        "INSTRUCTOR", "LAB_INSTRUCTOR", "COURSE_INSTRUCTOR", "TUTOR", "TRAINER"
+    ]),
+    "industry": ("Industry & External Relations", [
+        "COMPANY_SUPERVISOR", "COMPANY_CONTACT", "COMPANY_REPRESENTATIVE", "COMPANY_SPONSOR",
+        "COMPANY_ADVISOR", "COMPANY_TUTOR", "CEO", "MANAGER", "DIRECTOR", "INDUSTRY_CONTACT",
+        "INDUSTRY_EXPERT", "INDUSTRIAL_PARTNER", "CONTACT_PERSON", "CLIENT", "HOST"
+    ]),
+}
+
+# Token rules for the long tail of types not listed explicitly (e.g. SENIOR_CO_SUPERVISOR)
+CATEGORY_TOKENS: Dict[str, Set[str]] = {
+    "supervision": {"SUPERVISOR", "SUPERVISORS", "HANDLEDARE"},
+    "examination": {"EXAMINER", "EXAMINATOR", "OPPONENT", "EXAMINATION"},
+    "advisory": {"ADVISOR", "ADVISER", "MENTOR", "COACH"},
+    "authorship": {"AUTHOR", "AUTHORS", "WRITER"},
+    "project_leadership": {"PROJECT", "LEADER", "COORDINATOR", "OWNER"},
+    "technical_support": {"CONSULTANT", "SPECIALIST", "EXPERT", "TECHNICIAN"},
+    "collaboration": {"COLLABORATOR", "PARTNER", "CONTRIBUTOR", "RESEARCHER", "PARTICIPANT"},
+    "administrative": {"SUPPORT", "SUPPORTER", "ADMINISTRATOR", "SECRETARY", "COORDINATOR"},
+    "teaching": {"TEACHER", "LECTURER", "PROFESSOR", "INSTRUCTOR", "TUTOR", "TRAINER"},
+    "industry": {"COMPANY", "INDUSTRY", "INDUSTRIAL", "CEO", "CTO", "MANAGER", "DIRECTOR",
+                 "CLIENT", "HOST", "EMPLOYER"},
+}
+
+def quote_rel_type(rel_type: str) -> str:
+    """Backtick-quote a relationship type for safe interpolation into Cypher"""
+    return "`" + rel_type.replace("`", "``") + "`"
+
+
+def classify_rel_type(rel_type: str) -> Set[str]:
+    """Role categories of one relationship type (explicit lists first, then token rules)"""
+    categories = {slug for slug, (_, types) in ROLE_CATEGORIES.items() if rel_type in types}
+    if categories:
+        return categories
+    tokens = set(rel_type.upper().split("_"))
+    return {slug for slug, keywords in CATEGORY_TOKENS.items() if tokens & keywords}
+
+
+class RoleTaxonomy:
+    """Role categories resolved against the relationship types that actually exist"""
+
+    def __init__(self, rel_types: Iterable[str]):
+        self.rel_types = sorted(set(rel_types))
+        self.by_category: Dict[str, List[str]] = {slug: [] for slug in ROLE_CATEGORIES}
+        self.by_type: Dict[str, Set[str]] = {}
+        for rel_type in self.rel_types:
+            categories = classify_rel_type(rel_type)
+            self.by_type[rel_type] = categories
+            for slug in categories:
+                self.by_category[slug].append(rel_type)
+
+    @staticmethod
+    def categories() -> Dict[str, str]:
+        """Category slug -> display label"""
+        return {slug: label for slug, (label, _) in ROLE_CATEGORIES.items()}
+
+    def uncategorized(self) -> List[str]:
+        return [rel_type for rel_type, categories in self.by_type.items() if not categories]
+
+    def types_for(self, categories: Iterable[str]) -> List[str]:
+        """All relationship types in the given categories"""
+        types = set()
+        for slug in categories:
+            if slug not in ROLE_CATEGORIES:
+                raise ValueError(f"Unknown role category '{slug}'. Known: {', '.join(ROLE_CATEGORIES)}")
+            # Fall back to the curated list if the live schema has none of this category
+            types.update(self.by_category[slug] or ROLE_CATEGORIES[slug][1])
+        return sorted(types)
+
+    def rel_pattern(self, categories: Optional[Iterable[str]]) -> str:
+        """
+        Type expression for a relationship pattern, e.g. ':`SUPERVISOR`|`CO_SUPERVISOR`'.
+        Returns '' (untyped) when categories is None or empty.
+        """
+        if not categories:
+            return ""
+        return ":" + "|".join(quote_rel_type(t) for t in self.types_for(categories))
+
+    @classmethod
+    def from_schema(cls, run_query) -> "RoleTaxonomy":
+        """Build from the live schema; run_query(query) returns records with 'relationshipType'"""
+        records = run_query("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")
+        return cls(record["relationshipType"] for record in records)
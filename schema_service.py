@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Schema introspection
+One snapshot per database: labels with counts, relationship types with counts,
+property keys per label / relationship type with their types and fill rates,
+and the indexes and constraints that exist. Snapshots are cached with a TTL
+(in memory and as artifacts/schema_<db>.json) and refreshed in the background,
+so the query layer can ask "does Publication.abstract ever occur?" or "is
+there a fulltext index over these properties?" without a round trip.
+
+Introspection never scans a database: counts come from the count store,
+property keys and types from db.schema.nodeTypeProperties() /
+relTypeProperties(), and fill rates are estimated from the first
+SAMPLE_SIZE nodes (relationships) of each label (type).
+
+    python schema_service.py              # introspect both databases and print
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import config
+from role_taxonomy import quote_rel_type
+
+SCHEMA_VERSION = 2  # 2: property keys from db.schema procedures, sampled fill rates
+DEFAULT_TTL = 6 * 3600
+SAMPLE_SIZE = 1000
+# Count-store lookups per statement
+COUNTS_PER_QUERY = 100
+
+LABELS_QUERY = "CALL db.labels() YIELD label RETURN label"
+REL_TYPES_QUERY = "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType as rel_type"
+
+# One branch per label / type, each answered from the count store
+LABEL_COUNT_BRANCH = "MATCH (n:%s) RETURN %s as name, count(n) as count"
+REL_COUNT_BRANCH = "MATCH ()-[r:%s]->() RETURN %s as name, count(r) as count"
+
+NODE_PROPERTY_TYPES_QUERY = """
+CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName, propertyTypes
+WHERE propertyName IS NOT NULL
+UNWIND nodeLabels as label
+RETURN label, propertyName as key, propertyTypes as types
+"""
+
+REL_PROPERTY_TYPES_QUERY = """
+CALL db.schema.relTypeProperties() YIELD relType, propertyName, propertyTypes
+WHERE propertyName IS NOT NULL
+RETURN relType as rel_type, propertyName as key, propertyTypes as types
+"""
+
+NODE_SAMPLE_QUERY = """
+MATCH (n:%s) WITH n LIMIT $sample
+UNWIND keys(n) as key
+RETURN key, count(*) as count
+"""
+
+REL_SAMPLE_QUERY = """
+MATCH ()-[r:%s]->() WITH r LIMIT $sample
+UNWIND keys(r) as key
+RETURN key, count(*) as count
+"""
+
+INDEXES_QUERY = """
+SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, state
+RETURN name, type, entityType, labelsOrTypes, properties, state
+"""
+
+CONSTRAINTS_QUERY = """
+SHOW CONSTRAINTS YIELD name, type, entityType, labelsOrTypes, properties
+RETURN name, type, entityType, labelsOrTypes, properties
+"""
+
+
+def schema_path(db: str) -> str:
+    return os.path.join(config.ARTIFACT_DIR, f"schema_{db}.json")
+
+
+class DatabaseSchema:
+    """
+    Snapshot of one database. labels / rel_types map a name to
+    {"count", "sampled", "properties": {key: {"fill_rate", "types"}}}, where
+    fill_rate is the share of the sampled entities carrying the key.
+    """
+
+    def __init__(self, db: str, labels: Dict[str, Dict], rel_types: Dict[str, Dict], indexes: List[Dict],
+                 constraints: List[Dict], built_at: float = 0.0):
+        self.db = db
+        self.labels = labels
+        self.rel_types = rel_types
+        self.indexes = indexes
+        self.constraints = constraints
+        self.built_at = built_at
+
+    @staticmethod
+    def _counts(names: List[str], branch: str, run_query: Callable[..., list]) -> Dict[str, int]:
+        """Count-store counts of labels / relationship types, COUNTS_PER_QUERY per statement"""
+        counts = {}
+        for start in range(0, len(names), COUNTS_PER_QUERY):
+            query = "\nUNION ALL\n".join(branch % (quote_rel_type(name), json.dumps(name))
+                                         for name in names[start:start + COUNTS_PER_QUERY])
+            counts.update((r["name"], r["count"]) for r in run_query("schema_counts", query))
+        return counts
+
+    @staticmethod
+    def _describe(entries: Dict[str, Dict], types_query: str, sample_query: str, name_field: str,
+                  run_query: Callable[..., list], sample: int, db: str):
+        """Property keys and types from the db.schema procedure, fill rates from a sample"""
+        try:
+            for r in run_query("schema_property_types", types_query):
+                # relTypeProperties names types as ":`TYPE`"
+                name = r[name_field].lstrip(":").strip("`").replace("``", "`")
+                if name in entries:
+                    prop = entries[name]["properties"].setdefault(r["key"], {"fill_rate": 0.0, "types": []})
+                    prop["types"] = sorted(set(prop["types"]) | set(r["types"] or []))
+            described = {name for name, entry in entries.items() if entry["properties"]}
+        except Exception as e:
+            print(f"⚠️ Property types unavailable for {db}, using the sample only: {e}")
+            described = set(entries)
+        for name in described:
+            entry = entries[name]
+            entry["sampled"] = min(entry["count"], sample)
+            if not entry["sampled"]:
+                continue
+            for r in run_query("schema_sample", sample_query % quote_rel_type(name), sample=sample):
+                prop = entry["properties"].setdefault(r["key"], {"fill_rate": 0.0, "types": []})
+                prop["fill_rate"] = round(r["count"] / entry["sampled"], 6)
+
+    @classmethod
+    def introspect(cls, db: str, run_query: Callable[..., list], sample: int = SAMPLE_SIZE) -> "DatabaseSchema":
+        """Build from the live database; run_query(label, query, **params) returns records"""
+        label_names = [r["label"] for r in run_query("schema_labels", LABELS_QUERY)]
+        labels = {name: {"count": count, "sampled": 0, "properties": {}}
+                  for name, count in cls._counts(label_names, LABEL_COUNT_BRANCH, run_query).items()}
+        cls._describe(labels, NODE_PROPERTY_TYPES_QUERY, NODE_SAMPLE_QUERY, "label", run_query, sample, db)
+
+        type_names = [r["rel_type"] for r in run_query("schema_rel_types", REL_TYPES_QUERY)]
+        rel_types = {name: {"count": count, "sampled": 0, "properties": {}}
+                     for name, count in cls._counts(type_names, REL_COUNT_BRANCH, run_query).items()}
+        # Most relationship types carry no properties; only those the procedure lists are sampled
+        cls._describe(rel_types, REL_PROPERTY_TYPES_QUERY, REL_SAMPLE_QUERY, "rel_type", run_query, sample, db)
+
+        # SHOW needs privileges a read-only user may lack; the snapshot is useful without them
+        indexes, constraints = [], []
+        try:
+            indexes = [dict(r) for r in run_query("schema_indexes", INDEXES_QUERY)]
+        except Exception as e:
+            print(f"⚠️ Indexes unavailable for {db}: {e}")
+        try:
+            constraints = [dict(r) for r in run_query("schema_constraints", CONSTRAINTS_QUERY)]
+        except Exception as e:
+            print(f"⚠️ Constraints unavailable for {db}: {e}")
+        return cls(db, labels, rel_types, indexes, constraints, time.time())
+
+    # -- questions from the query layer ---------------------------------------
+
+    def fill_rate(self, label: str, key: str) -> Optional[float]:
+        """Estimated share of `label` nodes with property `key`; None if the label is not in this database"""
+        entry = self.labels.get(label)
+        if entry is None:
+            return None
+        prop = entry["properties"].get(key)
+        return prop["fill_rate"] if prop else 0.0
+
+    def present(self, label: str, keys: Iterable[str]) -> List[str]:
+        """
+        The keys that occur on at least one `label` node (all of them for unknown
+        labels); a key too rare to show up in the sample still counts
+        """
+        entry = self.labels.get(label)
+        return [key for key in keys if entry is None or key in entry["properties"]]
+
+    def property_types(self, label: str, key: str) -> List[str]:
+        return self.labels.get(label, {}).get("properties", {}).get(key, {}).get("types", [])
+
+    def find_index(self, label: str, keys: Iterable[str], index_type: Optional[str] = None) -> Optional[str]:
+        """Name of an ONLINE node index on `label` covering all `keys` (of index_type, e.g. "FULLTEXT")"""
+        keys = set(keys)
+        for index in self.indexes:
+            if (index.get("entityType") == "NODE" and label in (index.get("labelsOrTypes") or [])
+                    and keys <= set(index.get("properties") or [])
+                    and index.get("state", "ONLINE") == "ONLINE"
+                    and (index_type is None or index.get("type") == index_type)):
+                return index["name"]
+        return None
+
+    def is_unique(self, label: str, key: str) -> bool:
+        return any(label in (c.get("labelsOrTypes") or []) and (c.get("properties") or []) == [key]
+                   and "UNIQUE" in (c.get("type") or "") for c in self.constraints)
+
+    # -- storage -------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {"version": SCHEMA_VERSION, "db": self.db, "built_at": self.built_at, "labels": self.labels,
+                "rel_types": self.rel_types, "indexes": self.indexes, "constraints": self.constraints}
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1, default=str)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["DatabaseSchema"]:
+        """The stored snapshot, or None if missing or written by an incompatible version"""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SCHEMA_VERSION:
+            return None
+        return cls(data["db"], data["labels"], data["rel_types"], data["indexes"], data["constraints"],
+                   data["built_at"])
+
+
+class SchemaService:
+    """
+    Keeps one DatabaseSchema per database no older than ttl. get() never blocks
+    on introspection (many round trips): it returns the cached snapshot,
+    or None while the first one is being built in the background, and callers
+    then use their schema-agnostic query. A failed introspection is not retried
+    for retry_after seconds.
+    """
+
+    def __init__(self, run_query: Callable[..., list], ttl: float = DEFAULT_TTL,
+                 path_for: Callable[[str], str] = schema_path, retry_after: float = 600):
+        self.run_query = run_query
+        self.ttl = ttl
+        self.path_for = path_for
+        self.retry_after = retry_after
+        self._schemas: Dict[str, DatabaseSchema] = {}
+        self._refreshing = set()
+        self._failed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: str) -> Optional[DatabaseSchema]:
+        schema = self._schemas.get(db)
+        if schema is None:
+            schema = DatabaseSchema.load(self.path_for(db))
+            if schema is not None:
+                self._schemas[db] = schema
+        if schema is None or time.time() - schema.built_at > self.ttl:
+            self._refresh_in_background(db)
+        return schema
+
+    def refresh(self, db: str) -> DatabaseSchema:
+        """Introspect now (blocking) and store the snapshot"""
+        schema = DatabaseSchema.introspect(db, lambda label, query, **params: self.run_query(db, label, query,
+                                                                                               **params))
+        schema.save(self.path_for(db))
+        self._schemas[db] = schema
+        return schema
+
+    def _refresh_in_background(self, db: str):
+        with self._lock:
+            failed_at = self._failed_at.get(db)
+            if db in self._refreshing or (failed_at is not None and
+                                          time.monotonic() - failed_at < self.retry_after):
+                return
+            self._refreshing.add(db)
+        threading.Thread(target=self._refresh_quietly, args=(db,), daemon=True).start()
+
+    def _refresh_quietly(self, db: str):
+        try:
+            self.refresh(db)
+            self._failed_at.pop(db, None)
+        except Exception as e:
+            print(f"⚠️ Schema introspection of {db} failed, retrying in {self.retry_after:.0f}s: {e}")
+            self._failed_at[db] = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshing.discard(db)
+
+
+if __name__ == "__main__":
+    from researchbook import ResearchBook
+
+    rb = ResearchBook()
+    try:
+        for db in ("db1", "db2"):
+            start = time.perf_counter()
+            schema = rb.schema_service.refresh(db)
+            print(f"\n🗂️ {db}: {len(schema.labels)} labels, {len(schema.rel_types)} relationship types, "
+                  f"{len(schema.indexes)} indexes, {len(schema.constraints)} constraints "
+                  f"({time.perf_counter() - start:.1f}s)")
+            for label, entry in sorted(schema.labels.items(), key=lambda item: -item[1]["count"]):
+                print(f"   {label} ({entry['count']:,}, fill rates of the first {entry['sampled']:,})")
+                for key, prop in sorted(entry["properties"].items(), key=lambda item: -item[1]["fill_rate"]):
+                    print(f"      {key}: {prop['fill_rate']:.1%} {'/'.join(prop['types'])}")
+            for index in schema.indexes:
+                print(f"   🔎 {index['type']} {index['name']} on {index['labelsOrTypes']} {index['properties']}")
+    finally:
+        rb.close_connections()
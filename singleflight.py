@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Request Coalescing (single-flight)
+Concurrent calls with the same normalized arguments share one in-flight computation
+"""
+
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable
+
+from metrics import REGISTRY
+
+COALESCED_CALLS = REGISTRY.counter(
+    "researchbook_coalesced_calls_total", "Calls by single-flight role (leader or shared)", ["method", "role"])
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """Thread-safe duplicate call suppression keyed by any hashable value"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn once per key at a time; concurrent callers with the same key wait for its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def normalize_argument(value: Any) -> Hashable:
+    """Case- and whitespace-insensitive strings; containers become tuples"""
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [normalize_argument(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_argument(v)) for k, v in value.items()))
+    return value
+
+
+def coalesce_calls(method: Callable) -> Callable:
+    """
+    Method decorator: identical concurrent calls on the same instance share one result.
+    Results are shared between callers and must be treated as read-only.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(
+            (name, normalize_argument(value))
+            for name, value in bound.arguments.items() if name != "self"
+        )
+        flights = self.__dict__.get("_singleflight")
+        if flights is None:
+            flights = self.__dict__.setdefault("_singleflight", SingleFlight())
+
+        is_leader = []
+
+        def run():
+            is_leader.append(True)
+            return method(self, *args, **kwargs)
+
+        result = flights.do(key, run)
+        COALESCED_CALLS.inc(method=method.__name__, role="leader" if is_leader else "shared")
+        return result
+
+    return wrapper
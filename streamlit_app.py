@@ -5,12 +5,18 @@ Academic Intelligence Platform
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from researchbook_final import ResearchBookFinal
+from metrics import REGISTRY, start_metrics_server
+from role_taxonomy import RoleTaxonomy
+from ego_network import HARD_MAX_NODES, MAX_HOPS, to_pyvis_html
+from analyze_coverage import share
 import json
 import datetime
+import os
 
 # Configure Streamlit page
 st.set_page_config(
@@ -24,6 +30,13 @@ st.set_page_config(
 @st.cache_resource
 def init_researchbook():
     """Initialize ResearchBook connection (cached for performance)"""
+    # Prometheus scrape endpoint runs next to the app (set port to 0 to disable)
+    metrics_port = int(os.environ.get("RESEARCHBOOK_METRICS_PORT", "9108"))
+    if metrics_port:
+        try:
+            start_metrics_server(metrics_port)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint not started: {e}")
     return ResearchBookFinal()
 
 # Custom CSS for better styling
@@ -58,6 +71,46 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+def show_ai_result(text, error):
+    """Render an AI analysis box, or a warning when the AI layer could not answer"""
+    if error:
+        st.warning(f"⚠️ AI analysis unavailable right now ({error}). The database results below are unaffected.")
+        return
+    st.markdown(f"""
+    <div class="result-box">
+    {text or 'No analysis available'}
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def researcher_name_input(rb, label, placeholder, key):
+    """
+    Name input with typeahead from the in-memory name index. Returns (name, known):
+    the picked suggestion (or the text as typed) and whether any indexed name matches it.
+    Without prefix completions the fuzzy candidates are offered, so misspellings still
+    reach the lookup.
+    """
+    typed = st.text_input(label, placeholder=placeholder, key=key)
+    if len(typed.strip()) < 2:
+        return typed, True
+    try:
+        suggestions = rb.complete_name(typed, k=8)
+        if not suggestions:
+            suggestions = rb.find_person_candidates(typed, k=8)
+    except Exception as e:
+        print(f"⚠️ Name suggestions unavailable: {e}")
+        return typed, True  # no index: plain free-text search
+    if not suggestions:
+        st.caption(f"No researcher name resembles \"{typed}\" - check the spelling.")
+        return typed, False
+    
+    labels = [f"Search \"{typed}\" as typed"] + [
+        f"{s['name']} — {s['hint']}" if s['hint'] else s['name'] for s in suggestions]
+    choice = st.selectbox("Did you mean:", range(len(labels)), index=1 if len(suggestions) == 1 else 0,
+                          format_func=labels.__getitem__, key=f"{key}_suggestion")
+    return (typed if choice == 0 else suggestions[choice - 1]['name']), True
+
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🔬 ResearchBook</h1>', unsafe_allow_html=True)
@@ -78,6 +131,7 @@ def main():
         [
             "🏠 Home",
             "👤 Person Lookup", 
+            "🕸️ Person Network",
             "🎯 Expert Finder",
             "📊 Field Intelligence Brief",
             "💝 Researcher Matching",
@@ -91,6 +145,8 @@ def main():
         show_home_page()
     elif feature == "👤 Person Lookup":
         show_person_lookup(rb)
+    elif feature == "🕸️ Person Network":
+        show_person_network(rb)
     elif feature == "🎯 Expert Finder":
         show_expert_finder(rb)
     elif feature == "📊 Field Intelligence Brief":
@@ -169,10 +225,13 @@ def show_person_lookup(rb):
         """)
     
     # Input
-    researcher_name = st.text_input("Enter researcher name:", placeholder="e.g., Anders, Maria, John Smith")
+    researcher_name, known = researcher_name_input(rb, "Enter researcher name:", 
+                                                   "e.g., Anders, Maria, John Smith", "lookup_name")
     
     if st.button("🔍 Search Researcher", type="primary"):
-        if researcher_name:
+        if researcher_name and not known:
+            st.warning("No researcher with that name in either database - try a suggestion or another spelling.")
+        elif researcher_name:
             with st.spinner("Searching databases and generating AI analysis..."):
                 try:
                     result = rb.lookup_person(researcher_name)
@@ -189,14 +248,20 @@ def show_person_lookup(rb):
                         found_status = "Found" if (result['found_in_db1'] or result['found_in_db2']) else "Not Found"
                         st.metric("Status", found_status)
                     
+                    if result.get('candidates'):
+                        with st.expander(f"🔎 Matched {len(result['candidates'])} names (ranked by similarity)"):
+                            for candidate in result['candidates']:
+                                hint = f" — {candidate['hint']}" if candidate['hint'] else ""
+                                st.write(f"- **{candidate['name']}**{hint} ({candidate['similarity']:.2f})")
+                    if result.get('did_you_mean'):
+                        st.caption("Did you mean: " + ", ".join(
+                            f"{c['name']} ({c['hint']})" if c['hint'] else c['name']
+                            for c in result['did_you_mean']) + "? Search that name to see its profile.")
+
                     if result['found_in_db1'] or result['found_in_db2']:
                         # AI Analysis
                         st.markdown("### 🤖 AI Profile Analysis")
-                        st.markdown(f"""
-                        <div class="result-box">
-                        {result.get('ai_analysis', 'No analysis available')}
-                        </div>
-                        """, unsafe_allow_html=True)
+                        show_ai_result(result.get('ai_analysis'), result.get('ai_error'))
                         
                         # Detailed data tabs
                         tab1, tab2 = st.tabs(["📊 Research Profile", "🎓 Thesis Activities"])
@@ -214,6 +279,11 @@ def show_person_lookup(rb):
                                             st.write(f"**Given Names:** {profile.get('given_names', 'N/A')}")
                                             st.write(f"**Family Name:** {profile.get('family_name', 'N/A')}")
                                         
+                                        if profile.get('first_publication_year'):
+                                            st.write(f"**Publishing:** {profile['first_publication_year']}–{profile.get('last_publication_year', '')}")
+                                        if profile.get('top_keywords'):
+                                            st.write(f"**Top Keywords:** {', '.join(profile['top_keywords'])}")
+                                        
                                         if profile.get('affiliations'):
                                             st.write("**Affiliations:**")
                                             for aff in profile['affiliations']:
@@ -231,6 +301,93 @@ def show_person_lookup(rb):
                     st.error(f"Search error: {e}")
         else:
             st.warning("Please enter a researcher name to search.")
+    
+    # Connection paths between two researchers (local graph store, see graph_store.py)
+    st.markdown("---")
+    st.markdown("### 🔗 How are they connected?")
+    other_name, other_known = researcher_name_input(rb, "Connect with researcher:", 
+                                                    "e.g., Erik Lindqvist", "connect_name")
+    if st.button("🔗 Find Connection"):
+        if not researcher_name or not other_name:
+            st.warning("Enter both researcher names.")
+        elif not (known and other_known):
+            st.warning("No researcher with that name in either database - try a suggestion or another spelling.")
+        else:
+            with st.spinner("Searching the collaboration graph..."):
+                try:
+                    connection = rb.connection_paths(researcher_name, other_name)
+                except Exception as e:
+                    connection = {"error": str(e)}
+            if 'error' in connection:
+                st.warning(connection['error'])
+            elif not connection['paths']:
+                reason = " within the search limit" if connection['capped'] else ""
+                st.info(f"No connection found between {connection['person_a']} and "
+                        f"{connection['person_b']}{reason}.")
+            else:
+                for i, path in enumerate(connection['paths']):
+                    with st.expander(f"Path {i+1}: {path['length']} steps", expanded=i == 0):
+                        for step in path['steps']:
+                            st.write(f"- {step}")
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def network_html(network_json):
+    """pyvis page for a network (keyed on its JSON so reruns reuse the rendering)"""
+    return to_pyvis_html(json.loads(network_json))
+
+def show_person_network(rb):
+    """Ego network of co-authors and thesis ties"""
+    st.markdown("## 🕸️ Person Network")
+    st.markdown("Co-authors (publications) and supervision/examination ties (theses) around a researcher.")
+    
+    researcher_name, known = researcher_name_input(rb, "Enter researcher name:", 
+                                                   "e.g., Maria Andersson", "network_name")
+    col1, col2 = st.columns(2)
+    with col1:
+        hops = st.radio("Hops:", list(range(1, MAX_HOPS + 1)), horizontal=True)
+    with col2:
+        max_nodes = st.slider("Maximum people shown:", 10, HARD_MAX_NODES, 60, step=10)
+    
+    query = (researcher_name, hops, max_nodes)
+    
+    if st.button("🕸️ Show Network", type="primary"):
+        if researcher_name and not known:
+            st.warning("No researcher with that name in either database - try a suggestion or another spelling.")
+        elif researcher_name:
+            with st.spinner("Fetching network..."):
+                try:
+                    st.session_state.network_result = rb.ego_network(researcher_name, hops, max_nodes)
+                    st.session_state.network_query = query
+                except Exception as e:
+                    st.session_state.pop("network_result", None)
+                    st.error(f"Network error: {e}")
+        else:
+            st.warning("Please enter a researcher name.")
+    
+    network = st.session_state.get("network_result")
+    if network and st.session_state.get("network_query") == query:
+        if 'error' in network:
+            st.warning(network['error'])
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("People", len(network['nodes']))
+        with col2:
+            st.metric("Ties", len(network['edges']))
+        with col3:
+            st.metric("Not shown", network['hidden_neighbours'])
+        
+        st.markdown(f"### Network of **{network['center']}**")
+        components.html(network_html(json.dumps(network, sort_keys=True)), height=670)
+        st.caption("Blue: co-authors · green: supervision · orange: examination · purple: advisory. "
+                   "Only the strongest ties per person are shown; hover a node for how many were left out.")
+        
+        with st.expander("📋 Ties"):
+            names = {node['key']: node['name'] for node in network['nodes']}
+            df = pd.DataFrame([{"from": names[e['source']], "to": names[e['target']], "kind": ", ".join(e['kinds']),
+                                "weight": e['weight']} for e in network['edges']])
+            st.dataframe(df.sort_values("weight", ascending=False), use_container_width=True)
 
 def show_expert_finder(rb):
     """Expert finder interface"""
@@ -252,57 +409,118 @@ def show_expert_finder(rb):
     # Input
     topic = st.text_input("Enter research topic:", placeholder="e.g., machine learning, sustainability, robotics")
     limit = st.slider("Number of experts to find:", 5, 20, 10)
+    role_labels = RoleTaxonomy.categories()
+    roles = st.multiselect("Restrict thesis roles to (optional):", list(role_labels),
+                           format_func=role_labels.get)
+    scoring_labels = {"match": "Matching publications & theses",
+                      "pagerank": "Centrality in the topic's network"}
+    scoring = st.radio("Rank experts by:", list(scoring_labels), format_func=scoring_labels.get,
+                       horizontal=True)
+    rank_mode_labels = {"hybrid": "Instant list, AI analysis follows", "fast": "Instant list only",
+                        "ai": "Wait for AI ranking"}
+    rank_mode = st.radio("Ranking:", list(rank_mode_labels), format_func=rank_mode_labels.get,
+                         horizontal=True)
+    
+    query = (topic, limit, tuple(roles), scoring, rank_mode)
     
     if st.button("🔍 Find Experts", type="primary"):
         if topic:
-            with st.spinner("Searching for experts and generating AI rankings..."):
+            with st.spinner("Searching for experts..." if rank_mode != "ai" else
+                            "Searching for experts and generating AI rankings..."):
                 try:
-                    result = rb.find_expert(topic, limit=limit)
-                    
-                    # Display results
-                    st.markdown(f"### Expert Results for: **{topic}**")
-                    
-                    col1, col2, col3 = st.columns(3)
+                    st.session_state.expert_result = rb.find_expert(topic, limit=limit, roles=roles or None,
+                                                                    scoring=scoring, rank_mode=rank_mode)
+                    st.session_state.expert_query = query
+                except Exception as e:
+                    st.session_state.pop("expert_result", None)
+                    st.error(f"Search error: {e}")
+        else:
+            st.warning("Please enter a research topic to search for experts.")
+    
+    # Results live in session state so "Load more" can append pages across reruns
+    result = st.session_state.get("expert_result")
+    if result and st.session_state.get("expert_query") == query and "error" in result:
+        st.error(result["error"])
+    elif result and st.session_state.get("expert_query") == query:
+        # Display results
+        st.markdown(f"### Expert Results for: **{topic}**")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Experts", result['experts_found'])
+        with col2:
+            st.metric("Research Network", result['db1_matches'])
+        with col3:
+            st.metric("Academic Network", result['db2_matches'])
+        
+        if result['experts_found'] > 0:
+            # AI Ranking (filled in after the list when it is still being generated)
+            ai_section = st.empty()
+            if result.get('rank_mode', "ai") == "ai":
+                with ai_section.container():
+                    st.markdown("### 🤖 AI Expert Ranking & Analysis")
+                    show_ai_result(result['ai_ranking'], result.get('ai_error'))
+            
+            # Expert details
+            st.markdown("### 📋 Expert Details")
+            for i, expert in enumerate(result.get('expert_list', [])):
+                with st.expander(f"Expert {i+1}: {expert['name']}"):
+                    col1, col2 = st.columns(2)
                     with col1:
-                        st.metric("Total Experts", result['experts_found'])
+                        st.write(f"**Source:** {expert.get('source', 'Unknown')}")
+                        if 'relevant_publications' in expert:
+                            st.write(f"**Relevant Publications:** {expert['relevant_publications']}")
+                        if 'relevant_theses' in expert:
+                            st.write(f"**Relevant Theses:** {expert['relevant_theses']}")
+                    
                     with col2:
-                        st.metric("Research Network", result['db1_matches'])
-                    with col3:
-                        st.metric("Academic Network", result['db2_matches'])
+                        if 'organizations' in expert:
+                            st.write(f"**Organizations:** {', '.join(expert['organizations'])}")
+                        if 'roles' in expert:
+                            st.write(f"**Roles:** {', '.join(expert['roles'])}")
                     
-                    if result['experts_found'] > 0:
-                        # AI Ranking
-                        st.markdown("### 🤖 AI Expert Ranking & Analysis")
-                        st.markdown(f"""
-                        <div class="result-box">
-                        {result['ai_ranking']}
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Expert details
-                        st.markdown("### 📋 Expert Details")
-                        for i, expert in enumerate(result.get('expert_list', [])):
-                            with st.expander(f"Expert {i+1}: {expert['name']}"):
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.write(f"**Source:** {expert.get('source', 'Unknown')}")
-                                    if 'relevant_publications' in expert:
-                                        st.write(f"**Relevant Publications:** {expert['relevant_publications']}")
-                                    if 'relevant_theses' in expert:
-                                        st.write(f"**Relevant Theses:** {expert['relevant_theses']}")
-                                
-                                with col2:
-                                    if 'organizations' in expert:
-                                        st.write(f"**Organizations:** {', '.join(expert['organizations'])}")
-                                    if 'roles' in expert:
-                                        st.write(f"**Roles:** {', '.join(expert['roles'])}")
+                    if expert.get('ranking_reasons'):
+                        st.write(f"**Why ranked here:** {'; '.join(expert['ranking_reasons'])}")
+                    
+                    if expert.get('provenance'):
+                        st.write("**Score came through:**")
+                        for item in expert['provenance']:
+                            marker = "🎯" if item['matches_topic'] else "↪️"
+                            st.write(f"{marker} {item['role']} · {item['kind']} \"{item['item'][:80]}\" "
+                                     f"({item['share']:.0%})")
+            
+            if result.get('next_cursor') and st.button("⬇️ Load more experts"):
+                try:
+                    page = rb.find_expert_page(topic, result['next_cursor'], limit=limit, roles=roles or None)
+                    # Build a new dict: the first page may be shared with other sessions
+                    st.session_state.expert_result = {
+                        **result,
+                        "expert_list": result['expert_list'] + page['experts'],
+                        "experts_found": result['experts_found'] + len(page['experts']),
+                        "db1_matches": result['db1_matches'] + page['db1_matches'],
+                        "db2_matches": result['db2_matches'] + page['db2_matches'],
+                        "next_cursor": page['next_cursor']
+                    }
+                    st.rerun()
+                except ValueError as e:
+                    st.error(f"Could not load more experts: {e}")
+            
+            if result.get('ai_ranking_id'):
+                with ai_section.container():
+                    st.markdown("### 🤖 AI Expert Ranking & Analysis")
+                    with st.spinner("Generating AI analysis..."):
+                        narrative = rb.expert_ai_ranking(result['ai_ranking_id'], timeout=120)
+                    if narrative['status'] == "done":
+                        show_ai_result(narrative['ai_ranking'], narrative.get('ai_error'))
+                        # Keep it, so reruns do not depend on the pending result still being held
+                        st.session_state.expert_result = {**result, "ai_ranking_id": None,
+                                                          "rank_mode": "ai", **narrative}
+                    elif narrative['status'] == "pending":
+                        st.info("AI analysis is still being generated, rerun the page to check again.")
                     else:
-                        st.warning(f"No experts found for topic: {topic}")
-                        
-                except Exception as e:
-                    st.error(f"Search error: {e}")
+                        st.info("AI analysis is no longer available for this search.")
         else:
-            st.warning("Please enter a research topic to search for experts.")
+            st.warning(f"No experts found for topic: {topic}")
 
 def show_field_brief(rb):
     """Field intelligence brief interface"""
@@ -328,38 +546,72 @@ def show_field_brief(rb):
         if research_field:
             with st.spinner("Analyzing field data and generating intelligence brief..."):
                 try:
-                    result = rb.generate_field_brief(research_field)
-                    
-                    # Display results
-                    st.markdown(f"### Field Brief: **{research_field}**")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Active Researchers", result['researchers_found'])
-                    with col2:
-                        st.metric("Recent Activity", result['trends']['total_recent'])
-                    
-                    # AI Intelligence Brief
-                    st.markdown("### 🤖 AI Intelligence Brief")
-                    st.markdown(f"""
-                    <div class="result-box">
-                    {result['ai_intelligence_brief']}
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Trends visualization
-                    if result['trends']['yearly_activity']:
-                        st.markdown("### 📈 Activity Trends")
-                        df = pd.DataFrame(result['trends']['yearly_activity'])
-                        fig = px.bar(df, x='year', y='count', 
-                                   title=f"Annual Research Activity in {research_field}",
-                                   labels={'year': 'Year', 'count': 'Number of Theses'})
-                        st.plotly_chart(fig, use_container_width=True)
-                        
+                    st.session_state.field_result = rb.generate_field_brief(research_field)
+                    st.session_state.field_query = research_field
                 except Exception as e:
+                    st.session_state.pop("field_result", None)
                     st.error(f"Analysis error: {e}")
         else:
             st.warning("Please enter a research field to analyze.")
+    
+    result = st.session_state.get("field_result")
+    if result and st.session_state.get("field_query") == research_field:
+        # Display results
+        st.markdown(f"### Field Brief: **{research_field}**")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Active Researchers", result['researchers_found'])
+        with col2:
+            st.metric("Recent Activity", result['trends']['total_recent'])
+        
+        # AI Intelligence Brief
+        st.markdown("### 🤖 AI Intelligence Brief")
+        show_ai_result(result['ai_intelligence_brief'], result.get('ai_error'))
+        
+        # Trends visualization: full history from the trend cube, any year range
+        full_history = rb.field_trends(research_field)
+        if full_history:
+            st.markdown("### 📈 Activity Trends")
+            first_year, last_year = min(full_history), max(full_history)
+            if first_year < last_year:
+                start_year, end_year = st.slider("Years", first_year, last_year, (first_year, last_year))
+            else:
+                start_year, end_year = first_year, last_year
+            by_year = rb.field_trends(research_field, start_year=start_year, end_year=end_year)
+            df = pd.DataFrame([{"year": year, "count": count} for year, count in sorted(by_year.items())])
+            fig = px.bar(df, x='year', y='count', 
+                       title=f"Annual Research Activity in {research_field} ({start_year}-{end_year})",
+                       labels={'year': 'Year', 'count': 'Number of Theses'})
+            st.plotly_chart(fig, use_container_width=True)
+        elif result['trends']['yearly_activity']:
+            st.markdown("### 📈 Activity Trends")
+            df = pd.DataFrame(result['trends']['yearly_activity'])
+            fig = px.bar(df, x='year', y='count', 
+                       title=f"Annual Research Activity in {research_field}",
+                       labels={'year': 'Year', 'count': 'Number of Theses'})
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Researchers, paged
+        if result.get('researchers'):
+            st.markdown("### 👥 Researchers in Field")
+            st.dataframe(pd.DataFrame([
+                {"Name": r['name'], "Theses": r['thesis_count'], "Roles": ", ".join(r['thesis_roles'])}
+                for r in result['researchers']
+            ]), use_container_width=True)
+            
+            if result.get('next_cursor') and st.button("⬇️ Load more researchers"):
+                try:
+                    page = rb.field_researchers_page(research_field, result['next_cursor'])
+                    st.session_state.field_result = {
+                        **result,
+                        "researchers": result['researchers'] + page['researchers'],
+                        "researchers_found": result['researchers_found'] + len(page['researchers']),
+                        "next_cursor": page['next_cursor']
+                    }
+                    st.rerun()
+                except ValueError as e:
+                    st.error(f"Could not load more researchers: {e}")
 
 def show_researcher_matching(rb):
     """Researcher matching interface"""
@@ -379,78 +631,111 @@ def show_researcher_matching(rb):
         """)
     
     # Input
-    researcher_name = st.text_input("Enter researcher name to find matches:", placeholder="e.g., Anders, Maria")
+    researcher_name, known = researcher_name_input(rb, "Enter researcher name to find matches:", 
+                                                   "e.g., Anders, Maria", "match_name")
+    role_labels = RoleTaxonomy.categories()
+    roles = st.multiselect("Only match people in these thesis roles (optional):", list(role_labels),
+                           format_func=role_labels.get)
+    
+    query = (researcher_name, tuple(roles))
     
     if st.button("💝 Find Matches", type="primary"):
-        if researcher_name:
+        if researcher_name and not known:
+            st.warning("No researcher with that name in either database - try a suggestion or another spelling.")
+        elif researcher_name:
             with st.spinner("Finding compatible researchers and generating match analysis..."):
                 try:
-                    result = rb.match_researchers(researcher_name)
-                    
-                    if 'error' not in result:
-                        # Display results
-                        st.markdown(f"### Matches for: **{researcher_name}**")
-                        
+                    st.session_state.match_result = rb.match_researchers(researcher_name, roles=roles or None)
+                    st.session_state.match_query = query
+                except Exception as e:
+                    st.session_state.pop("match_result", None)
+                    st.error(f"Matching error: {e}")
+        else:
+            st.warning("Please enter a researcher name to find matches.")
+    
+    result = st.session_state.get("match_result")
+    if result and st.session_state.get("match_query") == query:
+        if 'error' not in result:
+            # Display results
+            st.markdown(f"### Matches for: **{researcher_name}**")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Potential Matches", result['matches_found'])
+            with col2:
+                st.metric("Keywords Used", len(result.get('target_keywords', [])))
+            
+            # Target keywords
+            if result.get('target_keywords'):
+                st.markdown("### 🏷️ Target Researcher Keywords")
+                keywords_display = ", ".join(result['target_keywords'][:10])  # Show first 10
+                st.info(f"Matching based on: {keywords_display}")
+            
+            # AI Analysis
+            st.markdown("### 🤖 AI Match Analysis")
+            show_ai_result(result['ai_analysis'], result.get('ai_error'))
+            
+            # Match details
+            if result.get('potential_matches'):
+                st.markdown("### 👥 Potential Matches")
+                for i, match in enumerate(result['potential_matches']):
+                    with st.expander(f"Match {i+1}: {match['name']} (Relevance: {match['relevance']})"):
                         col1, col2 = st.columns(2)
                         with col1:
-                            st.metric("Potential Matches", result['matches_found'])
+                            st.write(f"**Name:** {match['name']}")
+                            st.write(f"**Relevance Score:** {match['relevance']}")
                         with col2:
-                            st.metric("Keywords Used", len(result.get('target_keywords', [])))
-                        
-                        # Target keywords
-                        if result.get('target_keywords'):
-                            st.markdown("### 🏷️ Target Researcher Keywords")
-                            keywords_display = ", ".join(result['target_keywords'][:10])  # Show first 10
-                            st.info(f"Matching based on: {keywords_display}")
+                            st.write(f"**Roles:** {', '.join(match.get('roles', []))}")
                         
-                        # AI Analysis
-                        st.markdown("### 🤖 AI Match Analysis")
-                        st.markdown(f"""
-                        <div class="result-box">
-                        {result['ai_analysis']}
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Match details
-                        if result.get('potential_matches'):
-                            st.markdown("### 👥 Potential Matches")
-                            for i, match in enumerate(result['potential_matches']):
-                                with st.expander(f"Match {i+1}: {match['name']} (Relevance: {match['relevance']})"):
-                                    col1, col2 = st.columns(2)
-                                    with col1:
-                                        st.write(f"**Name:** {match['name']}")
-                                        st.write(f"**Relevance Score:** {match['relevance']}")
-                                    with col2:
-                                        st.write(f"**Roles:** {', '.join(match.get('roles', []))}")
-                                    
-                                    if match.get('sample_work'):
-                                        st.write("**Sample Work:**")
-                                        for work in match['sample_work']:
-                                            st.write(f"- {work}")
-                    else:
-                        st.error(result['error'])
-                        
-                except Exception as e:
-                    st.error(f"Matching error: {e}")
+                        if match.get('sample_work'):
+                            st.write("**Sample Work:**")
+                            for work in match['sample_work']:
+                                st.write(f"- {work}")
+                
+                if result.get('next_cursor') and st.button("⬇️ Load more matches"):
+                    try:
+                        page = rb.match_researchers_page(researcher_name, result['next_cursor'],
+                                                         roles=roles or None)
+                        st.session_state.match_result = {
+                            **result,
+                            "potential_matches": result['potential_matches'] + page['potential_matches'],
+                            "matches_found": result['matches_found'] + len(page['potential_matches']),
+                            "next_cursor": page['next_cursor']
+                        }
+                        st.rerun()
+                    except ValueError as e:
+                        st.error(f"Could not load more matches: {e}")
         else:
-            st.warning("Please enter a researcher name to find matches.")
+            st.error(result['error'])
 
 def show_database_overview(rb):
     """Database overview and statistics"""
     st.markdown("## 📈 Database Overview")
     st.markdown("Overview of ResearchBook data sources and statistics.")
     
-    # Database info
+    # Database info, from the last run of analyze_coverage.py
+    stats = rb.coverage_stats()
+    if stats is None:
+        st.info("Coverage statistics have not been computed yet (run python analyze_coverage.py).")
+        stats = {"db1": {}, "db2": {}, "built_at": None}
+    db1, db2 = stats["db1"], stats["db2"]
+    
+    def count(db, key):
+        return f"{db[key]:,}" if db.get(key) is not None else "–"
+    
+    orcid_share = share(stats, "db1", "orcid_id", "persons")
+    orcid_text = f" ({orcid_share:.1f}%)" if orcid_share is not None else ""
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="success-box">
         <h3>🌍 Research Intelligence System</h3>
         <ul>
-        <li><strong>154,272</strong> researchers</li>
-        <li><strong>78,287</strong> with ORCID IDs (50.7%)</li>
-        <li><strong>685,709</strong> relationships</li>
+        <li><strong>{count(db1, 'persons')}</strong> researchers</li>
+        <li><strong>{count(db1, 'orcid_id')}</strong> with ORCID IDs{orcid_text}</li>
+        <li><strong>{count(db1, 'publications')}</strong> publications, <strong>{count(db1, 'organizations')}</strong> organizations</li>
+        <li><strong>{count(db1, 'relationships')}</strong> relationships</li>
         <li><strong>ORCID integration</strong> with career tracking</li>
         <li><strong>Temporal data</strong> for career progression</li>
         </ul>
@@ -458,19 +743,23 @@ def show_database_overview(rb):
         """, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         <div class="success-box">
         <h3>🎓 Academic Collaboration Network</h3>
         <ul>
-        <li><strong>57,633</strong> nodes (40K people, 18K theses)</li>
-        <li><strong>52,772</strong> relationships</li>
-        <li><strong>731</strong> unique relationship types</li>
+        <li><strong>{count(db2, 'nodes')}</strong> nodes ({count(db2, 'persons')} people, {count(db2, 'theses')} theses)</li>
+        <li><strong>{count(db2, 'relationships')}</strong> relationships</li>
+        <li><strong>{count(db2, 'relationship_types')}</strong> unique relationship types</li>
         <li><strong>Complete thesis ecosystems</strong></li>
         <li><strong>Granular role mapping</strong></li>
         </ul>
         </div>
         """, unsafe_allow_html=True)
     
+    if stats["built_at"]:
+        st.caption(f"Statistics as of {datetime.datetime.fromtimestamp(stats['built_at']):%Y-%m-%d %H:%M}"
+                   + (f" · {len(stats['errors'])} counters failed" if stats.get("errors") else ""))
+    
     # Feature status
     st.markdown("### ✅ Feature Status")
     features = [
@@ -490,6 +779,40 @@ def show_database_overview(rb):
             st.write(status)
         with col3:
             st.write(description)
+    
+    # Live service metrics
+    st.markdown("### 📡 Service Metrics")
+    snapshot = REGISTRY.snapshot()
+    latency_rows = [
+        {
+            "feature": sample["labels"]["feature"],
+            "calls": sample["count"],
+            "avg_seconds": round(sample["sum"] / sample["count"], 3) if sample["count"] else 0
+        }
+        for sample in snapshot["researchbook_feature_latency_seconds"]["samples"]
+    ]
+    token_rows = [
+        {**sample["labels"], "tokens": sample["value"]}
+        for sample in snapshot["researchbook_llm_tokens_total"]["samples"]
+    ]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Feature latency**")
+        if latency_rows:
+            st.dataframe(pd.DataFrame(latency_rows), use_container_width=True)
+        else:
+            st.write("No feature calls recorded yet.")
+    with col2:
+        st.markdown("**LLM token usage**")
+        if token_rows:
+            st.dataframe(pd.DataFrame(token_rows), use_container_width=True)
+        else:
+            st.write("No LLM usage recorded yet.")
+    
+    budget_stats = rb.llm_budget.stats()
+    if budget_stats:
+        st.markdown(f"**LLM budget (last {rb.llm_budget.window_seconds // 60} minutes)**")
+        st.dataframe(pd.DataFrame.from_dict(budget_stats, orient="index"), use_container_width=True)
 
 def show_user_guide():
     """Comprehensive User Guide"""
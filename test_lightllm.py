@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 
 import requests
+import config
 import json
 
 def test_lightllm_api():
     """Test LightLLM API credentials and functionality"""
     
     # API configuration
-    url = "https://anast.ita.chalmers.se:4000/v1/chat/completions"
-    api_key = "sk-u_7AVwCgIBRZF9IXwzPqtA"
+    url = config.LLM_CHAT_URL
+    api_key = config.LLM_API_KEY
     
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -33,7 +34,7 @@ def test_lightllm_api():
         print(f"   URL: {url}")
         print(f"   Using API key: {api_key[:10]}...")
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30, verify=False)
+        response = requests.post(url, headers=headers, json=payload, timeout=30, verify=config.LLM_VERIFY_TLS)
         
         print(f"   Status Code: {response.status_code}")
         
@@ -109,8 +110,8 @@ def test_lightllm_api():
 def test_different_models():
     """Test with different model names in case the default doesn't work"""
     
-    url = "https://anast.ita.chalmers.se:4000/v1/chat/completions"
-    api_key = "sk-u_7AVwCgIBRZF9IXwzPqtA"
+    url = config.LLM_CHAT_URL
+    api_key = config.LLM_API_KEY
     
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -136,7 +137,7 @@ def test_different_models():
         }
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=10, verify=False)
+            response = requests.post(url, headers=headers, json=payload, timeout=10, verify=config.LLM_VERIFY_TLS)
             if response.status_code == 200:
                 print(f"✅ Model '{model}' works!")
                 return model
@@ -161,6 +162,6 @@ if __name__ == "__main__":
             print("\n❌ No working models found")
     
     print("\n📋 API Test Summary:")
-    print("   Endpoint:", "https://anast.ita.chalmers.se:4000/v1/chat/completions")
-    print("   Key format appears valid:", "sk-u_7AVwCgIBRZF9IXwzPqtA"[:10] + "...")
+    print("   Endpoint:", config.LLM_CHAT_URL)
+    print("   Key format appears valid:", config.LLM_API_KEY[:10] + "...")
     print("   Success:", "✅" if success else "❌")
\ No newline at end of file
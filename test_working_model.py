@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 
 import requests
+import config
 import json
 
 def test_specific_models():
     """Test specific models that look more promising"""
     
-    url = "https://anast.ita.chalmers.se:4000/v1/chat/completions"
-    api_key = "sk-u_7AVwCgIBRZF9IXwzPqtA"
+    url = config.LLM_CHAT_URL
+    api_key = config.LLM_API_KEY
     
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -39,7 +40,7 @@ def test_specific_models():
         }
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30, verify=False)
+            response = requests.post(url, headers=headers, json=payload, timeout=30, verify=config.LLM_VERIFY_TLS)
             
             print(f"   Status: {response.status_code}")
             
@@ -69,7 +70,7 @@ def test_specific_models():
                         "temperature": 0.3
                     }
                     
-                    complex_response = requests.post(url, headers=headers, json=complex_payload, timeout=30, verify=False)
+                    complex_response = requests.post(url, headers=headers, json=complex_payload, timeout=30, verify=config.LLM_VERIFY_TLS)
                     
                     if complex_response.status_code == 200:
                         complex_result = complex_response.json()
@@ -103,7 +104,7 @@ if __name__ == "__main__":
     working_model, success = test_specific_models()
     
     print(f"\n📋 LightLLM API Test Summary:")
-    print(f"   Endpoint: https://anast.ita.chalmers.se:4000/v1/chat/completions")
+    print(f"   Endpoint: {config.LLM_CHAT_URL}")
     print(f"   API Key: ✅ Valid format")
     print(f"   Models available: ✅ 21 models found")
     print(f"   Working model: {'✅ ' + working_model if working_model else '❌ None found'}")
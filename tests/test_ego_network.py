@@ -0,0 +1,55 @@
+from ego_network import build_ego_network, thesis_tie_kind
+from name_index import NameIndex
+
+DB1 = [{"person_id": "a1", "name": "Ada Lind"}, {"person_id": "e1", "name": "Erik Berg"},
+       {"person_id": "e2", "name": "Erik Berg"}]
+DB2 = [{"person_id": "a2", "name": "Ada Lind"}, {"person_id": "e3", "name": "Erik Berg"}]
+
+
+class FakeBook:
+    """Ties per (database, person id), served in the shape of the tie queries"""
+
+    def __init__(self, ties):
+        self.ties = ties
+
+    def name_index(self):
+        return NameIndex.from_records(DB1, DB2)
+
+    def _query(self, db, label, query, ids, fanout):
+        return [{"source_id": i, "total": len(self.ties.get((db, i), [])), "ties": self.ties.get((db, i), [])[:fanout]}
+                for i in ids]
+
+
+def tie(person_id, name, weight=1, source_roles=("SUPERVISOR",), target_roles=("AUTHOR",)):
+    return {"id": person_id, "name": name, "weight": weight,
+            "source_roles": list(source_roles), "target_roles": list(target_roles)}
+
+
+def test_namesakes_stay_apart_and_joined_persons_merge():
+    book = FakeBook({("db1", "a1"): [tie("e1", "Erik Berg", 3), tie("e2", "Erik Berg", 2)],
+                     ("db2", "a2"): [tie("e3", "Erik Berg", 4)]})
+    center = book.name_index().fuzzy("Ada Lind", 1)[0]
+    network = build_ego_network(book, center, hops=1)
+    keys = {node["key"] for node in network["nodes"]}
+    assert keys == {"db1:a1", "db1:e1", "db1:e2", "db2:e3"}
+    center_node = network["nodes"][0]
+    assert center_node["key"] == "db1:a1" and center_node["person_ids"] == {"db1": "a1", "db2": "a2"}
+    assert {tuple(sorted((e["source"], e["target"]))) for e in network["edges"]} == {
+        ("db1:a1", "db1:e1"), ("db1:a1", "db1:e2"), ("db1:a1", "db2:e3")}
+
+
+def test_ties_from_both_databases_add_up_on_one_edge():
+    book = FakeBook({("db1", "a1"): [tie("x1", "Xu Li", 2)], ("db2", "a2"): [tie("x2", "Xu Li", 5)]})
+    book.name_index = lambda: NameIndex.from_records(DB1 + [{"person_id": "x1", "name": "Xu Li"}],
+                                                     DB2 + [{"person_id": "x2", "name": "Xu Li"}])
+    center = book.name_index().fuzzy("Ada Lind", 1)[0]
+    network = build_ego_network(book, center, hops=2)
+    (edge,) = network["edges"]
+    assert edge["target"] == "db1:x1" and edge["weight"] == 7
+    assert sorted(edge["kinds"]) == ["co-author", "supervised"]
+
+
+def test_thesis_tie_kind():
+    assert thesis_tie_kind(["SUPERVISOR"], ["AUTHOR"]) == "supervised"
+    assert thesis_tie_kind(["AUTHOR"], ["OPPONENT"]) == "examined by"
+    assert thesis_tie_kind(["SUPERVISOR"], ["SUPERVISOR"]) == "co-supervised"
@@ -0,0 +1,34 @@
+from expert_ranking import fast_rank
+
+EXPERTS = [
+    {"name": "B", "person_id": "2", "relevant_publications": 3, "last_publication_year": 2015,
+     "first_publication_year": 2005, "total_publications": 20},
+    {"name": "A", "person_id": "1", "relevant_publications": 10, "relevant_theses": 4,
+     "thesis_roles": ["SUPERVISOR"], "last_publication_year": 2024, "first_publication_year": 1995,
+     "total_publications": 150},
+    {"name": "C", "person_id": "3", "relevant_theses": 2, "thesis_roles": ["OPPONENT"], "last_thesis_year": 2023},
+]
+
+
+def test_fast_rank_orders_by_signals():
+    ranked = fast_rank(EXPERTS, current_year=2025)
+    assert ranked[0]["name"] == "A"
+    assert ranked[0]["ranking_signals"]["relevance"] == 1.0
+    assert ranked[0]["ranking_signals"]["roles"] == 1.0
+    assert "supervision role on the topic" in ranked[0]["ranking_reasons"]
+    assert all(0 <= e["fast_score"] <= 1 for e in ranked)
+
+
+def test_fast_rank_is_deterministic():
+    first = fast_rank(EXPERTS, current_year=2025)
+    again = fast_rank(list(reversed(EXPERTS)), current_year=2025)
+    assert [e["person_id"] for e in first] == [e["person_id"] for e in again]
+
+
+def test_ties_break_by_name_then_id():
+    twins = [{"name": "Z", "person_id": "9"}, {"name": "Y", "person_id": "8"}, {"name": "Y", "person_id": "7"}]
+    assert [e["person_id"] for e in fast_rank(twins, current_year=2025)] == ["7", "8", "9"]
+
+
+def test_fast_rank_of_nothing():
+    assert fast_rank([]) == []
@@ -0,0 +1,47 @@
+from genealogy import Genealogy, _add_edges, _connect
+
+
+def build(path, pairs, names=("a", "b", "c", "d", "e")):
+    connection = _connect(str(path))
+    with connection:
+        connection.executemany("INSERT INTO persons (id, name) VALUES (?, ?)", [(n, n.upper()) for n in names])
+        _add_edges(connection, pairs)
+    connection.close()
+    return Genealogy(str(path))
+
+
+def closure(path):
+    connection = _connect(str(path))
+    try:
+        return {(r["ancestor"], r["descendant"]): r["depth"] for r in connection.execute("SELECT * FROM closure")}
+    finally:
+        connection.close()
+
+
+def test_closure_of_a_chain(tmp_path):
+    path = tmp_path / "g.sqlite"
+    build(path, [("a", "b"), ("b", "c"), ("c", "d")])
+    assert closure(path) == {("a", "b"): 1, ("b", "c"): 1, ("c", "d"): 1,
+                             ("a", "c"): 2, ("b", "d"): 2, ("a", "d"): 3}
+
+
+def test_edge_order_does_not_matter(tmp_path):
+    build(tmp_path / "1.sqlite", [("a", "b"), ("b", "c"), ("c", "d")])
+    build(tmp_path / "2.sqlite", [("c", "d"), ("a", "b"), ("b", "c")])
+    assert closure(tmp_path / "1.sqlite") == closure(tmp_path / "2.sqlite")
+
+
+def test_shortcut_keeps_the_shorter_depth(tmp_path):
+    path = tmp_path / "g.sqlite"
+    build(path, [("a", "b"), ("b", "c"), ("c", "d"), ("a", "d")])
+    assert closure(path)[("a", "d")] == 1
+
+
+def test_lineage_queries(tmp_path):
+    tree = build(tmp_path / "g.sqlite", [("a", "b"), ("b", "c"), ("a", "e")])
+    assert [(r["id"], r["depth"]) for r in tree.ancestors("c")] == [("b", 1), ("a", 2)]
+    assert [r["id"] for r in tree.descendants("a", max_depth=1)] == ["b", "e"]
+    assert tree.descendants("a", max_depth=0) == []
+    assert tree.common_ancestors("c", "e")[0]["id"] == "a"
+    assert tree.common_ancestors("a", "c")[0]["id"] == "a"  # direct lineage
+    assert tree.stats()["max_depth"] == 2
@@ -0,0 +1,109 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from graph_store import ORGANIZATION, PERSON, PUBLICATION, THESIS, GraphStore
+
+NODES = {"db1:a": (PERSON, "Ada"), "db1:b": (PERSON, "Bo"), "db1:c": (PERSON, "Cai"), "db2:d": (PERSON, "Dan"),
+         "db1:p1": (PUBLICATION, "Graphs"), "db1:p2": (PUBLICATION, "Trees"), "db1:o1": (ORGANIZATION, "KTH"),
+         "db2:t1": (THESIS, "On paths"), "db2:t2": (THESIS, "On cycles")}
+EDGES = [("db1:a", "db1:p1", "AUTHORED"), ("db1:b", "db1:p1", "AUTHORED"), ("db1:b", "db1:p2", "AUTHORED"),
+         ("db1:c", "db1:p2", "AUTHORED"), ("db1:a", "db2:t1", "SUPERVISOR"), ("db1:c", "db2:t1", "AUTHOR"),
+         ("db1:a", "db1:o1", "WORKED_AT"), ("db1:c", "db1:o1", "WORKED_AT"), ("db2:d", "db2:t2", "OPPONENT")]
+
+
+def store():
+    return GraphStore.build(NODES, EDGES, {"db2:a": "db1:a"})
+
+
+def node(graph, key):
+    return graph.key_index[key]
+
+
+def bfs_distance(graph, source, target):
+    distance = {source: 0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v in graph.neighbours(u).tolist():
+            if v not in distance:
+                distance[v] = distance[u] + 1
+                queue.append(v)
+    return distance.get(target)
+
+
+def test_csr_is_symmetric_and_sorted():
+    graph = store()
+    for u in range(len(graph.keys)):
+        neighbours = graph.neighbours(u).tolist()
+        assert neighbours == sorted(neighbours)
+        assert all(u in graph.neighbours(v).tolist() for v in neighbours)
+    assert graph.degree(node(graph, "db1:a")) == 3
+    assert graph.edge_type(node(graph, "db2:t1"), node(graph, "db1:c")) == "AUTHOR"
+
+
+def test_shortest_paths_keep_only_the_minimum_length():
+    graph = store()
+    a, c = node(graph, "db1:a"), node(graph, "db1:c")
+    result = graph.shortest_paths(a, c, k=5)
+    assert sorted(result["paths"]) == result["paths"]
+    assert [[graph.keys[i] for i in path] for path in result["paths"]] == sorted(
+        [["db1:a", "db1:o1", "db1:c"], ["db1:a", "db2:t1", "db1:c"]],
+        key=lambda keys: [graph.key_index[k] for k in keys])
+    assert not result["capped"]
+
+
+def test_k_limits_the_paths():
+    graph = store()
+    assert len(graph.shortest_paths(node(graph, "db1:a"), node(graph, "db1:c"), k=1)["paths"]) == 1
+
+
+def test_trivial_and_missing_connections():
+    graph = store()
+    a = node(graph, "db1:a")
+    assert graph.shortest_paths(a, a)["paths"] == [[a]]
+    assert graph.shortest_paths(a, node(graph, "db2:d"))["paths"] == []
+    assert graph.shortest_paths(a, node(graph, "db1:b"), max_length=1)["paths"] == []
+    assert node(graph, "db2:a") == a
+
+
+def test_visit_cap_reports_capped():
+    graph = store()
+    result = graph.shortest_paths(node(graph, "db1:b"), node(graph, "db2:d"), visit_cap=1)
+    assert result["paths"] == [] and result["capped"]
+
+
+def test_paths_are_shortest_on_random_graphs():
+    rng = random.Random(7)
+    for _ in range(200):
+        persons, items = rng.randint(2, 12), rng.randint(1, 12)
+        nodes = {**{f"p{i}": (PERSON, f"P{i}") for i in range(persons)},
+                 **{f"i{i}": (PUBLICATION, f"I{i}") for i in range(items)}}
+        edges = {(f"p{rng.randrange(persons)}", f"i{rng.randrange(items)}", "AUTHORED")
+                 for _ in range(rng.randint(1, 3 * (persons + items)))}
+        graph = GraphStore.build(nodes, sorted(edges))
+        source, target = rng.sample(range(persons), 2)
+        expected = bfs_distance(graph, source, target)
+        paths = graph.shortest_paths(source, target, k=4, max_length=64)["paths"]
+        assert bool(paths) == (expected is not None)
+        for path in paths:
+            assert path[0] == source and path[-1] == target and len(path) - 1 == expected
+            assert all(b in graph.neighbours(a).tolist() for a, b in zip(path, path[1:]))
+
+
+def test_explain():
+    graph = store()
+    path = [node(graph, "db1:a"), node(graph, "db2:t1"), node(graph, "db1:c")]
+    explained = graph.explain(path)
+    assert explained["length"] == 2
+    assert [n["kind"] for n in explained["nodes"]] == ["person", "thesis", "person"]
+    assert explained["steps"] == ['Ada —SUPERVISOR→ thesis "On paths"', 'Cai —AUTHOR→ thesis "On paths"']
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "store.npz")
+    store().save(path)
+    loaded = GraphStore.load(path)
+    assert loaded.keys == store().keys and loaded.aliases == {"db2:a": "db1:a"}
+    assert np.array_equal(loaded.indices, store().indices)
@@ -0,0 +1,42 @@
+from llm_batching import build_batch_prompt, chunk_ids, parse_batch_response
+
+
+def test_valid_response():
+    text = '{"results": [{"id": "a", "output": " one "}, {"id": "b", "output": "two"}]}'
+    assert parse_batch_response(text, ["a", "b"]) == ({"a": "one", "b": "two"}, [])
+
+
+def test_code_fences_and_prose_are_tolerated():
+    text = 'Sure:\n```json\n{"results": [{"id": "a", "output": "one"}]}\n```'
+    assert parse_batch_response(text, ["a"]) == ({"a": "one"}, [])
+
+
+def test_missing_empty_and_unexpected_ids_are_retried():
+    text = '{"results": [{"id": "a", "output": ""}, {"id": "x", "output": "stray"}, {"id": "b", "output": 3}]}'
+    assert parse_batch_response(text, ["a", "b", "c"]) == ({}, ["a", "b", "c"])
+
+
+def test_duplicated_ids_are_retried():
+    text = '{"results": [{"id": "a", "output": "one"}, {"id": "a", "output": "again"}, {"id": "b", "output": "two"}]}'
+    assert parse_batch_response(text, ["a", "b"]) == ({"b": "two"}, ["a"])
+
+
+def test_invalid_json_retries_everything():
+    assert parse_batch_response("no json here", ["a", "b"]) == ({}, ["a", "b"])
+    assert parse_batch_response('{"results": "nope"}', ["a"]) == ({}, ["a"])
+    assert parse_batch_response("[1, 2]", ["a"]) == ({}, ["a"])
+
+
+def test_numeric_ids_match_their_string_form():
+    assert parse_batch_response('{"results": [{"id": 7, "output": "seven"}]}', ["7"]) == ({"7": "seven"}, [])
+
+
+def test_prompt_lists_every_item():
+    prompt = build_batch_prompt("Summarize.", {"a": "first", "b": "second"}, retry=True)
+    assert prompt.startswith("Summarize.")
+    assert '### ITEM id="a"\nfirst' in prompt and '### ITEM id="b"\nsecond' in prompt
+    assert "not valid JSON" in prompt
+
+
+def test_chunk_ids():
+    assert chunk_ids(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
@@ -0,0 +1,71 @@
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("neo4j")
+
+import researchbook
+from name_index import NameIndex
+from test_name_index import DB1, DB2
+
+
+@pytest.fixture
+def rb():
+    with mock.patch.object(researchbook, "GraphDatabase"):
+        book = researchbook.ResearchBook()
+    book.name_index = lambda: NameIndex.from_records(DB1, DB2)
+    book._get_researcher_profile_db1 = mock.Mock(return_value=[{"name": "x"}])
+    book._get_thesis_activities_db2 = mock.Mock(return_value=[])
+    book._try_ai_query = mock.Mock(return_value=("profile", None))
+    return book
+
+
+def test_exact_name_reads_only_that_person(rb):
+    result = rb.lookup_person("Karin Söderberg")
+    rb._get_researcher_profile_db1.assert_called_once_with("Karin Söderberg", ["p1"])
+    rb._get_thesis_activities_db2.assert_called_once_with("Karin Söderberg", ["t1"])
+    assert [c["name"] for c in result["candidates"]] == ["Karin Söderberg"]
+    assert "Karin Sjöberg" in [c["name"] for c in result["did_you_mean"]]
+
+
+def test_misspelling_reads_the_closest_person(rb):
+    result = rb.lookup_person("Karin Sodreberg")
+    rb._get_researcher_profile_db1.assert_called_once_with("Karin Sodreberg", ["p1"])
+    assert result["did_you_mean"]
+
+
+def test_unknown_name_falls_back_to_the_scan(rb):
+    rb.lookup_person("Qwxz")
+    rb._get_researcher_profile_db1.assert_called_once_with("Qwxz", None)
+
+
+@pytest.fixture
+def final():
+    import researchbook_final
+    with mock.patch.object(researchbook, "GraphDatabase"):
+        book = researchbook_final.ResearchBookFinal()
+    book.name_index = lambda: NameIndex.from_records(DB1, DB2)
+    return book
+
+
+def test_genealogy_person_takes_the_exact_match(final):
+    assert final._genealogy_person("Karin Söderberg") == {"id": "t1", "name": "Karin Söderberg"}
+
+
+def test_genealogy_person_does_not_fall_through_to_a_weaker_candidate(final):
+    person = final._genealogy_person("Karin Sjöberg")  # in DB1 only
+    assert "error" in person
+    assert [c["name"] for c in person["did_you_mean"]] == ["Karin Söderberg"]
+
+
+def test_topic_predicate_guards_mixed_property_types(rb):
+    schema = mock.Mock()
+    schema.present.side_effect = lambda label, keys: list(keys)
+    schema.property_types.side_effect = lambda label, key: {
+        "title": ["String"], "keywords": ["String", "StringArray"]}.get(key, ["StringArray"])
+    rb.schema = lambda db: schema
+    predicate = rb._topic_predicate("db1", "pub")
+    assert "toLower(pub.title) CONTAINS toLower($topic)" in predicate
+    assert ("CASE WHEN valueType(pub.keywords) STARTS WITH 'LIST' "
+            "THEN any(item IN pub.keywords WHERE toLower(item) CONTAINS toLower($topic)) "
+            "ELSE toLower(pub.keywords) CONTAINS toLower($topic) END") in predicate
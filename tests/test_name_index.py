@@ -0,0 +1,68 @@
+from name_index import NameIndex, cross_database_identities, normalize_name, select_candidates
+
+DB1 = [
+    {"person_id": "p1", "name": "Karin Söderberg", "organization": "Chalmers", "weight": 40},
+    {"person_id": "p2", "name": "Karin Sjöberg", "organization": "KTH", "weight": 5},
+    {"person_id": "p3", "name": "Anders Karlsson", "organization": "Chalmers", "weight": 12},
+    {"person_id": "p4", "name": "Anders Karlsson", "organization": "Lund", "weight": 3},
+]
+DB2 = [
+    {"person_id": "t1", "name": "Karin Soderberg", "weight": 7},
+    {"person_id": "t2", "name": "Anders Karlsson", "weight": 2},
+]
+
+
+def make_index():
+    return NameIndex.from_records(DB1, DB2)
+
+
+def test_normalize_name_folds_case_accents_and_punctuation():
+    assert normalize_name("Sjöberg, K.") == "sjoberg k"
+
+
+def test_cross_database_identities_needs_a_unique_name_on_both_sides():
+    assert cross_database_identities(DB1, DB2) == {"t1": "p1"}
+
+
+def test_complete_matches_any_word_heaviest_first():
+    names = [s["name"] for s in make_index().complete("kar")]
+    assert names[:2] == ["Karin Söderberg", "Anders Karlsson"]
+    assert "Karin Sjöberg" in names
+
+
+def test_complete_without_a_match_is_empty():
+    assert make_index().complete("zzz") == []
+
+
+def test_fuzzy_places_a_misspelling():
+    best = make_index().fuzzy("Karin Sodreberg")[0]
+    assert best["name"] == "Karin Söderberg"
+    assert best["person_ids"] == {"db1": "p1", "db2": "t1"}
+    assert "Chalmers" in best["hint"]
+
+
+def test_fuzzy_exact_name_scores_one():
+    assert make_index().fuzzy("karin soderberg")[0]["similarity"] == 1.0
+
+
+def test_select_candidates_keeps_only_exact_matches():
+    candidates = make_index().fuzzy("Karin Söderberg")
+    chosen, others = select_candidates("Karin Söderberg", candidates)
+    assert [c["person_ids"]["db1"] for c in chosen] == ["p1"]
+    assert "Karin Sjöberg" in [c["name"] for c in others]
+
+
+def test_select_candidates_keeps_namesakes_as_one_match():
+    chosen, _ = select_candidates("Anders Karlsson", make_index().fuzzy("Anders Karlsson"))
+    assert sorted(c["person_ids"].get("db1") for c in chosen if "db1" in c["person_ids"]) == ["p3", "p4"]
+
+
+def test_select_candidates_without_exact_match_keeps_the_best_scores():
+    candidates = make_index().fuzzy("Karin Sodreberg")
+    chosen, others = select_candidates("Karin Sodreberg", candidates)
+    assert [c["name"] for c in chosen] == ["Karin Söderberg"]
+    assert others and all(c["similarity"] < chosen[0]["similarity"] for c in others)
+
+
+def test_select_candidates_of_nothing():
+    assert select_candidates("Nobody", []) == ([], [])
@@ -0,0 +1,65 @@
+import schema_service
+from schema_service import DatabaseSchema
+
+
+def fake_database(calls):
+    """run_query of a small database where SHOW is not permitted"""
+
+    def run_query(label, query, **params):
+        calls.append(query)
+        if "db.labels" in query:
+            return [{"label": "Publication"}, {"label": "Person"}]
+        if "db.relationshipTypes" in query:
+            return [{"rel_type": "AUTHORED"}, {"rel_type": "WORKED_AT"}]
+        if "count(n)" in query:
+            return [{"name": "Publication", "count": 50000}, {"name": "Person", "count": 10}]
+        if "count(r)" in query:
+            return [{"name": "AUTHORED", "count": 9}, {"name": "WORKED_AT", "count": 3}]
+        if "nodeTypeProperties" in query:
+            return [{"label": "Publication", "key": "title", "types": ["String"]},
+                    {"label": "Publication", "key": "abstract", "types": ["String"]},
+                    {"label": "Person", "key": "name", "types": ["String"]}]
+        if "relTypeProperties" in query:
+            return [{"rel_type": ":`WORKED_AT`", "key": "role", "types": ["String"]}]
+        if "LIMIT $sample" in query:
+            assert params == {"sample": schema_service.SAMPLE_SIZE}
+            if "`Publication`" in query:
+                return [{"key": "title", "count": 1000}]
+            if "`Person`" in query:
+                return [{"key": "name", "count": 10}]
+            return [{"key": "role", "count": 2}]
+        raise RuntimeError("permission denied")
+
+    return run_query
+
+
+def test_introspect_without_scans():
+    calls = []
+    schema = DatabaseSchema.introspect("db1", fake_database(calls))
+    assert not any("MATCH (n)" in query or "MATCH ()-[r]->()" in query for query in calls)
+    assert schema.labels["Publication"]["count"] == 50000
+    assert schema.labels["Publication"]["sampled"] == 1000
+    assert schema.fill_rate("Publication", "title") == 1.0
+    assert schema.rel_types["WORKED_AT"]["properties"]["role"]["fill_rate"] == round(2 / 3, 6)
+    assert schema.rel_types["AUTHORED"]["sampled"] == 0  # no properties: not sampled
+    assert schema.indexes == [] and schema.constraints == []
+
+
+def test_keys_missing_from_the_sample_are_still_present():
+    schema = DatabaseSchema.introspect("db1", fake_database([]))
+    assert schema.present("Publication", ["title", "abstract", "doi"]) == ["title", "abstract"]
+    assert schema.present("Thesis", ["title"]) == ["title"]
+    assert schema.property_types("Publication", "abstract") == ["String"]
+
+
+def test_counts_are_batched(monkeypatch):
+    monkeypatch.setattr(schema_service, "COUNTS_PER_QUERY", 1)
+    calls = []
+    DatabaseSchema.introspect("db1", fake_database(calls))
+    assert sum("count(n)" in query for query in calls) == 2
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "schema.json")
+    DatabaseSchema.introspect("db1", fake_database([])).save(path)
+    assert DatabaseSchema.load(path).fill_rate("Person", "name") == 1.0
@@ -0,0 +1,26 @@
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import streamlit_app
+
+
+def name_input(typed, completions, candidates):
+    rb = mock.Mock()
+    rb.complete_name.return_value = completions
+    rb.find_person_candidates.return_value = candidates
+    with mock.patch.object(streamlit_app, "st") as st:
+        st.text_input.return_value = typed
+        st.selectbox.side_effect = lambda label, options, index, **kwargs: index
+        return streamlit_app.researcher_name_input(rb, "Name", "", "key")
+
+
+def test_misspelling_is_offered_the_fuzzy_candidates():
+    suggestion = {"name": "Karin Söderberg", "hint": "Chalmers"}
+    assert name_input("Sodreberg", [], [suggestion]) == ("Karin Söderberg", True)
+
+
+def test_nothing_similar_is_not_searched():
+    assert name_input("Qwxz", [], []) == ("Qwxz", False)
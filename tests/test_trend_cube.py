@@ -0,0 +1,56 @@
+import pytest
+
+from trend_cube import TrendCube
+
+THESES = [
+    {"id": "t1", "year": 2020, "keywords": ["Machine Learning", "Robotics"], "rel_types": ["SUPERVISOR", "AUTHOR"]},
+    {"id": "t2", "year": 2021, "keywords": ["machine learning"], "rel_types": ["OPPONENT"]},
+    {"id": "t3", "year": 2021, "keywords": ["Machine  learning"], "rel_types": ["SUPERVISOR", "OPPONENT"]},
+    {"id": "t4", "year": None, "keywords": ["machine learning"], "rel_types": []},
+]
+
+
+def test_trend_counts_each_thesis_once_per_year():
+    cube = TrendCube.build(THESES)
+    assert cube.trend("Machine Learning") == {2020: 1, 2021: 2}
+    assert cube.trend("robotics") == {2020: 1}
+    assert cube.trend("learning") == {}  # only the exact keyword row
+
+
+def test_trend_by_role_category():
+    cube = TrendCube.build(THESES)
+    assert cube.trend("machine learning", roles=["supervision"]) == {2020: 1, 2021: 1}
+    assert cube.trend("machine learning", roles=["examination"]) == {2021: 2}
+    assert cube.trend("machine learning", start_year=2021) == {2021: 2}
+
+
+def test_trend_rejects_unknown_roles():
+    with pytest.raises(ValueError):
+        TrendCube.build(THESES).trend("machine learning", roles=["astrology"])
+
+
+def test_add_equals_build():
+    added = TrendCube.build(THESES[:2]).add(THESES[2:])
+    built = TrendCube.build(THESES)
+    assert added.trend("machine learning") == built.trend("machine learning")
+    assert added.digests() == built.digests()
+
+
+def test_add_rejects_known_theses():
+    with pytest.raises(ValueError):
+        TrendCube.build(THESES).add([THESES[0]])
+
+
+def test_digest_tracks_counted_fields_only():
+    changed = {**THESES[0], "keywords": ["Machine Learning"]}
+    reordered = {**THESES[0], "keywords": ["robotics", "machine learning"], "rel_types": ["AUTHOR", "SUPERVISOR"]}
+    assert TrendCube.digest(changed) != TrendCube.digest(THESES[0])
+    assert TrendCube.digest(reordered) == TrendCube.digest(THESES[0])
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "cube.npz")
+    TrendCube.build(THESES).save(path)
+    loaded = TrendCube.load(path)
+    assert loaded.trend("machine learning") == {2020: 1, 2021: 2}
+    assert loaded.digests() == TrendCube.build(THESES).digests()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+ResearchBook - Keyword x Year Trend Cube
+Thesis counts per normalized keyword, per year and per role category, built
+offline from DB2 and stored as compact NumPy arrays. Field trends become a
+read of the field's keyword row instead of a scan of every Thesis.
+
+    python trend_cube.py          # rebuild if any thesis was added, changed or removed
+    python trend_cube.py --full   # rebuild unconditionally
+
+Counts are per keyword, so trends only come from the cube when the field is
+exactly a keyword: summing substring matches would count a thesis tagged with
+two matching keywords twice. Other fields use the DB2 query.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from artifacts import ArtifactReader
+from keywords import normalize_keyword
+from role_taxonomy import ROLE_CATEGORIES, classify_rel_type
+
+CUBE_VERSION = 3  # 2: keywords folded by keywords.normalize_keyword, 3: per-thesis digests
+DEFAULT_PATH = os.path.join(config.ARTIFACT_DIR, "trend_cube.npz")
+# Category 0 counts every thesis; the rest count theses with a person in that role category
+CATEGORIES = ["all"] + list(ROLE_CATEGORIES)
+
+THESES_QUERY = """
+MATCH (t:Thesis)
+WHERE t.created_date IS NOT NULL AND t.keywords IS NOT NULL
+  AND ($ids IS NULL OR elementId(t) IN $ids)
+RETURN elementId(t) as id,
+       t.created_date.year as year,
+       t.keywords as keywords,
+       COLLECT { MATCH (:Person)-[r]->(t) RETURN DISTINCT type(r) } as rel_types
+"""
+
+class TrendCube:
+    """
+    Sparse cube stored keyword-major (CSR-like): the entries of keyword k are
+    rows row_ptr[k]:row_ptr[k+1] of (year, category, count).
+    """
+
+    def __init__(self, keywords: List[str], row_ptr: np.ndarray, years: np.ndarray,
+                 categories: np.ndarray, counts: np.ndarray, thesis_ids: List[str],
+                 built_at: float = 0.0, thesis_digests: Optional[np.ndarray] = None):
+        self.keywords = keywords
+        self.keyword_index = {keyword: i for i, keyword in enumerate(keywords)}
+        self.row_ptr = row_ptr
+        self.years = years
+        self.categories = categories
+        self.counts = counts
+        self.thesis_ids = thesis_ids
+        self.built_at = built_at
+        # Digest of what each thesis contributes (year, keywords, role types), aligned with thesis_ids
+        self.thesis_digests = (thesis_digests if thesis_digests is not None
+                               else np.zeros(len(thesis_ids), dtype=np.uint64))
+
+    # -- building ------------------------------------------------------------
+
+    @staticmethod
+    def digest(thesis: Dict) -> int:
+        """64-bit digest of the thesis fields the cube counts"""
+        content = json.dumps([thesis["year"], sorted({normalize_keyword(k) for k in thesis["keywords"] or [] if k}),
+                              sorted(set(thesis.get("rel_types") or []))])
+        return int.from_bytes(hashlib.sha1(content.encode("utf-8")).digest()[:8], "big")
+
+    def digests(self) -> Dict[str, int]:
+        return {thesis_id: int(d) for thesis_id, d in zip(self.thesis_ids, self.thesis_digests)}
+
+    @staticmethod
+    def _cells(theses: Iterable[Dict]) -> Dict[Tuple[str, int, int], int]:
+        cells: Dict[Tuple[str, int, int], int] = defaultdict(int)
+        for thesis in theses:
+            if thesis["year"] is None:
+                continue
+            categories = {0}
+            for rel_type in thesis.get("rel_types") or []:
+                categories.update(CATEGORIES.index(slug) for slug in classify_rel_type(rel_type))
+            for keyword in {normalize_keyword(k) for k in thesis["keywords"] or [] if k}:
+                if not keyword:
+                    continue
+                for category in categories:
+                    cells[(keyword, int(thesis["year"]), category)] += 1
+        return cells
+
+    def _to_cells(self) -> Dict[Tuple[str, int, int], int]:
+        cells: Dict[Tuple[str, int, int], int] = defaultdict(int)
+        for k, keyword in enumerate(self.keywords):
+            for row in range(self.row_ptr[k], self.row_ptr[k + 1]):
+                cells[(keyword, int(self.years[row]), int(self.categories[row]))] += int(self.counts[row])
+        return cells
+
+    @classmethod
+    def _from_cells(cls, cells: Dict[Tuple[str, int, int], int], digests: Dict[str, int]) -> "TrendCube":
+        ordered = sorted(cells.items())
+        keywords = sorted({keyword for (keyword, _, _), _ in ordered})
+        index = {keyword: i for i, keyword in enumerate(keywords)}
+        row_ptr = np.zeros(len(keywords) + 1, dtype=np.int64)
+        for (keyword, _, _), _ in ordered:
+            row_ptr[index[keyword] + 1] += 1
+        np.cumsum(row_ptr, out=row_ptr)
+        return cls(
+            keywords, row_ptr,
+            np.array([year for (_, year, _), _ in ordered], dtype=np.int16),
+            np.array([category for (_, _, category), _ in ordered], dtype=np.int8),
+            np.array([count for _, count in ordered], dtype=np.int32),
+            sorted(digests), time.time(),
+            np.array([digests[thesis_id] for thesis_id in sorted(digests)], dtype=np.uint64)
+        )
+
+    @classmethod
+    def build(cls, theses: Iterable[Dict]) -> "TrendCube":
+        """Cube from thesis dicts with id, year, keywords and rel_types"""
+        theses = list(theses)
+        return cls._from_cells(cls._cells(theses), {t["id"]: cls.digest(t) for t in theses})
+
+    def add(self, theses: Iterable[Dict]) -> "TrendCube":
+        """New cube with additional theses folded in (ids already in the cube are rejected)"""
+        theses = list(theses)
+        digests = self.digests()
+        duplicated = [t["id"] for t in theses if t["id"] in digests]
+        if duplicated:
+            raise ValueError(f"Theses already in the cube (rebuild to change them): {duplicated[:5]}")
+        cells = self._to_cells()
+        for key, count in self._cells(theses).items():
+            cells[key] += count
+        digests.update((t["id"], self.digest(t)) for t in theses)
+        return self._from_cells(cells, digests)
+
+    # -- storage -------------------------------------------------------------
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path, version=np.array(CUBE_VERSION), categories_names=np.array(CATEGORIES),
+            keywords=np.array(self.keywords), row_ptr=self.row_ptr, years=self.years,
+            categories=self.categories, counts=self.counts,
+            thesis_ids=np.array(self.thesis_ids), thesis_digests=self.thesis_digests,
+            built_at=np.array(self.built_at))
+        os.replace(tmp_path, path)  # readers never see a half-written cube
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional["TrendCube"]:
+        """The stored cube, or None if missing or built by an incompatible version"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data["version"]) != CUBE_VERSION or list(data["categories_names"]) != CATEGORIES:
+                return None
+            return cls([str(k) for k in data["keywords"]], data["row_ptr"], data["years"],
+                       data["categories"], data["counts"], [str(i) for i in data["thesis_ids"]],
+                       float(data["built_at"]), data["thesis_digests"])
+
+    # -- queries -------------------------------------------------------------
+
+    def matching_keywords(self, field: str, substring: bool = False) -> List[int]:
+        """
+        Keyword rows for a field: the exact normalized keyword, else (substring=True)
+        keywords containing it. trend() only uses the exact row: cells hold no thesis
+        ids, so a thesis under several matching keywords would be counted once per
+        keyword, and theses matching by title only are not in the cube at all.
+        """
+        needle = normalize_keyword(field)
+        if not needle:
+            return []
+        if needle in self.keyword_index:
+            return [self.keyword_index[needle]]
+        if not substring:
+            return []
+        return [i for i, keyword in enumerate(self.keywords) if needle in keyword]
+
+    def trend(self, field: str, roles: Optional[List[str]] = None, start_year: Optional[int] = None,
+              end_year: Optional[int] = None) -> Dict[int, int]:
+        """
+        {year: thesis count} for a field, optionally restricted to role categories
+        (with several categories a thesis counts once per category it appears in)
+        """
+        rows = [np.arange(self.row_ptr[k], self.row_ptr[k + 1]) for k in self.matching_keywords(field)]
+        if not rows:
+            return {}
+        rows = np.concatenate(rows)
+        unknown = [slug for slug in roles or [] if slug not in ROLE_CATEGORIES]
+        if unknown:
+            raise ValueError(f"Unknown role category '{unknown[0]}'. Known: {', '.join(ROLE_CATEGORIES)}")
+        wanted = [CATEGORIES.index(slug) for slug in roles] if roles else [0]
+        mask = np.isin(self.categories[rows], wanted)
+        if start_year is not None:
+            mask &= self.years[rows] >= start_year
+        if end_year is not None:
+            mask &= self.years[rows] <= end_year
+        years, counts = self.years[rows][mask], self.counts[rows][mask]
+        totals = np.bincount(years - years.min(), weights=counts) if len(years) else []
+        return {int(years.min()) + i: int(total) for i, total in enumerate(totals) if total}
+
+
+def refresh_trend_cube(rb, path: str = DEFAULT_PATH, full: bool = False,
+                       fetch_size: int = 2000) -> Dict[str, int]:
+    """
+    Rebuild the cube when any thesis was added, removed or changed (keywords,
+    year or role relationships), judged by per-thesis digests; full=True
+    rebuilds regardless. Change detection needs every thesis's fields anyway,
+    so the theses are read once and, if anything changed, counted from scratch.
+    """
+    cube = None if full else TrendCube.load(path)
+    theses = list(rb._stream_query("db2", "trend_cube_theses", THESES_QUERY, fetch_size=fetch_size, ids=None))
+    current = {t["id"]: TrendCube.digest(t) for t in theses}
+    previous = cube.digests() if cube is not None else {}
+    stats = {"added": len(current.keys() - previous.keys()), "removed": len(previous.keys() - current.keys()),
+             "changed": sum(1 for thesis_id, d in current.items() if thesis_id in previous and previous[thesis_id] != d)}
+    if cube is None or stats["added"] or stats["removed"] or stats["changed"]:
+        cube = TrendCube.build(theses)
+        cube.save(path)
+    return {**stats, "theses": len(cube.thesis_ids), "keywords": len(cube.keywords)}
+
+
+class TrendCubeReader(ArtifactReader):
+    def __init__(self, path: str = DEFAULT_PATH):
+        super().__init__(path, TrendCube.load)
+
+
+if __name__ == "__main__":
+    import argparse
+    from researchbook import ResearchBook
+
+    parser = argparse.ArgumentParser(description="Build or update the keyword x year trend cube")
+    parser.add_argument("--full", action="store_true", help="rebuild from scratch")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    rb = ResearchBook()
+    try:
+        print("🧊 Refreshing trend cube from DB2...")
+        start = time.perf_counter()
+        stats = refresh_trend_cube(rb, args.path, full=args.full)
+        print(f"🎉 {stats['added']:,} theses added, {stats['changed']:,} changed, {stats['removed']:,} removed; "
+              f"cube covers {stats['theses']:,} theses, "
+              f"{stats['keywords']:,} keywords ({time.perf_counter() - start:.1f}s) → {args.path}")
+    finally:
+        rb.close_connections()